@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import typing as t
+
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+# "stop": damp / stopmove, "motion": move / euler setpoints, "mode": stand, sit and settings,
+# "trick": hello, dances, jumps, which the robot may take a while to answer
+CommandClass = t.Literal["stop", "motion", "mode", "trick"]
+
+
+def _default_ceilings() -> dict[str, float]:
+    return {"stop": 1.0, "motion": 0.5, "mode": 5.0, "trick": 15.0}
+
+
+@dataclass
+class AdaptiveTimeoutConfig:
+    floor: float = 0.05  # no timeout is ever shorter than this
+    ceilings: dict[str, float] = field(default_factory=_default_ceilings)  # also the initial value
+    variance_multiplier: float = 4.0  # timeout = smoothed RTT + this * RTT deviation
+    gain: float = 0.125  # weight of a new sample in the smoothed RTT
+    deviation_gain: float = 0.25  # weight of a new sample in the RTT deviation
+
+
+class _ClassEstimate:
+    __slots__ = ("srtt", "rttvar", "backoff")
+
+    def __init__(self) -> None:
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.backoff = 1.0
+
+
+class AdaptiveTimeouts:
+    """
+    Per command class timeouts that follow the RTTs actually observed.
+
+    Uses the TCP retransmission-timeout estimator: a smoothed RTT plus a multiple of its mean
+    deviation, clamped to `[floor, ceiling]`. Until a class has a sample its timeout is the
+    ceiling. Each timeout doubles the class's value (up to the ceiling) until the next
+    success, so a slow link is not hammered with ever-shorter deadlines.
+    """
+
+    def __init__(self, config: AdaptiveTimeoutConfig | None = None) -> None:
+        self.config = config or AdaptiveTimeoutConfig()
+        self._estimates: dict[str, _ClassEstimate] = {}
+
+    def timeout(self, command_class: str) -> float:
+        ceiling = self._ceiling(command_class)
+        estimate = self._estimates.get(command_class)
+        if estimate is None or estimate.srtt is None:
+            return ceiling
+        value = estimate.srtt + self.config.variance_multiplier * estimate.rttvar
+        return min(max(value, self.config.floor) * estimate.backoff, ceiling)
+
+    def observe(self, command_class: str, rtt: float) -> None:
+        estimate = self._estimate(command_class)
+        config = self.config
+        if estimate.srtt is None:
+            estimate.srtt = rtt
+            estimate.rttvar = rtt / 2
+        else:
+            estimate.rttvar += config.deviation_gain * (abs(rtt - estimate.srtt) - estimate.rttvar)
+            estimate.srtt += config.gain * (rtt - estimate.srtt)
+        estimate.backoff = 1.0
+
+    def timed_out(self, command_class: str) -> None:
+        estimate = self._estimate(command_class)
+        estimate.backoff = min(estimate.backoff * 2, 64.0)
+        if lg.debug_enabled:
+            lg.debug("%s timed out, timeout now %.3fs", command_class, self.timeout(command_class))
+
+    def snapshot(self) -> dict[str, float]:
+        """The current timeout of every class seen so far, in seconds."""
+        return {command_class: self.timeout(command_class) for command_class in self._estimates}
+
+    def _estimate(self, command_class: str) -> _ClassEstimate:
+        estimate = self._estimates.get(command_class)
+        if estimate is None:
+            estimate = self._estimates[command_class] = _ClassEstimate()
+        return estimate
+
+    def _ceiling(self, command_class: str) -> float:
+        return self.config.ceilings.get(command_class, max(self.config.ceilings.values()))
@@ -1,11 +1,34 @@
 from __future__ import annotations
 
 
+import asyncio
+import functools
 import typing as t
 
-from arcana_go2.arcana_go2_base import ArcanaGO2Base, CommandResponse
-from arcana_go2.fastapi_client import JSONObject
+from arcana_go2.adaptive_timeout import AdaptiveTimeoutConfig, AdaptiveTimeouts, CommandClass
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2_base import ArcanaGO2Base, CommandResult, ResponsePolicy
+from arcana_go2.circuit_breaker import (
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    CircuitState,
+    StateListener,
+)
+from arcana_go2.fire_and_forget import ErrorCallback, FireAndForget, FireAndForgetStats
+from arcana_go2.journal import CommandJournal
+from arcana_go2.json_utils import JSONObject, JSONValue
+from arcana_go2.http_client import HedgeConfig, HedgeStats, PoolConfig
+from arcana_go2.instrumentation import CommandStats, StatsHook
 from arcana_go2.logger import make_logger
+from arcana_go2.scheduler import CommandScheduler, SchedulerConfig
+from arcana_go2.state_mirror import StateMirror, StateMirrorConfig, StateMirrorStats
+from arcana_go2.stop_lane import StopLane, StopLaneConfig, StopLaneStats
+from arcana_go2.token_manager import TokenProvider, as_token_manager
+from arcana_go2.transport import CommandTransport
+from arcana_go2.velocity_stream import SetpointKind, VelocityStream
+
+if t.TYPE_CHECKING:
+    from arcana_go2.shaping import SetpointShaper, ShapingConfig, ShapingStats
 
 lg = make_logger(__name__)
 
@@ -13,11 +36,121 @@ lg = make_logger(__name__)
 _SPORT_TOPIC = "rt/api/sport/request"
 _OBSTACLE_TOPIC = "rt/api/obstacles_avoid/request"
 
+# adaptive timeouts are tracked per class; anything not listed is a "mode" command
+_COMMAND_CLASSES: dict[tuple[str, int], CommandClass] = {
+    (_SPORT_TOPIC, 1001): "stop",  # damp
+    (_SPORT_TOPIC, 1003): "stop",  # stopmove
+    (_SPORT_TOPIC, 1007): "motion",  # euler
+    (_SPORT_TOPIC, 1008): "motion",  # move
+    (_SPORT_TOPIC, 1016): "trick",  # hello
+    (_SPORT_TOPIC, 1017): "trick",  # stretch
+    (_SPORT_TOPIC, 1020): "trick",  # content
+    (_SPORT_TOPIC, 1022): "trick",  # dance1
+    (_SPORT_TOPIC, 1023): "trick",  # dance2
+    (_SPORT_TOPIC, 1031): "trick",  # frontjump
+    (_SPORT_TOPIC, 1032): "trick",  # frontpounce
+    (_SPORT_TOPIC, 2044): "trick",  # handstand
+}
+
+# what an acknowledged command sets in the state mirror: (key, value), where a None value
+# means the command's single arg
+_STATE_EFFECTS: dict[tuple[str, int], tuple[str, JSONValue]] = {
+    (_SPORT_TOPIC, 1001): ("posture", "damped"),  # damp
+    (_SPORT_TOPIC, 1004): ("posture", "standing"),  # standup
+    (_SPORT_TOPIC, 1005): ("posture", "lying"),  # standdown
+    (_SPORT_TOPIC, 1006): ("posture", "standing"),  # recoverystand
+    (_SPORT_TOPIC, 1009): ("posture", "sitting"),  # sit
+    (_SPORT_TOPIC, 1010): ("posture", "standing"),  # risesit
+    (_SPORT_TOPIC, 1015): ("speed_level", None),  # speedlevel
+    (_SPORT_TOPIC, 1027): ("joystick", None),  # switch_joystick
+    (_SPORT_TOPIC, 1028): ("pose", None),  # pose
+    (_OBSTACLE_TOPIC, 1001): ("obstacle_avoid", None),  # obstacle_avoid_switch_set
+}
+# safety and recovery commands update the mirror but are always sent, each on its own
+_NEVER_SUPPRESSED = {(_SPORT_TOPIC, 1001), (_SPORT_TOPIC, 1006)}
+
+
+def _state_effect(
+    topic: str, api_id: int, command_args: JSONObject | None
+) -> tuple[str, JSONValue] | None:
+    effect = _STATE_EFFECTS.get((topic, api_id))
+    if effect is None or effect[1] is not None:
+        return effect
+    return effect[0], next(iter(command_args.values())) if command_args else None
+
+
+class _SendClock:
+    """When a command left for the robot; a scheduler restarts it once the queue is behind it."""
+
+    __slots__ = ("started",)
+
+    def __init__(self) -> None:
+        self.started = 0.0
+
+    def restart(self) -> None:
+        self.started = asyncio.get_running_loop().time()
+
 
 class ArcanaGO2:
-    def __init__(self, *, base_url: str, get_token=None, timeout: float = 15.0) -> None:
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        get_token: TokenProvider | None = None,
+        timeout: float = 15.0,
+        transport: CommandTransport | None = None,
+        scheduler: SchedulerConfig | None = None,
+        stop_lane: StopLaneConfig | None = None,
+        log_sample_every: int | None = None,
+        response_policy: ResponsePolicy = "full",
+        on_send_error: ErrorCallback | None = None,
+        pool: PoolConfig | None = None,
+        journal: CommandJournal | None = None,
+        hedge: HedgeConfig | None = None,
+        circuit_breaker: CircuitBreakerConfig | None = None,
+        adaptive_timeouts: AdaptiveTimeoutConfig | None = None,
+        state_mirror: StateMirrorConfig | None = None,
+        shaping: ShapingConfig | None = None,
+        max_unacked: int = 8,
+    ) -> None:
         lg.debug("constructing up go2 driver")
-        self._base = ArcanaGO2Base(base_url=base_url, get_token=get_token, timeout=timeout)
+        # one token cache shared by every connection this driver opens
+        get_token = None if get_token is None else as_token_manager(get_token)
+        self._base = ArcanaGO2Base(
+            base_url=base_url,
+            get_token=get_token,
+            timeout=timeout,
+            transport=transport,
+            log_sample_every=log_sample_every,
+            pool=pool,
+            journal=journal,
+            hedge=hedge,
+            circuit_breaker=circuit_breaker,
+        )
+        # commands sent without an explicit deadline get one from the RTTs seen for their class
+        self._timeouts = None if adaptive_timeouts is None else AdaptiveTimeouts(adaptive_timeouts)
+        # with a mirror, mode commands that would not change the robot's state are skipped
+        self._mirror = None if state_mirror is None else StateMirror(state_mirror)
+        self._state_pending: dict[tuple[str, JSONValue], asyncio.Task[CommandResult]] = {}
+        # with a shaping config, move / euler setpoints are deadbanded, limited and filtered,
+        # and ones that barely differ from what the robot was last sent are skipped
+        self._shapers: dict[SetpointKind, SetpointShaper] | None = None
+        if shaping is not None:
+            from arcana_go2.shaping import SetpointShaper  # needs numpy, so only imported here
+
+            self._shapers = {"move": SetpointShaper(shaping), "euler": SetpointShaper(shaping)}
+        # without a scheduler config commands go straight to the base, concurrently and unordered
+        self._scheduler = None if scheduler is None else CommandScheduler(self._base, scheduler)
+        # with a stop lane config, damp and stopmove bypass all of the above on a reserved pool
+        self._stop_lane = (
+            None
+            if stop_lane is None
+            else StopLane(base_url=base_url, get_token=get_token, config=stop_lane, journal=journal)
+        )
+        self._response_policy: ResponsePolicy = response_policy
+        # fire-and-forget sends run here, at most `max_unacked` at once; their errors go to
+        # `on_send_error`
+        self._fire_and_forget = FireAndForget(on_send_error, max_in_flight=max_unacked)
 
     async def __aenter__(self) -> "ArcanaGO2":
         return self
@@ -27,8 +160,99 @@ class ArcanaGO2:
 
     async def close(self):
         lg.debug("cleaning up go2 driver")
+        await self._fire_and_forget.drain()
+        if self._scheduler is not None:
+            await self._scheduler.close()
+        if self._stop_lane is not None:
+            await self._stop_lane.close()
         await self._base.close()
 
+    async def warmup(self) -> None:
+        """Open connections ahead of the first command."""
+        await self._base.warmup()
+        if self._stop_lane is not None:
+            await self._stop_lane.warmup()
+
+    def stats(self) -> dict[tuple[str, int], CommandStats]:
+        """Per (topic, api_id) counts and latency percentiles for every command sent so far."""
+        instrumentation = self._base.instrumentation
+        return {} if instrumentation is None else instrumentation.snapshot()
+
+    def add_stats_hook(self, hook: StatsHook) -> None:
+        """Call `hook` with the `CommandSample` of every finished command, for export."""
+        if self._base.instrumentation is not None:
+            self._base.instrumentation.add_hook(hook)
+
+    @property
+    def fire_and_forget_stats(self) -> FireAndForgetStats:
+        return self._fire_and_forget.stats
+
+    @property
+    def hedge_stats(self) -> HedgeStats | None:
+        """How often idempotent commands were hedged, None when hedging is not enabled."""
+        return self._base.hedge_stats
+
+    @property
+    def circuit_state(self) -> CircuitState | None:
+        """The circuit breaker's state, None when it is not enabled."""
+        breaker = self._base.circuit_breaker
+        return None if breaker is None else breaker.state
+
+    def add_circuit_listener(self, listener: StateListener) -> None:
+        """
+        Call `listener(old, new)` whenever the circuit breaker changes state, e.g. to switch a
+        control loop to a safe fallback the moment the robot stops answering.
+        """
+        breaker = self._base.circuit_breaker
+        if breaker is None:
+            raise ValueError("no circuit breaker, pass circuit_breaker=CircuitBreakerConfig()")
+        breaker.add_listener(listener)
+
+    @property
+    def timeouts(self) -> dict[str, float]:
+        """Current adaptive timeout per command class, empty when they are not enabled."""
+        return {} if self._timeouts is None else self._timeouts.snapshot()
+
+    @property
+    def state(self) -> dict[str, JSONValue]:
+        """The mirrored robot state that is still fresh, empty when mirroring is not enabled."""
+        return {} if self._mirror is None else self._mirror.snapshot()
+
+    @property
+    def state_stats(self) -> StateMirrorStats | None:
+        return None if self._mirror is None else self._mirror.stats
+
+    def invalidate_state(self, key: str | None = None) -> None:
+        """Forget mirrored state, e.g. after the robot was driven with the remote."""
+        if self._mirror is not None:
+            self._mirror.invalidate(key)
+
+    @property
+    def shaping_stats(self) -> dict[SetpointKind, ShapingStats]:
+        """Per setpoint kind, how many were shaped and skipped; empty when shaping is off."""
+        return {} if self._shapers is None else {k: s.stats for k, s in self._shapers.items()}
+
+    @property
+    def stop_stats(self) -> StopLaneStats | None:
+        """Latency and failure counts for the stop lane, None when it is not enabled."""
+        return None if self._stop_lane is None else self._stop_lane.stats
+
+    def velocity_stream(
+        self,
+        *,
+        id: int,
+        rate_hz: float = 50.0,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+    ) -> VelocityStream:
+        """
+        Create a latest-wins setpoint stream for `move` / `euler`.
+
+        Use it as an async context manager; setpoints submitted through it are coalesced and
+        sent at `rate_hz` with at most one request in flight. `deadline` bounds each send.
+        """
+        return VelocityStream(self, id=id, rate_hz=rate_hz, priority=priority, deadline=deadline)
+
     async def _send(
         self,
         *,
@@ -37,167 +261,514 @@ class ArcanaGO2:
         api_id: int,
         command_args: JSONObject | None,
         priority: t.Literal[0, 1],
-    ) -> CommandResponse | None:
-        return await self._base.send_command(
-            requester_id=requester_id,
-            topic=topic,
-            api_id=api_id,
-            command_args=command_args,
-            priority=priority,
-        )
-
-    async def damp(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+        deadline: float | None = None,
+        response_policy: ResponsePolicy | None = None,
+        idempotent: bool = False,
+        force: bool = False,
+    ) -> CommandResult:
+        """
+        `idempotent` commands are safe to send twice, which makes them eligible for hedging.
+
+        With a state mirror, a command whose effect is already the mirrored state returns None
+        without being sent, and one identical to a command still in flight waits for that one
+        instead, unless `force` is set. Safety and recovery commands (`damp`, `recoverystand`)
+        are never suppressed or collapsed.
+        """
+        policy = response_policy or self._response_policy
+        command_class = _COMMAND_CLASSES.get((topic, api_id), "mode")
+        mirror = self._mirror
+        effect = None if mirror is None else _state_effect(topic, api_id, command_args)
+        if effect is not None and not force and (topic, api_id) not in _NEVER_SUPPRESSED:
+            assert mirror is not None
+            if mirror.is_current(*effect):
+                mirror.stats.suppressed += 1
+                return None
+            pending = self._state_pending.get(effect)
+            if pending is not None:
+                mirror.stats.collapsed += 1
+                return await asyncio.shield(pending)
+        if deadline is None and self._timeouts is not None:
+            deadline = self._timeouts.timeout(command_class)
+        kwargs: dict[str, t.Any] = {
+            "requester_id": requester_id,
+            "topic": topic,
+            "api_id": api_id,
+            "command_args": command_args,
+            "priority": priority,
+            "deadline": deadline,
+            "response_policy": "light" if policy == "fire_and_forget" else policy,
+            "idempotent": idempotent,
+        }
+        if self._scheduler is None:
+            request = self._base.send_command(**kwargs)
+            if self._timeouts is not None:
+                request = self._track_rtt(request, command_class, _SendClock())
+        elif self._timeouts is None:
+            request = self._scheduler.submit(**kwargs)
+        else:
+            # the RTT starts once a worker sends the command, not while it waits in the queue
+            clock = _SendClock()
+            request = self._scheduler.submit(**kwargs, on_dispatch=clock.restart)
+            request = self._track_rtt(request, command_class, clock)
+        if mirror is not None and command_class == "trick":
+            mirror.invalidate("posture")
+        if policy == "fire_and_forget":
+            if effect is not None:
+                assert mirror is not None
+                mirror.invalidate(effect[0])  # it will never be acknowledged
+            self._fire_and_forget.spawn(request, key=(topic, api_id))
+            return None
+        if effect is not None:
+            task = asyncio.get_running_loop().create_task(self._mirrored(request, effect))
+            self._state_pending[effect] = task
+            task.add_done_callback(functools.partial(self._state_settled, effect))
+            return await asyncio.shield(task)
+        return await request
+
+    async def _mirrored(
+        self, request: t.Awaitable[CommandResult], effect: tuple[str, JSONValue]
+    ) -> CommandResult:
+        assert self._mirror is not None
+        key, value = effect
+        self._mirror.stats.sent += 1
+        try:
+            result = await request
+        except BaseException:
+            self._mirror.invalidate(key)
+            raise
+        self._mirror.update(key, value)
+        return result
+
+    def _state_settled(
+        self, effect: tuple[str, JSONValue], task: asyncio.Task[CommandResult]
+    ) -> None:
+        if self._state_pending.get(effect) is task:
+            del self._state_pending[effect]
+        if not task.cancelled():
+            task.exception()  # the callers that awaited it have seen it; don't warn again
+
+    async def _send_shaped(
+        self,
+        kind: SetpointKind,
+        api_id: int,
+        requester_id: int,
+        x: float,
+        y: float,
+        z: float,
+        priority: t.Literal[0, 1],
+        deadline: float | None,
+        response_policy: ResponsePolicy | None,
+    ) -> CommandResult:
+        """Send a setpoint through its shaper; None, without sending, if it changed too little."""
+        assert self._shapers is not None
+        shaper = self._shapers[kind]
+        x, y, z = (float(value) for value in shaper.shape((x, y, z)))
+        if not shaper.changed()[0]:
+            shaper.stats.suppressed += 1
+            return None
+        shaper.mark_sent()
+        try:
+            return await self._send(
+                requester_id=requester_id,
+                topic=_SPORT_TOPIC,
+                api_id=api_id,
+                command_args={"x": x, "y": y, "z": z},
+                priority=priority,
+                deadline=deadline,
+                idempotent=True,
+                response_policy=response_policy,
+            )
+        except BaseException:
+            shaper.forget_sent()  # the robot may not have it; the next setpoint must go out
+            raise
+
+    def _reset_shaping(self) -> None:
+        # a stopped robot is at rest; shaping starts over from zero rather than ramping down
+        if self._shapers is not None:
+            for shaper in self._shapers.values():
+                shaper.reset()
+
+    async def _track_rtt(
+        self, request: t.Awaitable[CommandResult], command_class: CommandClass, clock: _SendClock
+    ) -> CommandResult:
+        assert self._timeouts is not None
+        loop = asyncio.get_running_loop()
+        clock.restart()
+        try:
+            result = await request
+        except APIException as e:
+            # no status means the robot never answered: a timeout or a transport error
+            if e.status_code is None and not isinstance(e, CircuitOpenError):
+                self._timeouts.timed_out(command_class)
+            raise
+        self._timeouts.observe(command_class, loop.time() - clock.started)
+        return result
+
+    async def damp(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        self._reset_shaping()
+        if self._stop_lane is not None:
+            response = await self._stop_lane.send(
+                requester_id=id, api_id=1001, priority=priority, deadline=deadline
+            )
+            if self._mirror is not None:
+                self._mirror.update("posture", "damped")
+            return response
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1001, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1001,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
+            idempotent=True,
         )
 
-    async def stopmove(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def stopmove(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        self._reset_shaping()
+        if self._stop_lane is not None:
+            return await self._stop_lane.send(
+                requester_id=id, api_id=1003, priority=priority, deadline=deadline
+            )
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1003, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1003,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
+            idempotent=True,
         )
 
-    async def standup(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def standup(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1004, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1004,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            force=force,
         )
 
-    async def standdown(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def standdown(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1005, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1005,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            force=force,
         )
 
     async def recoverystand(
-        self, *, id: int, priority: t.Literal[0, 1] = 0
-    ) -> CommandResponse | None:
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1006, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1006,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
+            idempotent=True,
         )
 
     async def euler(
-        self, *, id: int, x: float, y: float, z: float, priority: t.Literal[0, 1] = 1
-    ) -> CommandResponse | None:
+        self,
+        *,
+        id: int,
+        x: float,
+        y: float,
+        z: float,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+        response_policy: ResponsePolicy | None = None,
+    ) -> CommandResult:
+        if self._shapers is not None:
+            return await self._send_shaped(
+                "euler", 1007, id, x, y, z, priority, deadline, response_policy
+            )
         return await self._send(
             requester_id=id,
             topic=_SPORT_TOPIC,
             api_id=1007,
             command_args={"x": x, "y": y, "z": z},
             priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            response_policy=response_policy,
         )
 
     async def move(
-        self, *, id: int, x: float, y: float, z: float, priority: t.Literal[0, 1] = 1
-    ) -> CommandResponse | None:
+        self,
+        *,
+        id: int,
+        x: float,
+        y: float,
+        z: float,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+        response_policy: ResponsePolicy | None = None,
+    ) -> CommandResult:
+        if self._shapers is not None:
+            return await self._send_shaped(
+                "move", 1008, id, x, y, z, priority, deadline, response_policy
+            )
         return await self._send(
             requester_id=id,
             topic=_SPORT_TOPIC,
             api_id=1008,
             command_args={"x": x, "y": y, "z": z},
             priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            response_policy=response_policy,
         )
 
-    async def sit(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def sit(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1009, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1009,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            force=force,
         )
 
-    async def risesit(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def risesit(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1010, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1010,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            force=force,
         )
 
     async def speedlevel(
-        self, *, id: int, data: int, priority: t.Literal[0, 1] = 0
-    ) -> CommandResponse | None:
+        self,
+        *,
+        id: int,
+        data: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
         return await self._send(
             requester_id=id,
             topic=_SPORT_TOPIC,
             api_id=1015,
             command_args={"data": data},
             priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            force=force,
         )
 
-    async def hello(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def hello(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1016, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1016,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
         )
 
-    async def stretch(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def stretch(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1017, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1017,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
         )
 
-    async def content(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def content(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1020, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1020,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
         )
 
-    async def dance1(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def dance1(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1022, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1022,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
         )
 
-    async def dance2(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def dance2(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1023, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1023,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
         )
 
     async def switch_joystick(
-        self, *, id: int, flag: bool, priority: t.Literal[0, 1] = 0
-    ) -> CommandResponse | None:
+        self,
+        *,
+        id: int,
+        flag: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
         return await self._send(
             requester_id=id,
             topic=_SPORT_TOPIC,
             api_id=1027,
             command_args={"flag": flag},
             priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            force=force,
         )
 
     async def pose(
-        self, *, id: int, flag: bool, priority: t.Literal[0, 1] = 0
-    ) -> CommandResponse | None:
+        self,
+        *,
+        id: int,
+        flag: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
         return await self._send(
             requester_id=id,
             topic=_SPORT_TOPIC,
             api_id=1028,
             command_args={"flag": flag},
             priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            force=force,
         )
 
-    async def frontjump(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def frontjump(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1031, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1031,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
         )
 
     async def frontpounce(
-        self, *, id: int, priority: t.Literal[0, 1] = 0
-    ) -> CommandResponse | None:
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1032, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1032,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
         )
 
-    async def staticwalk(self, *, id: int, priority: t.Literal[0, 1] = 0) -> CommandResponse | None:
+    async def staticwalk(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
-            requester_id=id, topic=_SPORT_TOPIC, api_id=1061, command_args=None, priority=priority
+            requester_id=id,
+            topic=_SPORT_TOPIC,
+            api_id=1061,
+            command_args=None,
+            priority=priority,
+            deadline=deadline,
+            idempotent=True,
         )
 
     async def handstand(
-        self, *, id: int, flag: bool, priority: t.Literal[0, 1] = 0
-    ) -> CommandResponse | None:
+        self, *, id: int, flag: bool, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
         return await self._send(
             requester_id=id,
             topic=_SPORT_TOPIC,
             api_id=2044,
             command_args={"flag": flag},
             priority=priority,
+            deadline=deadline,
         )
 
     async def obstacle_avoid_switch_set(
-        self, *, id: int, enable: bool, priority: t.Literal[0, 1] = 0
-    ) -> CommandResponse | None:
+        self,
+        *,
+        id: int,
+        enable: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
         return await self._send(
             requester_id=id,
             topic=_OBSTACLE_TOPIC,
             api_id=1001,
             command_args={"enable": bool(enable)},
             priority=priority,
+            deadline=deadline,
+            idempotent=True,
+            force=force,
         )
@@ -1,18 +1,24 @@
 from __future__ import annotations
+import time
 import typing as t
 
 
-import json
 from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict
 
-from arcana_go2.fastapi_client import HTTPClient, JSONObject
+from arcana_go2.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from arcana_go2.command_encoding import CommandEncoder
+from arcana_go2.http_client import HedgeConfig, HedgeStats, PoolConfig
+from arcana_go2.instrumentation import CURRENT_SAMPLE, CommandSample, Instrumentation
+from arcana_go2.journal import CommandJournal, status_for
+from arcana_go2.json_utils import JSONObject
 from arcana_go2.logger import make_logger
+from arcana_go2.token_manager import TokenProvider
+from arcana_go2.transport import COMMAND_ENDPOINT, CommandTransport, make_transport
 
 lg = make_logger(__name__)
 
-_COMMAND_ENDPOINT = "/api/webrtc"
 
 class CommandResponse(BaseModel):
     id: int
@@ -22,19 +28,61 @@ class CommandResponse(BaseModel):
     priority: int
 
 
+class CommandAck:
+    """
+    A lightweight stand-in for `CommandResponse`: the robot answered 2xx to this command.
+
+    It is built from what was sent rather than parsed from the response body.
+    """
+
+    __slots__ = ("id", "topic", "api_id", "priority")
+
+    def __init__(self, id: int, topic: str, api_id: int, priority: int) -> None:
+        self.id = id
+        self.topic = topic
+        self.api_id = api_id
+        self.priority = priority
+
+    def __repr__(self) -> str:
+        return f"CommandAck(id={self.id}, topic={self.topic!r}, api_id={self.api_id})"
+
+
+# "full" parses and validates a CommandResponse, "light" only checks the status and returns a
+# CommandAck, "fire_and_forget" (handled by ArcanaGO2) does not wait for the robot at all
+ResponsePolicy = Literal["full", "light", "fire_and_forget"]
+CommandResult: t.TypeAlias = "CommandResponse | CommandAck | None"
+
+
 class ArcanaGO2Base:
     def __init__(
         self,
         *,
         base_url: str,
-        get_token: t.Callable[[], str | None] | None = None,
+        get_token: TokenProvider | None = None,
         timeout: float = 15.0,
+        transport: CommandTransport | None = None,
+        log_sample_every: int | None = None,
+        encoder: CommandEncoder | None = None,
+        pool: PoolConfig | None = None,
+        instrument: bool = True,
+        journal: CommandJournal | None = None,
+        hedge: HedgeConfig | None = None,
+        circuit_breaker: CircuitBreakerConfig | None = None,
     ) -> None:
-        lg.debug(f"constructing client for {base_url=}")
-        self._client = HTTPClient(
+        lg.debug("constructing client for base_url=%r", base_url)
+        self.instrumentation = Instrumentation() if instrument else None
+        # when set, every command sent is appended to it, see `arcana_go2.journal`
+        self.journal = journal
+        # when set, DEBUG logs one structured event per this many commands of each (topic, api_id)
+        self._log_sample_every = log_sample_every
+        self._encoder = encoder or CommandEncoder()
+        self._transport = transport or make_transport(
             base_url=base_url,
             get_token=get_token,
             timeout=timeout,
+            pool=pool,
+            hedge=hedge,
+            circuit_breaker=circuit_breaker,
         )
 
     async def __aenter__(self) -> ArcanaGO2Base:
@@ -43,9 +91,24 @@ class ArcanaGO2Base:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.close()
 
+    @property
+    def hedge_stats(self) -> HedgeStats | None:
+        """Hedging counters, None unless the transport hedges (HTTP with a `HedgeConfig`)."""
+        return getattr(self._transport, "hedge_stats", None)
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """The transport's circuit breaker, None unless HTTP with a `CircuitBreakerConfig`."""
+        return getattr(self._transport, "breaker", None)
+
+    async def warmup(self) -> None:
+        await self._transport.warmup()
+
     async def close(self):
         lg.debug("cleaning up go2 driver base")
-        await self._client.close()
+        await self._transport.close()
+        if self.journal is not None:
+            await self.journal.close()
 
     async def send_command(
         self,
@@ -55,15 +118,82 @@ class ArcanaGO2Base:
         api_id: int,
         command_args: JSONObject | None,
         priority: Literal[0, 1] = 0,
-    ) -> CommandResponse | None:
-        payload: dict[str, t.Any] = {
-            "id": requester_id,
-            "topic": topic,
-            "api_id": api_id,
-            "parameter": (
-                "" if command_args is None else json.dumps(command_args, separators=(",", ":"))
-            ),
-            "priority": int(priority),
-        }
-        lg.debug(f"sending {payload=} to endpoint={_COMMAND_ENDPOINT}")
-        return await self._client.post(_COMMAND_ENDPOINT, model=CommandResponse, payload=payload)
+        deadline: float | None = None,
+        response_policy: t.Literal["full", "light"] = "full",
+        queue_wait: float = 0.0,
+        idempotent: bool = False,
+    ) -> CommandResult:
+        """
+        `queue_wait` is how long the command already waited upstream, e.g. in a scheduler.
+        `idempotent` commands may be hedged, i.e. sent twice, by the transport.
+        """
+        start = time.perf_counter()
+        body = self._encoder.encode(requester_id, topic, api_id, command_args, int(priority))
+        if lg.debug_enabled:
+            if self._log_sample_every is None:
+                lg.debug("sending body=%r to endpoint=%s", body, COMMAND_ENDPOINT)
+            else:
+                lg.debug_sampled(
+                    f"{topic}/{api_id}",
+                    self._log_sample_every,
+                    "send_command",
+                    id=requester_id,
+                    topic=topic,
+                    api_id=api_id,
+                    command_args=command_args,
+                    priority=priority,
+                )
+        if self.instrumentation is None and self.journal is None:
+            return await self._dispatch(
+                body, requester_id, topic, api_id, priority, deadline, response_policy, idempotent
+            )
+
+        sample = CommandSample(topic, api_id, queue_wait)
+        sample.encode = time.perf_counter() - start
+        # the transport and HTTPClient add network, validation and retry figures to it
+        token = CURRENT_SAMPLE.set(sample)
+        sent_at = time.monotonic()
+        error: BaseException | None = None
+        try:
+            return await self._dispatch(
+                body, requester_id, topic, api_id, priority, deadline, response_policy, idempotent
+            )
+        except BaseException as e:
+            error = e
+            if isinstance(e, Exception):
+                sample.error = type(e).__name__
+            raise
+        finally:
+            CURRENT_SAMPLE.reset(token)
+            sample.total = queue_wait + time.perf_counter() - start
+            if self.instrumentation is not None:
+                self.instrumentation.record(sample)
+            if self.journal is not None:
+                self.journal.record(
+                    sent_at=sent_at,
+                    requester_id=requester_id,
+                    topic=topic,
+                    api_id=api_id,
+                    priority=int(priority),
+                    command_args=command_args,
+                    status=status_for(error),
+                    rtt=time.monotonic() - sent_at,
+                )
+
+    async def _dispatch(
+        self,
+        body: bytes,
+        requester_id: int,
+        topic: str,
+        api_id: int,
+        priority: int,
+        deadline: float | None,
+        response_policy: t.Literal["full", "light"],
+        idempotent: bool,
+    ) -> CommandResult:
+        if response_policy == "light":
+            await self._transport.request(body, model=None, deadline=deadline, hedge=idempotent)
+            return CommandAck(requester_id, topic, api_id, int(priority))
+        return await self._transport.request(
+            body, model=CommandResponse, deadline=deadline, hedge=idempotent
+        )
@@ -0,0 +1,5 @@
+import sys
+
+from arcana_go2.bench.run import main
+
+sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Microbenchmark for the cost of encoding one command body.
+
+Run with `python -m arcana_go2.bench.encoding`. "legacy" is what `send_command` used to do:
+build a dict, `json.dumps` the args into `parameter`, then JSON-encode the whole payload to
+bytes the way httpx does for `json=`. The other columns use `CommandEncoder` with each of the
+available JSON backends.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+import typing as t
+
+from arcana_go2.command_encoding import CommandEncoder, json_backend, orjson
+from arcana_go2.json_utils import JSONObject
+
+_SPORT_TOPIC = "rt/api/sport/request"
+_OBSTACLE_TOPIC = "rt/api/obstacles_avoid/request"
+
+CASES: dict[str, tuple[str, int, JSONObject | None, int]] = {
+    "sit": (_SPORT_TOPIC, 1009, None, 0),
+    "move": (_SPORT_TOPIC, 1008, {"x": 0.35, "y": -0.1, "z": 0.0}, 1),
+    "speedlevel": (_SPORT_TOPIC, 1015, {"data": 1}, 0),
+    "obstacle_avoid_switch_set": (_OBSTACLE_TOPIC, 1001, {"enable": True}, 0),
+}
+
+
+def legacy_encode(
+    requester_id: int, topic: str, api_id: int, command_args: JSONObject | None, priority: int
+) -> bytes:
+    payload: dict[str, t.Any] = {
+        "id": requester_id,
+        "topic": topic,
+        "api_id": api_id,
+        "parameter": (
+            "" if command_args is None else json.dumps(command_args, separators=(",", ":"))
+        ),
+        "priority": int(priority),
+    }
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    encoders: dict[str, t.Callable[..., bytes]] = {"legacy": legacy_encode}
+    encoders["encoder/json"] = CommandEncoder(dumps=json_backend("json")).encode
+    if orjson is not None:
+        encoders["encoder/orjson"] = CommandEncoder(dumps=json_backend("orjson")).encode
+
+    print(f"{'command':<28}" + "".join(f"{name:>16}" for name in encoders) + "   (ns/command)")
+    for command, (topic, api_id, command_args, priority) in CASES.items():
+        row = f"{command:<28}"
+        for encode in encoders.values():
+            seconds = min(
+                timeit.repeat(
+                    lambda: encode(7, topic, api_id, command_args, priority),
+                    number=args.calls,
+                    repeat=5,
+                )
+            )
+            row += f"{seconds / args.calls * 1e9:>16.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
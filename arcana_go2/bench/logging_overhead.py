@@ -0,0 +1,80 @@
+"""
+Microbenchmark for the cost of disabled DEBUG logging on the command hot path.
+
+Run with `python -m arcana_go2.bench.logging_overhead`. Logging is left at the default INFO
+level, so every variant below is a no-op as far as output goes; the numbers show what the call
+site itself costs per command.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import tracemalloc
+import typing as t
+
+from arcana_go2.logger import LogLevel, make_logger
+
+lg = make_logger("arcana_go2.bench.logging_overhead", LogLevel.INFO)
+
+_PAYLOAD = {
+    "id": 7,
+    "topic": "rt/api/sport/request",
+    "api_id": 1008,
+    "parameter": '{"x":0.5,"y":0.0,"z":0.1}',
+    "priority": 1,
+}
+_ENDPOINT = "/api/webrtc"
+
+
+def eager_fstring() -> None:
+    payload = _PAYLOAD
+    lg.debug(f"sending {payload=} to endpoint={_ENDPOINT}")
+
+
+def lazy_args() -> None:
+    lg.debug("sending payload=%r to endpoint=%s", _PAYLOAD, _ENDPOINT)
+
+
+def guarded_lazy_args() -> None:
+    if lg.debug_enabled:
+        lg.debug("sending payload=%r to endpoint=%s", _PAYLOAD, _ENDPOINT)
+
+
+def guarded_sampled_event() -> None:
+    if lg.debug_enabled:
+        lg.debug_sampled("rt/api/sport/request/1008", 100, "send_command", **_PAYLOAD)
+
+
+VARIANTS: dict[str, t.Callable[[], None]] = {
+    "eager f-string": eager_fstring,
+    "lazy %-args": lazy_args,
+    "guarded lazy %-args": guarded_lazy_args,
+    "guarded sampled event": guarded_sampled_event,
+}
+
+
+def peak_bytes_per_call(fn: t.Callable[[], None]) -> int:
+    fn()  # warm any caches so they are not counted
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - base
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'variant':<24}{'ns/call':>10}{'peak bytes/call':>18}")
+    for name, fn in VARIANTS.items():
+        seconds = min(timeit.repeat(fn, number=args.calls, repeat=5))
+        print(f"{name:<24}{seconds / args.calls * 1e9:>10.1f}{peak_bytes_per_call(fn):>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+An in-process HTTP/1.1 stand-in for the Go2's `/api/webrtc` endpoint.
+
+It answers commands the way the robot does, echoing the JSON body back, and `GET /api/state`
+with what it last acknowledged (for state pollers), with configurable
+injected latency, jitter, random errors and periodic bursts of 503s. It is deliberately tiny
+(keepalive, Content-Length bodies, nothing else) so that it costs little next to the client
+being measured. Run it on its own with `python -m arcana_go2.bench.mock_server --port 5656`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import json
+import random
+import typing as t
+
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+STATE_PATH = "/api/state"
+
+_REASONS = {200: "OK", 404: "Not Found", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # extra uniform random delay in [0, jitter)
+    error_rate: float = 0.0  # fraction of commands answered with a 500
+    burst_period: float = 0.0  # every this many seconds, start a burst of 503s; 0 disables
+    burst_duration: float = 0.0  # how long each burst lasts
+    seed: int | None = 0  # fixed by default so runs are comparable
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    commands: int = 0
+    errors: int = 0
+    unavailable: int = 0
+    connections: int = 0
+
+
+class MockGo2Server:
+    def __init__(
+        self, config: MockConfig | None = None, *, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self.config = config or MockConfig()
+        self._host = host
+        self._port = port
+        self._random = random.Random(self.config.seed)
+        self._server: asyncio.Server | None = None
+        self._started_at = 0.0
+        self._connections: dict[asyncio.Task[None], asyncio.StreamWriter] = {}
+        self.stats = MockStats()
+        # what `GET /api/state` reports: the last acknowledged command and move setpoint
+        self._last_api_id = 0
+        self._velocity = {"x": 0.0, "y": 0.0, "z": 0.0}
+
+    @property
+    def port(self) -> int:
+        if self._server is None:
+            raise RuntimeError("server is not started")
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._host}:{self.port}"
+
+    async def __aenter__(self) -> MockGo2Server:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._on_connect, self._host, self._port)
+        self._started_at = asyncio.get_running_loop().time()
+        lg.info("mock go2 listening on %s", self.url)
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._connections.values()):
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[task] = writer
+        self.stats.connections += 1
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, keep_alive, body = request
+                status, response = await self._respond(method, path, body)
+                writer.write(
+                    b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n%s\r\n"
+                    % (
+                        status,
+                        _REASONS.get(status, "Unknown").encode(),
+                        len(response),
+                        b"" if keep_alive else b"Connection: close\r\n",
+                    )
+                    + response
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            lg.debug("mock go2 dropping connection: %s", e)
+        finally:
+            writer.close()
+            self._connections.pop(task, None)
+
+    @staticmethod
+    async def _read_request(
+        reader: asyncio.StreamReader,
+    ) -> tuple[str, str, bool, bytes] | None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0"))
+        body = await reader.readexactly(length) if length else b""
+        keep_alive = headers.get("connection", "").lower() != "close"
+        return method, path, keep_alive, body
+
+    async def _respond(self, method: str, path: str, body: bytes) -> tuple[int, bytes]:
+        self.stats.requests += 1
+        config = self.config
+        delay = config.latency + (self._random.random() * config.jitter if config.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        path = path.split("?", 1)[0]
+        if method == "GET" and path == STATE_PATH:
+            return 200, self._state()
+        if method != "POST" or path != "/api/webrtc":
+            return (200, b"{}") if method == "GET" else (404, b'{"detail":"Not Found"}')
+        self.stats.commands += 1
+        if self._in_burst():
+            self.stats.unavailable += 1
+            return 503, b'{"detail":"busy"}'
+        if config.error_rate and self._random.random() < config.error_rate:
+            self.stats.errors += 1
+            return 500, b'{"detail":"injected error"}'
+        self._acknowledge(body)
+        return 200, body
+
+    def _acknowledge(self, body: bytes) -> None:
+        try:
+            command = json.loads(body)
+            self._last_api_id = int(command["api_id"])
+            if self._last_api_id == 1008:  # move
+                self._velocity = json.loads(command["parameter"])
+            elif self._last_api_id in (1001, 1003):  # damp, stopmove
+                self._velocity = {"x": 0.0, "y": 0.0, "z": 0.0}
+        except (ValueError, KeyError, TypeError):
+            pass  # the mock echoes whatever it is sent; only well-formed commands move it
+
+    def _state(self) -> bytes:
+        return json.dumps(
+            {
+                "t": asyncio.get_running_loop().time() - self._started_at,
+                "commands": self.stats.commands,
+                "api_id": self._last_api_id,
+                "velocity": self._velocity,
+            }
+        ).encode()
+
+    def _in_burst(self) -> bool:
+        config = self.config
+        if config.burst_period <= 0 or config.burst_duration <= 0:
+            return False
+        elapsed = asyncio.get_running_loop().time() - self._started_at
+        return elapsed % config.burst_period < config.burst_duration
+
+
+def main(argv: t.Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a mock Go2 command endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5656)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--burst-period", type=float, default=0.0)
+    parser.add_argument("--burst-duration", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    config = MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        burst_period=args.burst_period,
+        burst_duration=args.burst_duration,
+    )
+    asyncio.run(MockGo2Server(config, host=args.host, port=args.port).serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Throughput and latency benchmark for `ArcanaGO2` against the local mock Go2.
+
+Run with `python -m arcana_go2.bench`. For each concurrency level it keeps that many `move`
+commands in flight (closed loop); for each `--rates` entry it fires commands on a fixed
+schedule regardless of completions (open loop). Every level reports commands/sec, latency
+percentiles and event-loop lag, the worst oversleep of a 1 ms ticker running alongside.
+
+Numbers are the median of `--repeat` runs after a warmup, against a mock with a fixed seed.
+`--save` writes them as a baseline and `--compare` diffs a run against one, exiting non-zero
+when throughput drops or p99 rises by more than `--tolerance`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass
+import json
+import statistics
+import sys
+import time
+import typing as t
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+
+
+@dataclass
+class LevelResult:
+    commands_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    errors: int
+    loop_lag_ms: float
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class _LoopLagProbe:
+    """Measures how late a 1 ms periodic sleep wakes up; a blocked loop shows up here."""
+
+    def __init__(self, period: float = 0.001) -> None:
+        self._period = period
+        self.worst = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> _LoopLagProbe:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        assert self._task is not None
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self._period)
+            self.worst = max(self.worst, time.perf_counter() - start - self._period)
+
+
+async def _timed_move(go2: ArcanaGO2, latencies: list[float], errors: list[int]) -> None:
+    start = time.perf_counter()
+    try:
+        await go2.move(id=0, x=0.2, y=0.0, z=0.1)
+    except Exception:
+        errors[0] += 1
+    latencies.append(time.perf_counter() - start)
+
+
+async def _closed_loop(go2: ArcanaGO2, concurrency: int, commands: int) -> LevelResult:
+    latencies: list[float] = []
+    errors = [0]
+    remaining = commands
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await _timed_move(go2, latencies, errors)
+
+    async with _LoopLagProbe() as probe:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return _summarize(latencies, errors[0], elapsed, probe.worst)
+
+
+async def _open_loop(go2: ArcanaGO2, rate_hz: float, commands: int) -> LevelResult:
+    latencies: list[float] = []
+    errors = [0]
+    loop = asyncio.get_running_loop()
+    in_flight: list[asyncio.Task[None]] = []
+    async with _LoopLagProbe() as probe:
+        start = time.perf_counter()
+        next_at = loop.time()
+        for _ in range(commands):
+            next_at += 1.0 / rate_hz
+            await asyncio.sleep(max(next_at - loop.time(), 0.0))
+            in_flight.append(loop.create_task(_timed_move(go2, latencies, errors)))
+        await asyncio.gather(*in_flight)
+        elapsed = time.perf_counter() - start
+    return _summarize(latencies, errors[0], elapsed, probe.worst)
+
+
+def _summarize(latencies: list[float], errors: int, elapsed: float, lag: float) -> LevelResult:
+    ordered = sorted(latencies)
+    return LevelResult(
+        commands_per_second=len(latencies) / elapsed if elapsed else 0.0,
+        p50_ms=_percentile(ordered, 0.50) * 1e3,
+        p95_ms=_percentile(ordered, 0.95) * 1e3,
+        p99_ms=_percentile(ordered, 0.99) * 1e3,
+        errors=errors,
+        loop_lag_ms=lag * 1e3,
+    )
+
+
+def _median(results: list[LevelResult]) -> LevelResult:
+    return LevelResult(
+        **{
+            name: statistics.median(getattr(result, name) for result in results)
+            for name in LevelResult.__dataclass_fields__
+        }
+    )
+
+
+async def run_benchmark(
+    *,
+    concurrency: t.Sequence[int],
+    rates: t.Sequence[float],
+    commands: int,
+    repeat: int,
+    warmup: int,
+    mock: MockConfig,
+) -> dict[str, LevelResult]:
+    results: dict[str, LevelResult] = {}
+    async with MockGo2Server(mock) as server:
+        async with ArcanaGO2(base_url=server.url) as go2:
+            await go2.warmup()
+            await _closed_loop(go2, max(concurrency, default=1), warmup)
+            for level in concurrency:
+                runs = [await _closed_loop(go2, level, commands) for _ in range(repeat)]
+                results[f"concurrency={level}"] = _median(runs)
+            for rate in rates:
+                runs = [await _open_loop(go2, rate, commands) for _ in range(repeat)]
+                results[f"rate={rate:g}Hz"] = _median(runs)
+    return results
+
+
+def _print_results(
+    results: dict[str, LevelResult], baseline: dict[str, LevelResult] | None = None
+) -> None:
+    header = f"{'level':<20}{'cmd/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header + f"{'errors':>8}{'lag ms':>9}" + ("   vs baseline" if baseline else ""))
+    for level, result in results.items():
+        row = (
+            f"{level:<20}{result.commands_per_second:>10.0f}{result.p50_ms:>9.2f}"
+            f"{result.p95_ms:>9.2f}{result.p99_ms:>9.2f}{result.errors:>8.0f}"
+            f"{result.loop_lag_ms:>9.2f}"
+        )
+        before = (baseline or {}).get(level)
+        if before is not None:
+            row += (
+                f"   cmd/s {_delta(result.commands_per_second, before.commands_per_second):+.1%}"
+                f", p99 {_delta(result.p99_ms, before.p99_ms):+.1%}"
+            )
+        print(row)
+
+
+def _delta(now: float, before: float) -> float:
+    return (now - before) / before if before else 0.0
+
+
+def regressions(
+    results: dict[str, LevelResult], baseline: dict[str, LevelResult], tolerance: float
+) -> list[str]:
+    """Levels whose throughput fell, or whose p99 rose, by more than `tolerance`."""
+    found = []
+    for level, before in baseline.items():
+        now = results.get(level)
+        if now is None:
+            continue
+        if _delta(now.commands_per_second, before.commands_per_second) < -tolerance:
+            found.append(
+                f"{level}: throughput {before.commands_per_second:.0f} -> "
+                f"{now.commands_per_second:.0f} cmd/s"
+            )
+        if _delta(now.p99_ms, before.p99_ms) > tolerance:
+            found.append(f"{level}: p99 {before.p99_ms:.2f} -> {now.p99_ms:.2f} ms")
+    return found
+
+
+def load_results(path: str) -> dict[str, LevelResult]:
+    with open(path) as f:
+        return {level: LevelResult(**values) for level, values in json.load(f).items()}
+
+
+def save_results(path: str, results: dict[str, LevelResult]) -> None:
+    with open(path, "w") as f:
+        json.dump({level: asdict(result) for level, result in results.items()}, f, indent=2)
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma separated levels")
+    parser.add_argument("--rates", default="", help="comma separated open-loop rates in Hz")
+    parser.add_argument("--commands", type=int, default=2000, help="commands per level and run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="mock latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="mock jitter, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--burst-period", type=float, default=0.0)
+    parser.add_argument("--burst-duration", type=float, default=0.0)
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        run_benchmark(
+            concurrency=[int(level) for level in args.concurrency.split(",") if level],
+            rates=[float(rate) for rate in args.rates.split(",") if rate],
+            commands=args.commands,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            mock=MockConfig(
+                latency=args.latency,
+                jitter=args.jitter,
+                error_rate=args.error_rate,
+                burst_period=args.burst_period,
+                burst_duration=args.burst_duration,
+            ),
+        )
+    )
+    baseline = load_results(args.compare) if args.compare else None
+    _print_results(results, baseline)
+    if args.save:
+        save_results(args.save, results)
+    if baseline is not None:
+        found = regressions(results, baseline, args.tolerance)
+        for regression in found:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
@@ -0,0 +1,92 @@
+"""
+Cold-start benchmark for the `arcana-go2` command line.
+
+Run with `python -m arcana_go2.bench.startup`. Each run spawns a fresh interpreter that
+sends one command to the local mock Go2 and exits, and the wall time from spawn to exit is
+what a shell hook or watchdog waits for. The median `--command` (an emergency `damp` by
+default) must stay under `--budget`, and the command must not import any of the heavy
+modules the fast path is meant to avoid; either failure exits non-zero. The full
+`ArcanaGO2` path (`sit`) is timed alongside for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import typing as t
+
+from arcana_go2.bench.mock_server import MockGo2Server
+
+# the stop fast path exists to avoid these; importing any of them is a regression
+HEAVY_MODULES = ("asyncio", "httpx", "pydantic", "numpy", "arcana_go2.arcana_go2")
+
+
+async def _time_command(url: str, command: str, *extra: str) -> tuple[float, bytes]:
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        *extra,
+        "-m",
+        "arcana_go2.cli",
+        "--url",
+        url,
+        "--quiet",
+        command,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"{command} exited {process.returncode}: {stderr.decode()[-500:]}")
+    return elapsed, stderr
+
+
+def heavy_imports(importtime_log: str) -> list[str]:
+    """The `HEAVY_MODULES` named in a `python -X importtime` log."""
+    imported = {line.rsplit("|", 1)[-1].strip() for line in importtime_log.splitlines()}
+    return [module for module in HEAVY_MODULES if module in imported]
+
+
+async def run_startup(command: str, runs: int) -> tuple[list[float], list[float], list[str]]:
+    async with MockGo2Server() as mock:
+        # the first spawn also writes bytecode caches; keep it out of the numbers
+        await _time_command(mock.url, command)
+        fast = [(await _time_command(mock.url, command))[0] for _ in range(runs)]
+        full = [(await _time_command(mock.url, "sit"))[0] for _ in range(max(runs // 4, 1))]
+        _, log = await _time_command(mock.url, command, "-X", "importtime")
+    return fast, full, heavy_imports(log.decode())
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--command", default="damp")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=0.1, help="seconds, median cold start")
+    args = parser.parse_args(argv)
+
+    fast, full, heavy = asyncio.run(run_startup(args.command, args.runs))
+    median = statistics.median(fast)
+    print(
+        f"{args.command:<10} p50 {median * 1e3:7.1f} ms  max {max(fast) * 1e3:7.1f} ms"
+        f"  budget {args.budget * 1e3:.0f} ms"
+    )
+    print(f"{'sit':<10} p50 {statistics.median(full) * 1e3:7.1f} ms  (full ArcanaGO2 path)")
+
+    failed = False
+    if median > args.budget:
+        print(f"REGRESSION {args.command} cold start over budget", file=sys.stderr)
+        failed = True
+    for module in heavy:
+        print(f"REGRESSION {args.command} imports {module}", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
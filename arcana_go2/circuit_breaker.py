@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import time
+import typing as t
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+CircuitState = t.Literal["closed", "open", "half_open"]
+StateListener = t.Callable[[CircuitState, CircuitState], None]
+
+
+class CircuitOpenError(APIException):
+    """Raised without touching the network while the circuit is open."""
+
+
+@dataclass
+class CircuitBreakerConfig:
+    failure_threshold: int = 5  # consecutive failed attempts that open the circuit
+    reset_timeout: float = 2.0  # seconds open before probing (half-open)
+    half_open_requests: int = 1  # trial requests let through while half-open
+    probe: bool = True  # while open, the client probes on its own instead of waiting for traffic
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while the robot looks down.
+
+    Closed, every request goes through and consecutive failures (transport errors, timeouts,
+    5xx) are counted; `failure_threshold` of them open the circuit. Open, `allow` refuses
+    everything until `reset_timeout` has passed, then the circuit turns half-open and lets
+    `half_open_requests` trials through: a success closes it, a failure opens it again.
+    Listeners are called with `(old, new)` on every transition, from the event loop.
+    """
+
+    def __init__(
+        self,
+        config: CircuitBreakerConfig | None = None,
+        *,
+        clock: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or CircuitBreakerConfig()
+        self._clock = clock
+        self._state: CircuitState = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_at = 0.0
+        self._listeners: list[StateListener] = []
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open circuit turns half-open, 0 otherwise."""
+        if self._state != "open":
+            return 0.0
+        return max(self._opened_at + self.config.reset_timeout - self._clock(), 0.0)
+
+    def add_listener(self, listener: StateListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: StateListener) -> None:
+        self._listeners.remove(listener)
+
+    def allow(self) -> bool:
+        if self._state == "open":
+            if self.retry_in > 0:
+                return False
+            self._transition("half_open")
+        if self._state == "half_open":
+            now = self._clock()
+            if self._trials >= self.config.half_open_requests:
+                # a trial that never reported back (e.g. cancelled) stops blocking after a while
+                if now - self._trial_at < self.config.reset_timeout:
+                    return False
+                self._trials = 0
+            self._trials += 1
+            self._trial_at = now
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self._state == "half_open":
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        if self._state == "half_open":
+            self._transition("open")
+            return
+        self._failures += 1
+        if self._state == "closed" and self._failures >= self.config.failure_threshold:
+            self._transition("open")
+
+    def _transition(self, state: CircuitState) -> None:
+        old, self._state = self._state, state
+        self._trials = 0
+        if state == "open":
+            self._opened_at = self._clock()
+        if state == "closed":
+            self._failures = 0
+        (lg.warning if state == "open" else lg.info)(f"circuit {old} -> {state}")
+        for listener in list(self._listeners):
+            try:
+                listener(old, state)
+            except Exception as e:
+                lg.warning("circuit listener %r raised: %s", listener, e, exc_info=e)
+
+
+async def probe_until_closed(
+    breaker: CircuitBreaker, probe: t.Callable[[], t.Awaitable[bool]]
+) -> None:
+    """Drive an open `breaker` back to closed by calling `probe` each time it turns half-open."""
+    while breaker.state != "closed":
+        await asyncio.sleep(breaker.retry_in)
+        if not breaker.allow():
+            # another request took the half-open trial; give it a moment to settle
+            await asyncio.sleep(min(breaker.config.reset_timeout, 0.1))
+            continue
+        try:
+            healthy = await probe()
+        except Exception as e:
+            lg.debug("circuit probe raised: %s", e)
+            healthy = False
+        if healthy:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
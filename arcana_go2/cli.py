@@ -0,0 +1,246 @@
+"""
+`arcana-go2`: send one command, or a batch read from stdin, from a shell.
+
+    arcana-go2 --url http://192.168.12.1:5656 sit
+    arcana-go2 move x=0.3 y=0 z=0
+    arcana-go2 damp                      # emergency stop, sent without importing ArcanaGO2
+    printf 'standup\\nhello\\n' | arcana-go2 -
+
+Shell hooks and watchdogs pay for interpreter start and imports on every call, so this module
+imports only the standard library at load time. `damp` and `stopmove` are posted with
+`http.client` directly; every other command imports `ArcanaGO2` (pydantic, httpx, asyncio)
+only once it is actually needed. `python -m arcana_go2.bench.startup` measures the cold start
+against its budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import typing as t
+from urllib.parse import urlsplit
+
+DEFAULT_URL = "http://localhost:5656"
+URL_ENV = "ARCANA_GO2_URL"
+TOKEN_ENV = "ARCANA_GO2_TOKEN"
+
+# arcana_go2.transport.COMMAND_ENDPOINT; importing it would pull in httpx
+_COMMAND_ENDPOINT = "/api/webrtc"
+_SPORT_TOPIC = "rt/api/sport/request"
+# stops skip ArcanaGO2 entirely so they go out as soon as the interpreter is up
+_FAST_STOPS = {"damp": 1001, "stopmove": 1003}
+
+Invocation = tuple[str, dict[str, t.Any]]
+
+
+class CommandLineError(ValueError):
+    """A command or batch line that cannot be sent as written."""
+
+
+def parse_value(raw: str) -> t.Any:
+    """JSON if it parses (`0.3`, `true`, `"a"`), the bare string otherwise."""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def parse_invocation(tokens: t.Sequence[str]) -> Invocation:
+    """`["move", "x=0.3", "y=0"]` -> `("move", {"x": 0.3, "y": 0})`."""
+    if not tokens:
+        raise CommandLineError("missing command")
+    name, *pairs = tokens
+    kwargs: dict[str, t.Any] = {}
+    for pair in pairs:
+        key, sep, raw = pair.partition("=")
+        if not sep or not key:
+            raise CommandLineError(f"expected key=value, got {pair!r}")
+        kwargs[key] = parse_value(raw)
+    return name, kwargs
+
+
+def parse_batch_line(line: str) -> Invocation | None:
+    """
+    One batch line: `move x=0.3 y=0 z=0`, or a JSON object `{"command": ..., "args": {...}}`
+    as in a motion script (any `at` is ignored). Blank lines and `#` comments give None.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if not line.startswith("{"):
+        return parse_invocation(line.split())
+    try:
+        step = json.loads(line)
+    except ValueError as e:
+        raise CommandLineError(f"invalid JSON: {e}") from e
+    name, kwargs = step.get("command"), step.get("args") or {}
+    if not isinstance(name, str) or not isinstance(kwargs, dict):
+        raise CommandLineError("expected {'command': str, 'args': object}")
+    return name, kwargs
+
+
+def _read_batch(stream: t.TextIO) -> t.Iterator[Invocation | CommandLineError]:
+    # streamed, so a producer can keep piping commands into a long-running batch
+    for number, line in enumerate(stream, start=1):
+        try:
+            invocation = parse_batch_line(line)
+        except CommandLineError as e:
+            yield CommandLineError(f"line {number}: {e}")
+            continue
+        if invocation is not None:
+            yield invocation
+
+
+def send_stop(
+    url: str,
+    api_id: int,
+    *,
+    requester_id: int,
+    priority: int = 0,
+    timeout: float = 2.0,
+    token: str | None = None,
+) -> None:
+    """Post a stop with the standard library only; raises `OSError` unless the robot 2xx's."""
+    import http.client
+
+    from arcana_go2.command_encoding import JSON_CONTENT_TYPE, CommandEncoder
+
+    parts = urlsplit(url)
+    try:
+        port = parts.port
+    except ValueError as e:  # not a number, or out of range
+        raise OSError(f"bad URL {url!r}: {e}") from e
+    connection_type = (
+        http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    )
+    body = CommandEncoder().encode(requester_id, _SPORT_TOPIC, api_id, None, priority)
+    headers = {"Accept": "application/json", **JSON_CONTENT_TYPE}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    connection = connection_type(parts.hostname or "localhost", port, timeout=timeout)
+    try:
+        connection.request("POST", parts.path.rstrip("/") + _COMMAND_ENDPOINT, body, headers)
+        response = connection.getresponse()
+        detail = response.read()
+    except http.client.HTTPException as e:
+        # the peer does not speak HTTP, or broke off its response
+        raise OSError(f"bad response from {url}: {e!r}") from e
+    finally:
+        connection.close()
+    if not 200 <= response.status < 300:
+        raise OSError(f"robot answered {response.status}: {detail[:200]!r}")
+
+
+def _run_commands(
+    args: argparse.Namespace, invocations: t.Iterable[Invocation | CommandLineError]
+) -> int:
+    import asyncio
+
+    from arcana_go2.arcana_go2 import ArcanaGO2
+    from arcana_go2.sync_client import COMMANDS
+
+    token = os.environ.get(args.token_env) if args.token_env else None
+
+    async def run() -> int:
+        failures = 0
+        async with ArcanaGO2(
+            base_url=args.url,
+            get_token=(lambda: token) if token else None,
+            timeout=args.timeout,
+        ) as go2:
+            for invocation in invocations:
+                if isinstance(invocation, CommandLineError):
+                    failures += 1
+                    print(f"error: {invocation}", file=sys.stderr)
+                    continue
+                name, kwargs = invocation
+                if name not in COMMANDS:
+                    failures += 1
+                    print(f"error: unknown command {name!r}, see --list", file=sys.stderr)
+                    continue
+                kwargs = {"id": args.id, **kwargs}
+                if args.priority is not None:
+                    kwargs.setdefault("priority", args.priority)
+                start = time.perf_counter()
+                try:
+                    await getattr(go2, name)(**kwargs)
+                except Exception as e:  # a bad argument is as much a failed command as a 500
+                    failures += 1
+                    print(f"error: {name}: {e}", file=sys.stderr)
+                    continue
+                if not args.quiet:
+                    print(f"{name} ok in {(time.perf_counter() - start) * 1e3:.1f} ms")
+        return failures
+
+    return 1 if asyncio.run(run()) else 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="arcana-go2", description="Send ArcanaGO2 commands to a Go2 from the shell."
+    )
+    parser.add_argument("command", nargs="?", help="e.g. sit, move, damp; - reads a batch")
+    parser.add_argument("args", nargs="*", help="command arguments as key=value, e.g. x=0.3")
+    parser.add_argument(
+        "--url", default=os.environ.get(URL_ENV, DEFAULT_URL), help=f"default ${URL_ENV}"
+    )
+    parser.add_argument("--id", type=int, default=0, help="requester id")
+    parser.add_argument("--priority", type=int, choices=(0, 1), default=None)
+    parser.add_argument("--timeout", type=float, default=2.0, help="seconds per command")
+    parser.add_argument(
+        "--token-env", default=TOKEN_ENV, help="environment variable with the token"
+    )
+    parser.add_argument("--quiet", action="store_true", help="only report failures")
+    parser.add_argument("--list", action="store_true", help="list the available commands")
+    return parser
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list:
+        from arcana_go2.sync_client import COMMANDS
+
+        print("\n".join(COMMANDS))
+        return 0
+    if args.command is None:
+        parser.error("a command, or - for a batch on stdin, is required")
+
+    if args.command == "-":
+        if args.args:
+            parser.error("a batch takes no arguments on the command line")
+        return _run_commands(args, _read_batch(sys.stdin))
+
+    try:
+        name, kwargs = parse_invocation([args.command, *args.args])
+    except CommandLineError as e:
+        parser.error(str(e))
+
+    api_id = _FAST_STOPS.get(name)
+    if api_id is not None and not kwargs and urlsplit(args.url).scheme in ("http", "https"):
+        start = time.perf_counter()
+        try:
+            send_stop(
+                args.url,
+                api_id,
+                requester_id=args.id,
+                priority=args.priority or 0,
+                timeout=args.timeout,
+                token=os.environ.get(args.token_env) if args.token_env else None,
+            )
+        except OSError as e:
+            print(f"error: {name}: {e}", file=sys.stderr)
+            return 1
+        if not args.quiet:
+            print(f"{name} ok in {(time.perf_counter() - start) * 1e3:.1f} ms")
+        return 0
+
+    return _run_commands(args, [(name, kwargs)])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
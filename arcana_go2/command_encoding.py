@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import math
+import typing as t
+
+from arcana_go2.json_utils import JSONObject
+
+try:  # optional, noticeably faster for commands with arbitrary args
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+JSON_CONTENT_TYPE: t.Mapping[str, str] = {"Content-Type": "application/json"}
+_XYZ = ("x", "y", "z")
+
+
+def _stdlib_dumps(value: t.Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+# orjson writes floats, non-ASCII text and subclasses differently from `json.dumps`; flat
+# objects of these (and ASCII strings) are the ones both write byte for byte the same
+_ORJSON_SAME_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def _orjson_dumps(value: t.Any) -> str:
+    assert orjson is not None
+    if type(value) is dict and all(type(item) in _ORJSON_SAME_TYPES for item in value.values()):
+        try:
+            text = orjson.dumps(value).decode()
+        except TypeError:  # non-str keys, ints beyond 64 bits
+            pass
+        else:
+            if text.isascii():
+                return text
+    return _stdlib_dumps(value)
+
+
+def json_backend(name: t.Literal["auto", "json", "orjson"] = "auto") -> t.Callable[[t.Any], str]:
+    """Return a compact `dumps`; "auto" prefers orjson when it is installed."""
+    if name == "json" or (name == "auto" and orjson is None):
+        return _stdlib_dumps
+    if orjson is None:
+        raise ImportError("orjson is not installed, install arcana-go2[fast]")
+    return _orjson_dumps
+
+
+def _number(value: object) -> str | None:
+    """JSON text for an int or float (or a subclass), matching `json.dumps`; None otherwise."""
+    if isinstance(value, float):
+        return repr(float(value)) if math.isfinite(value) else json.dumps(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return repr(int(value))
+    return None
+
+
+class CommandEncoder:
+    """
+    Encodes `/api/webrtc` command bodies straight to bytes from precomputed templates.
+
+    Templates are built once per (topic, api_id, priority). Bodies of commands without args
+    depend only on the requester id on top of that and are cached whole, so `sit` or `standup`
+    cost a dict lookup. `{"x", "y", "z"}` args (`move`, `euler`) are formatted directly into
+    their template. Anything else goes through `dumps`, the JSON backend. Either way the
+    bytes are exactly what building the payload dict and `json.dumps`-ing it used to give.
+    """
+
+    _MAX_CACHED_BODIES = 1024
+
+    def __init__(self, *, dumps: t.Callable[[t.Any], str] | None = None) -> None:
+        self._dumps = dumps or json_backend()
+        self._templates: dict[tuple[str, int, int], str] = {}
+        self._xyz_templates: dict[tuple[str, int, int], str] = {}
+        self._bodies: dict[tuple[str, int, int, int], bytes] = {}
+
+    def encode(
+        self,
+        requester_id: int,
+        topic: str,
+        api_id: int,
+        command_args: JSONObject | None,
+        priority: int,
+    ) -> bytes:
+        if command_args is None:
+            key = (topic, api_id, priority, requester_id)
+            body = self._bodies.get(key)
+            if body is None:
+                body = (self._template(topic, api_id, priority) % (requester_id, '""')).encode()
+                if len(self._bodies) >= self._MAX_CACHED_BODIES:
+                    self._bodies.clear()
+                self._bodies[key] = body
+            return body
+
+        if len(command_args) == 3 and tuple(command_args) == _XYZ:
+            x = _number(command_args.get("x"))
+            y = _number(command_args.get("y"))
+            z = _number(command_args.get("z"))
+            if x is not None and y is not None and z is not None:
+                template = self._xyz_templates.get((topic, api_id, priority))
+                if template is None:
+                    template = self._xyz_template(topic, api_id, priority)
+                return (template % (requester_id, x, y, z)).encode()
+
+        parameter = json.dumps(self._dumps(command_args), ensure_ascii=False)
+        return (self._template(topic, api_id, priority) % (requester_id, parameter)).encode()
+
+    def _template(self, topic: str, api_id: int, priority: int) -> str:
+        key = (topic, api_id, priority)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = _build_template(topic, api_id, priority, "%s")
+        return template
+
+    def _xyz_template(self, topic: str, api_id: int, priority: int) -> str:
+        key = (topic, api_id, priority)
+        template = self._xyz_templates[key] = _build_template(
+            topic, api_id, priority, r'"{\"x\":%s,\"y\":%s,\"z\":%s}"'
+        )
+        return template
+
+
+def _build_template(topic: str, api_id: int, priority: int, parameter: str) -> str:
+    """A %-template taking the requester id followed by whatever `parameter` leaves open."""
+    return (
+        '{"id":%d,"topic":'
+        + json.dumps(topic, ensure_ascii=False).replace("%", "%%")
+        + f',"api_id":{int(api_id)},"parameter":{parameter},"priority":{int(priority)}}}'
+    )
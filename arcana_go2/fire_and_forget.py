@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import typing as t
+
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+ErrorCallback = t.Callable[[Exception], None]
+
+
+@dataclass
+class FireAndForgetStats:
+    sent: int = 0  # sends started
+    acked: int = 0  # sends the robot answered 2xx
+    failed: int = 0  # sends that raised; each one was also handed to the error callback
+    dropped: int = 0  # sends replaced by a newer one with the same key before they started
+
+
+class FireAndForget:
+    """
+    Runs sends in the background so the caller never waits on the robot's ack.
+
+    At most `max_in_flight` sends run at once. Beyond that each key (e.g. a command's topic
+    and api_id) keeps one send waiting, and a newer send with the same key replaces it, so a
+    control loop outpacing a slow robot sends its latest setpoints instead of piling up old
+    ones; replaced sends are counted in `stats.dropped`. Errors cannot reach the caller, so
+    each one is counted and passed to `on_error` (logged as a warning when no callback is
+    given). `drain` waits for every outstanding send, waiting ones included.
+    """
+
+    def __init__(self, on_error: ErrorCallback | None = None, *, max_in_flight: int = 8) -> None:
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight=}")
+        self._on_error = on_error
+        self._max_in_flight = max_in_flight
+        self._tasks: set[asyncio.Task[t.Any]] = set()
+        self._waiting: dict[t.Hashable, t.Coroutine[t.Any, t.Any, t.Any]] = {}
+        self.stats = FireAndForgetStats()
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._tasks) + len(self._waiting)
+
+    def spawn(self, send: t.Coroutine[t.Any, t.Any, t.Any], key: t.Hashable = None) -> None:
+        if len(self._tasks) < self._max_in_flight:
+            self._start(send)
+            return
+        replaced = self._waiting.get(key)
+        if replaced is not None:
+            replaced.close()
+            self.stats.dropped += 1
+        self._waiting[key] = send  # a replacement keeps its predecessor's place in line
+
+    async def drain(self) -> None:
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _start(self, send: t.Coroutine[t.Any, t.Any, t.Any]) -> None:
+        task = asyncio.get_running_loop().create_task(send)
+        self.stats.sent += 1
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task[t.Any]) -> None:
+        self._tasks.discard(task)
+        if self._waiting:
+            key = next(iter(self._waiting))  # the longest waiting
+            self._start(self._waiting.pop(key))
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            self.stats.acked += 1
+            return
+        self.stats.failed += 1
+        if not isinstance(error, Exception):  # pragma: no cover
+            return
+        if self._on_error is None:
+            lg.warning("fire-and-forget send failed: %s", error)
+            return
+        try:
+            self._on_error(error)
+        except Exception as e:
+            lg.warning("fire-and-forget error callback raised: %s", e, exc_info=e)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import inspect
+import time
+import typing as t
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.arcana_go2_base import CommandResult
+from arcana_go2.http_client import PoolConfig, SharedPool
+from arcana_go2.logger import make_logger
+from arcana_go2.token_manager import TokenProvider, as_token_manager
+from arcana_go2.transport import make_transport
+from arcana_go2.velocity_stream import SetpointKind
+
+if t.TYPE_CHECKING:
+    from arcana_go2.shaping import SetpointShaper, ShapingConfig
+
+lg = make_logger(__name__)
+
+
+@dataclass
+class FleetResult:
+    robot: str
+    response: CommandResult | None = None
+    error: Exception | None = None
+    latency: float = 0.0  # seconds, including any wait for a fleet-wide slot
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ArcanaGO2Fleet:
+    """
+    Drives many robots from one process.
+
+    Each robot gets its own `ArcanaGO2`, but all of them share one HTTP connection pool, one
+    token cache and one cap on requests in flight, so a broadcast to dozens of robots cannot
+    open an unbounded number of connections at once; `pool` sets the shared pool's limits,
+    by default `max_in_flight` connections across the fleet. Broadcasts run concurrently and
+    never raise for a single robot: every robot gets a `FleetResult` carrying either its
+    response or the exception it raised.
+    """
+
+    def __init__(
+        self,
+        robots: t.Mapping[str, str],
+        *,
+        get_token: TokenProvider | None = None,
+        timeout: float = 15.0,
+        max_in_flight: int = 64,
+        pool: PoolConfig | None = None,
+        shaping: ShapingConfig | t.Mapping[str, ShapingConfig] | None = None,
+    ) -> None:
+        """
+        `shaping` (one config for all robots, or one per robot name) shapes the setpoints
+        sent with `send_setpoints`, for the whole fleet in one batched step.
+        """
+        lg.debug("constructing fleet of %d robots", len(robots))
+        self._pool = SharedPool(
+            pool
+            or PoolConfig(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+        )
+        get_token = None if get_token is None else as_token_manager(get_token)
+        self._robots = {
+            name: ArcanaGO2(
+                base_url=url,
+                get_token=get_token,
+                timeout=timeout,
+                transport=make_transport(
+                    base_url=url, get_token=get_token, timeout=timeout, shared_pool=self._pool
+                ),
+            )
+            for name, url in robots.items()
+        }
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._index = {name: index for index, name in enumerate(self._robots)}
+        self._shaping = shaping
+        self._shapers: dict[SetpointKind, SetpointShaper] = {}
+
+    async def __aenter__(self) -> ArcanaGO2Fleet:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        lg.debug("cleaning up fleet")
+        await asyncio.gather(*(go2.close() for go2 in self._robots.values()))
+        await self._pool.close()
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._robots)
+
+    def __getitem__(self, name: str) -> ArcanaGO2:
+        return self._robots[name]
+
+    def __len__(self) -> int:
+        return len(self._robots)
+
+    async def broadcast(
+        self, command: str, *, robots: t.Iterable[str] | None = None, **kwargs: t.Any
+    ) -> dict[str, FleetResult]:
+        """Send `command` to every robot (or just `robots`) and wait for all of them."""
+        return {
+            result.robot: result
+            async for result in self.broadcast_iter(command, robots=robots, **kwargs)
+        }
+
+    async def broadcast_iter(
+        self, command: str, *, robots: t.Iterable[str] | None = None, **kwargs: t.Any
+    ) -> t.AsyncIterator[FleetResult]:
+        """
+        Send `command` to every robot (or just `robots`), yielding results as they complete.
+
+        `command` names an `ArcanaGO2` method, e.g. "sit" or "obstacle_avoid_switch_set", and
+        `kwargs` are passed to it unchanged for every robot.
+        """
+        self._check_command(command)
+        names = self.names if robots is None else list(robots)
+        unknown = [name for name in names if name not in self._robots]
+        if unknown:
+            raise KeyError(f"unknown robots {unknown}")
+        tasks = [asyncio.ensure_future(self._call(name, command, kwargs)) for name in names]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def send_setpoints(
+        self,
+        kind: SetpointKind,
+        setpoints: t.Mapping[str, t.Sequence[float]],
+        **kwargs: t.Any,
+    ) -> dict[str, FleetResult]:
+        """
+        Send a `move` or `euler` setpoint `(x, y, z)` per robot and wait for all of them.
+
+        With shaping, the whole fleet is shaped in one step: robots missing from `setpoints`
+        keep their previous target, and robots whose shaped output barely changed are not
+        sent anything (and have no result). `kwargs`, e.g. `id`, are passed to every command.
+        """
+        self._check_command(kind)
+        unknown = [name for name in setpoints if name not in self._robots]
+        if unknown:
+            raise KeyError(f"unknown robots {unknown}")
+        if self._shaping is None:
+            outputs = {name: tuple(setpoint) for name, setpoint in setpoints.items()}
+        else:
+            outputs = self._shape(kind, setpoints)
+        tasks = [
+            asyncio.ensure_future(self._call(name, kind, {**kwargs, "x": x, "y": y, "z": z}))
+            for name, (x, y, z) in outputs.items()
+        ]
+        try:
+            results = {result.robot: result for result in await asyncio.gather(*tasks)}
+        finally:
+            for task in tasks:
+                task.cancel()
+        if self._shaping is not None:
+            shaper = self._shapers[kind]
+            failed = [self._index[name] for name, result in results.items() if not result.ok]
+            shaper.forget_sent(failed)  # so they are sent again on the next step
+        return results
+
+    def _shape(
+        self, kind: SetpointKind, setpoints: t.Mapping[str, t.Sequence[float]]
+    ) -> dict[str, tuple[float, float, float]]:
+        shaper = self._shapers.get(kind)
+        if shaper is None:
+            from arcana_go2.shaping import SetpointShaper, ShapingConfig  # needs numpy
+
+            shaping = self._shaping
+            if isinstance(shaping, ShapingConfig):
+                shaper = SetpointShaper(shaping, robots=len(self._robots))
+            else:
+                assert shaping is not None
+                shaper = SetpointShaper(
+                    [shaping.get(name, ShapingConfig()) for name in self._robots]
+                )
+            self._shapers[kind] = shaper
+        targets = shaper.target.copy()
+        for name, setpoint in setpoints.items():
+            targets[self._index[name]] = setpoint
+        output = shaper.shape(targets)
+        send = shaper.changed(output)
+        shaper.stats.suppressed += int(len(send) - send.sum())
+        shaper.mark_sent(send)
+        names = list(self._robots)
+        return {
+            names[index]: (float(x), float(y), float(z))
+            for index, (x, y, z) in enumerate(output.tolist())
+            if send[index]
+        }
+
+    async def _call(self, name: str, command: str, kwargs: dict[str, t.Any]) -> FleetResult:
+        start = time.perf_counter()
+        try:
+            async with self._slots:
+                response = await getattr(self._robots[name], command)(**kwargs)
+        except Exception as e:
+            lg.warning("%s failed on %s: %s", command, name, e)
+            return FleetResult(robot=name, error=e, latency=time.perf_counter() - start)
+        return FleetResult(robot=name, response=response, latency=time.perf_counter() - start)
+
+    @staticmethod
+    def _check_command(command: str) -> None:
+        method = getattr(ArcanaGO2, command, None)
+        if (
+            command.startswith("_")
+            or command in ("close", "warmup")
+            or not inspect.iscoroutinefunction(method)
+        ):
+            raise ValueError(f"{command=} is not an ArcanaGO2 command")
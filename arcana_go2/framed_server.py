@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import errno
+import os
+import socket
+import stat
+import typing as t
+
+from arcana_go2.framing import FrameError, encode_frame, read_frame
+from arcana_go2.json_utils import JSONObject, JSONValue
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+FrameHandler = t.Callable[[JSONObject], t.Awaitable[tuple[int, JSONValue]]]
+
+
+async def echo_handler(body: JSONObject) -> tuple[int, JSONValue]:
+    """Answer like the robot does: a 200 echoing the command back."""
+    return 200, body
+
+
+def _answers(path: str) -> bool:
+    """Whether something is listening on the Unix socket at `path`."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+def _bind_unix(path: str, mode: int) -> socket.socket:
+    """A Unix socket bound at `path` whose file has `mode` from the start, never wider."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o777 & ~mode)
+    try:
+        sock.bind(path)
+    except BaseException:
+        sock.close()
+        raise
+    finally:
+        os.umask(umask)
+    return sock
+
+
+class FramedCommandServer:
+    """
+    A local stand-in for the robot that speaks the framed protocol in `arcana_go2.framing`.
+
+    Each request frame is handed to `handler` in its own task, so slow commands do not hold up
+    the ones pipelined behind them and responses can go out of order. With `path` it listens
+    on a Unix domain socket instead of TCP; a stale socket file is replaced, but one another
+    server still answers on is not. `mode`, if given, sets the socket file's permissions.
+    """
+
+    def __init__(
+        self,
+        *,
+        handler: FrameHandler | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str | None = None,
+        mode: int | None = None,
+    ) -> None:
+        self._handler = handler or echo_handler
+        self._host = host
+        self._port = port
+        self._path = path
+        self._mode = mode
+        self._server: asyncio.Server | None = None
+        self._connections: dict[asyncio.Task[None], asyncio.StreamWriter] = {}
+
+    @property
+    def port(self) -> int:
+        if self._server is None:
+            raise RuntimeError("server is not started")
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        if self._path is not None:
+            return f"unix://{self._path}"
+        return f"tcp://{self._host}:{self.port}"
+
+    async def __aenter__(self) -> FramedCommandServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        if self._path is not None:
+            if os.path.exists(self._path) and stat.S_ISSOCK(os.stat(self._path).st_mode):
+                if _answers(self._path):
+                    raise OSError(errno.EADDRINUSE, "another server is listening", self._path)
+                os.unlink(self._path)  # left behind by a previous run
+            if self._mode is None:
+                self._server = await asyncio.start_unix_server(self._on_connect, self._path)
+            else:
+                self._server = await asyncio.start_unix_server(
+                    self._on_connect, sock=_bind_unix(self._path, self._mode)
+                )
+        else:
+            self._server = await asyncio.start_server(self._on_connect, self._host, self._port)
+        lg.info("framed command server listening on %s", self.url)
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        # closing the sockets ends each connection's read loop, which then cleans up after itself
+        for writer in list(self._connections.values()):
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        if self._path is not None and os.path.exists(self._path):
+            os.unlink(self._path)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[task] = writer
+        in_flight: set[asyncio.Task[None]] = set()
+        try:
+            while (frame := await read_frame(reader)) is not None:
+                request = asyncio.get_running_loop().create_task(self._answer(frame, writer))
+                in_flight.add(request)
+                request.add_done_callback(in_flight.discard)
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        except (OSError, FrameError, ValueError) as e:
+            lg.warning("dropping framed client: %s", e)
+        finally:
+            for request in in_flight:
+                request.cancel()
+            writer.close()
+            self._connections.pop(task, None)
+
+    async def _answer(self, frame: JSONObject, writer: asyncio.StreamWriter) -> None:
+        body = frame.get("body")
+        try:
+            status, response = await self._handler(body if isinstance(body, dict) else {})
+        except Exception as e:
+            lg.warning("handler failed for frame=%r: %s", frame, e)
+            detail: JSONObject = {"detail": str(e)}
+            status, response = 500, detail
+        if writer.is_closing():
+            return
+        writer.write(encode_frame({"cid": frame.get("cid"), "status": status, "body": response}))
+        await writer.drain()
+
+
+async def _serve(host: str, port: int) -> None:
+    await FramedCommandServer(host=host, port=port).serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local echoing stand-in for the Go2.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5657)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
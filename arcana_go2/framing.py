@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+import typing as t
+
+from arcana_go2.json_utils import JSONObject
+
+# Every frame is a 4 byte big-endian length followed by that many bytes of compact JSON.
+# Requests look like {"cid": int, "body": {...}}, responses like {"cid": int, "status": int,
+# "body": {...}}; `cid` is the correlation id that lets many requests share one connection.
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 1 << 20
+
+
+class FrameError(Exception):
+    """Raised when the peer sends something that is not a valid frame."""
+
+
+def encode_frame(message: JSONObject) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode()
+    if len(body) > MAX_FRAME_BYTES:
+        raise FrameError(f"frame of {len(body)} bytes exceeds {MAX_FRAME_BYTES=}")
+    return _HEADER.pack(len(body)) + body
+
+
+def encode_request_frame(cid: int, body: bytes) -> bytes:
+    """Wrap an already JSON-encoded command body in a request frame without re-encoding it."""
+    frame = b'{"cid":%d,"body":%b}' % (cid, body)
+    if len(frame) > MAX_FRAME_BYTES:
+        raise FrameError(f"frame of {len(frame)} bytes exceeds {MAX_FRAME_BYTES=}")
+    return _HEADER.pack(len(frame)) + frame
+
+
+async def read_frame(reader: asyncio.StreamReader) -> JSONObject | None:
+    """Read one frame, returning None on a clean EOF between frames."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise FrameError("connection closed mid-header") from e
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise FrameError(f"peer announced {size} byte frame, limit is {MAX_FRAME_BYTES=}")
+    try:
+        body = await reader.readexactly(size)
+    except asyncio.IncompleteReadError as e:
+        raise FrameError("connection closed mid-frame") from e
+    message = json.loads(body)
+    if not isinstance(message, dict):
+        raise FrameError(f"expected a JSON object, got {type(message).__name__}")
+    return t.cast(JSONObject, message)
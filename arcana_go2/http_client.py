@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+from collections import deque
 from dataclasses import dataclass
+import functools
+import importlib.util
+import random
+import time
 import httpx
 from pydantic import BaseModel, ValidationError
 import typing as t
@@ -8,7 +14,22 @@ import typing as t
 from arcana_go2.json_utils import JSONKey, JSONValue, JSONObject
 from arcana_go2.http_utils import QueryParams, ParamSequence, ScalarParam
 from arcana_go2.api_exception import APIException
+from arcana_go2.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    CircuitState,
+    probe_until_closed,
+)
+from arcana_go2.instrumentation import CURRENT_SAMPLE
 from arcana_go2.logger import make_logger
+from arcana_go2.response_cache import (
+    ResponseCache,
+    ResponseCacheConfig,
+    ResponseCacheStats,
+    cache_key,
+)
+from arcana_go2.token_manager import TokenProvider, as_token_manager
 
 lg = make_logger(__name__)
 
@@ -19,34 +40,201 @@ T = t.TypeVar("T", bound=BaseModel)
 class FastAPIClientConfig:
     attempts: int = 3  # total attempts including the first
     backoff_base_seconds: float = 0.25  # exponential backoff base
+    backoff_max_seconds: float = 2.0  # cap on a single backoff sleep
+    backoff_jitter: float = 0.5  # fraction of each delay that is randomized, 0 disables jitter
     retry_on_status: tuple[int, ...] = (408, 425, 429, 500, 502, 503, 504)
 
 
+@dataclass
+class PoolConfig:
+    max_connections: int = 10
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0  # seconds an idle connection is kept open
+    http2: bool = False  # multiplex requests over one connection, needs the http2 extra
+    warmup_connections: int = 2  # connections `warmup` opens ahead of the first request
+    idle_ping_interval: float | None = None  # ping when idle this long to keep connections hot
+    ping_path: str = "/"  # any cheap endpoint; only the connection matters, not the status
+
+
+@dataclass
+class HedgeConfig:
+    quantile: float = 0.95  # hedge a request once it is slower than this quantile of recent RTTs
+    initial_delay: float = 0.1  # hedge delay used until `min_samples` RTTs have been observed
+    min_delay: float = 0.005
+    max_delay: float = 1.0
+    min_samples: int = 20
+    history: int = 256  # RTTs kept for the quantile
+    budget_ratio: float = 0.1  # hedges earned per eligible request, caps the extra load
+    budget_burst: float = 5.0  # hedges that can be spent back to back
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0  # hedge-eligible requests
+    hedged: int = 0  # duplicates sent
+    hedge_won: int = 0  # duplicates that answered first
+    rate_limited: int = 0  # duplicates not sent because the budget was spent
+
+
+class _Hedger:
+    """Tracks RTTs for the adaptive hedge delay and a token bucket of hedges."""
+
+    _RECOMPUTE_EVERY = 16
+
+    def __init__(self, config: HedgeConfig) -> None:
+        self.config = config
+        self.stats = HedgeStats()
+        self.delay = config.initial_delay
+        self._rtts: deque[float] = deque(maxlen=config.history)
+        self._since_recompute = 0
+        self._budget = config.budget_burst
+
+    def earn(self) -> None:
+        self.stats.requests += 1
+        self._budget = min(self._budget + self.config.budget_ratio, self.config.budget_burst)
+
+    def spend(self) -> bool:
+        if self._budget < 1.0:
+            self.stats.rate_limited += 1
+            return False
+        self._budget -= 1.0
+        self.stats.hedged += 1
+        return True
+
+    def observe(self, rtt: float) -> None:
+        self._rtts.append(rtt)
+        self._since_recompute += 1
+        if (
+            len(self._rtts) < self.config.min_samples
+            or self._since_recompute < self._RECOMPUTE_EVERY
+        ):
+            return
+        self._since_recompute = 0
+        ordered = sorted(self._rtts)
+        at = ordered[min(int(self.config.quantile * len(ordered)), len(ordered) - 1)]
+        self.delay = min(max(at, self.config.min_delay), self.config.max_delay)
+
+
+class _Borrowed(httpx.AsyncBaseTransport):
+    """Lends a shared pool to one `httpx.AsyncClient`; closing the client leaves it open."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class SharedPool:
+    """
+    One connection pool for several `HTTPClient`s, e.g. one per robot of a fleet.
+
+    Connections are still opened per host, but the `PoolConfig` limits apply to all of the
+    clients together, so many robots do not mean many pools. The pool outlives the clients
+    using it: close it once they are closed.
+    """
+
+    def __init__(self, pool: PoolConfig | None = None, *, verify_tls: bool | str = True) -> None:
+        self.config = pool or PoolConfig()
+        if self.config.http2 and importlib.util.find_spec("h2") is None:
+            raise ImportError("http2=True needs the h2 package, install arcana-go2[http2]")
+        self._transport = httpx.AsyncHTTPTransport(
+            verify=verify_tls,
+            http2=self.config.http2,
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry,
+            ),
+        )
+
+    def lend(self) -> httpx.AsyncBaseTransport:
+        return _Borrowed(self._transport)
+
+    async def close(self) -> None:
+        await self._transport.aclose()
+
+
 class HTTPClient:
     def __init__(
         self,
         *,
         base_url: str,
-        get_token: t.Callable[[], str | None] | None = None,
+        get_token: TokenProvider | None = None,
         timeout: float = 15.0,
         retry: FastAPIClientConfig | None = None,
         default_headers: t.Mapping[str, str] | None = None,
         verify_tls: bool | str = True,
+        pool: PoolConfig | None = None,
+        hedge: HedgeConfig | None = None,
+        circuit_breaker: CircuitBreakerConfig | None = None,
+        cache: ResponseCacheConfig | None = None,
+        shared_pool: SharedPool | None = None,
     ) -> None:
-        lg.debug(f"connecting to {base_url=}")
+        """With a `shared_pool`, its limits and TLS settings apply instead of `pool`'s."""
+        lg.debug("connecting to base_url=%r", base_url)
         self.base_url = base_url.rstrip("/")
-        self._get_token = get_token if get_token is not None else (lambda: None)
+        # the token is cached and refreshed off the request path; auth headers are rebuilt
+        # on the underlying client only when its value changes
+        self._tokens = as_token_manager(get_token)
+        self._headers_version = -1
         self._timeout = timeout
         self._retry = retry or FastAPIClientConfig()
         self._default_headers = dict(default_headers or {})
         self._verify_tls = verify_tls
-        # Connect immediately (no explicit open())
-        self._client: httpx.AsyncClient = httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=self._timeout,
-            verify=self._verify_tls,
-            headers=self._build_default_headers(),
-        )
+        self._pool = pool or PoolConfig()
+        if shared_pool is not None:
+            # warmup and idle pings still follow `pool`; connections are the shared pool's
+            self._client: httpx.AsyncClient = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self._timeout,
+                headers=self._build_default_headers(None),
+                transport=shared_pool.lend(),
+            )
+        else:
+            if self._pool.http2 and importlib.util.find_spec("h2") is None:
+                raise ImportError("http2=True needs the h2 package, install arcana-go2[http2]")
+            # Connect immediately (no explicit open())
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self._timeout,
+                verify=self._verify_tls,
+                headers=self._build_default_headers(None),
+                http2=self._pool.http2,
+                limits=httpx.Limits(
+                    max_connections=self._pool.max_connections,
+                    max_keepalive_connections=self._pool.max_keepalive_connections,
+                    keepalive_expiry=self._pool.keepalive_expiry,
+                ),
+            )
+        self._last_activity = 0.0
+        self._pinger: asyncio.Task[None] | None = None
+        # requests made with hedge=True are duplicated when slow, see `_hedged`
+        self._hedger = None if hedge is None else _Hedger(hedge)
+        # with a breaker, requests fail fast with CircuitOpenError while the server looks down
+        self.breaker = None if circuit_breaker is None else CircuitBreaker(circuit_breaker)
+        self._prober: asyncio.Task[None] | None = None
+        if self.breaker is not None and self.breaker.config.probe:
+            self.breaker.add_listener(self._on_circuit_change)
+        # with a cache, identical concurrent GETs share one request and may be served from
+        # memory; every write drops the responses its path invalidates
+        self.cache = None if cache is None else ResponseCache(cache)
+
+    @property
+    def hedge_stats(self) -> HedgeStats | None:
+        return None if self._hedger is None else self._hedger.stats
+
+    @property
+    def cache_stats(self) -> ResponseCacheStats | None:
+        return None if self.cache is None else self.cache.stats
+
+    def invalidate(self, prefix: str | None = None) -> None:
+        """Drop cached GET responses under `prefix` (all with None), e.g. after an outside change."""
+        if self.cache is not None:
+            self.cache.invalidate(prefix)
 
     async def __aenter__(self) -> "HTTPClient":
         return self
@@ -55,25 +243,175 @@ class HTTPClient:
         await self.close()
 
     async def close(self) -> None:
-        lg.debug(f"closing connection to {self.base_url=}")
+        lg.debug("closing connection to base_url=%r", self.base_url)
+        if self._pinger is not None:
+            self._pinger.cancel()
+            try:
+                await self._pinger
+            except asyncio.CancelledError:
+                pass
+            self._pinger = None
+        if self._prober is not None:
+            self._prober.cancel()
+            await asyncio.gather(self._prober, return_exceptions=True)
+            self._prober = None
         await self._client.aclose()
 
+    async def warmup(self, connections: int | None = None) -> int:
+        """
+        Open keepalive connections ahead of the first real request.
+
+        Fetches the auth token, then sends `connections` (default from the pool config)
+        concurrent GETs to `ping_path`, so each lands on its own new connection. Also starts
+        the idle pinger if the pool config asks for one. Returns how many connections
+        answered; any HTTP status counts, since only the connection matters.
+        """
+        await self._refresh_default_headers()
+        opened = await self._touch(connections or self._pool.warmup_connections)
+        lg.debug("warmed up %d connections to base_url=%r", opened, self.base_url)
+        if self._pool.idle_ping_interval is not None and self._pinger is None:
+            self._pinger = asyncio.get_running_loop().create_task(self._ping_when_idle())
+        return opened
+
+    async def _touch(self, connections: int) -> int:
+        async def ping() -> bool:
+            try:
+                await self._client.get(self._pool.ping_path, timeout=self._timeout)
+            except httpx.HTTPError as e:
+                lg.debug("ping to base_url=%r failed: %s", self.base_url, e)
+                return False
+            return True
+
+        results = await asyncio.gather(*(ping() for _ in range(max(connections, 1))))
+        return sum(results)
+
+    def _on_circuit_change(self, old: CircuitState, new: CircuitState) -> None:
+        if new == "open" and (self._prober is None or self._prober.done()):
+            self._prober = asyncio.get_running_loop().create_task(
+                probe_until_closed(t.cast(CircuitBreaker, self.breaker), self._probe)
+            )
+
+    async def _probe(self) -> bool:
+        assert self.breaker is not None
+        timeout = min(self._timeout, max(self.breaker.config.reset_timeout, 0.1))
+        try:
+            resp = await self._client.get(self._pool.ping_path, timeout=timeout)
+        except httpx.HTTPError as e:
+            lg.debug("circuit probe to base_url=%r failed: %s", self.base_url, e)
+            return False
+        return resp.status_code < 500
+
+    async def _ping_when_idle(self) -> None:
+        assert self._pool.idle_ping_interval is not None
+        interval = self._pool.idle_ping_interval
+        loop = asyncio.get_running_loop()
+        while True:
+            idle = loop.time() - self._last_activity
+            if idle < interval:
+                await asyncio.sleep(interval - idle)
+                continue
+            await self._touch(self._pool.warmup_connections)
+            self._last_activity = loop.time()
+
     async def get(
-        self, url: str, *, model: t.Type[T], params: QueryParams | None = None
+        self,
+        url: str,
+        *,
+        model: t.Type[T],
+        params: QueryParams | None = None,
+        deadline: float | None = None,
+        fresh: bool = False,
     ) -> T | None:
-        lg.debug(f"call GET at {url=} with\n{model=}\n{params=}")
-        return await self._request("GET", url, model=model, params=params)
+        """
+        With a cache, concurrent identical GETs (same url, params and model) share one request
+        and the result may come from the cache; the result is then shared, so do not mutate
+        it. `fresh` bypasses both and always sends.
+        """
+        if lg.debug_enabled:
+            lg.debug("call GET at url=%r with\nmodel=%r\nparams=%r", url, model, params)
+        if self.cache is None or fresh:
+            return await self._request("GET", url, model=model, params=params, deadline=deadline)
+        load = functools.partial(
+            self._request, "GET", url, model=model, params=params, deadline=deadline
+        )
+        try:
+            return await self.cache.fetch(
+                url, cache_key(url, params, model), load, deadline=deadline
+            )
+        except asyncio.TimeoutError as e:
+            # only reachable when sharing another caller's request with a shorter deadline
+            raise APIException(
+                "Deadline exceeded",
+                url=f"{self.base_url}{url}",
+                method="GET",
+                detail="waiting on a shared request",
+            ) from e
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        params: QueryParams | None = None,
+        deadline: float | None = None,
+        fresh: bool = False,
+    ) -> JSONValue:
+        """
+        Like `get`, but return the decoded JSON body as is, without building a model; for
+        pollers that read a few fields of every response. Shares the cache the same way.
+        """
+        if lg.debug_enabled:
+            lg.debug("call GET (json) at url=%r with\nparams=%r", url, params)
+        load = functools.partial(
+            self._request, "GET", url, model=None, params=params, deadline=deadline, raw=True
+        )
+        if self.cache is None or fresh:
+            return await load()
+        try:
+            return await self.cache.fetch(
+                url, cache_key(url, params, "json"), load, deadline=deadline
+            )
+        except asyncio.TimeoutError as e:
+            raise APIException(
+                "Deadline exceeded",
+                url=f"{self.base_url}{url}",
+                method="GET",
+                detail="waiting on a shared request",
+            ) from e
 
     async def post(
         self,
         url: str,
         *,
-        model: t.Type[T],
+        model: t.Type[T] | None,
         params: QueryParams | None = None,
         payload: JSONObject | None = None,
+        deadline: float | None = None,
+        content: bytes | None = None,
+        headers: t.Mapping[str, str] | None = None,
+        hedge: bool = False,
     ) -> T | None:
-        lg.debug(f"call POST at {url=} with\n{model=}\n{params=}")
-        return await self._request("POST", url, model=model, params=params, payload=payload)
+        """
+        `content` posts pre-encoded bytes instead of JSON-encoding `payload`. With `model=None`
+        the response is only status-checked; its body is neither parsed nor validated.
+        `hedge` marks the request as safe to send twice, see `_hedged`.
+        """
+        if lg.debug_enabled:
+            lg.debug("call POST at url=%r with\nmodel=%r\nparams=%r", url, model, params)
+        try:
+            return await self._request(
+                "POST",
+                url,
+                model=model,
+                params=params,
+                payload=payload,
+                content=content,
+                headers=headers,
+                deadline=deadline,
+                hedge=hedge,
+            )
+        finally:
+            if self.cache is not None:
+                self.cache.written(url)
 
     async def put(
         self,
@@ -82,9 +420,17 @@ class HTTPClient:
         model: t.Type[T],
         params: QueryParams | None = None,
         payload: JSONObject | None = None,
+        deadline: float | None = None,
     ) -> T | None:
-        lg.debug(f"call PUT at {url=} with\n{model=}\n{params=}")
-        return await self._request("PUT", url, model=model, params=params, payload=payload)
+        if lg.debug_enabled:
+            lg.debug("call PUT at url=%r with\nmodel=%r\nparams=%r", url, model, params)
+        try:
+            return await self._request(
+                "PUT", url, model=model, params=params, payload=payload, deadline=deadline
+            )
+        finally:
+            if self.cache is not None:
+                self.cache.written(url)
 
     async def patch(
         self,
@@ -93,9 +439,17 @@ class HTTPClient:
         model: t.Type[T],
         params: QueryParams | None = None,
         payload: JSONObject | None = None,
+        deadline: float | None = None,
     ) -> T | None:
-        lg.debug(f"call PATCH at {url=} with\n{model=}\n{params=}")
-        return await self._request("PATCH", url, model=model, params=params, payload=payload)
+        if lg.debug_enabled:
+            lg.debug("call PATCH at url=%r with\nmodel=%r\nparams=%r", url, model, params)
+        try:
+            return await self._request(
+                "PATCH", url, model=model, params=params, payload=payload, deadline=deadline
+            )
+        finally:
+            if self.cache is not None:
+                self.cache.written(url)
 
     async def delete(
         self,
@@ -104,35 +458,97 @@ class HTTPClient:
         model: t.Type[T],
         params: QueryParams | None = None,
         payload: JSONObject | None = None,
+        deadline: float | None = None,
     ) -> T | None:
-        lg.debug(f"call DELETE at {url=} with\n{model=}\n{params=}")
-        return await self._request("DELETE", url, model=model, params=params, payload=payload)
+        if lg.debug_enabled:
+            lg.debug("call DELETE at url=%r with\nmodel=%r\nparams=%r", url, model, params)
+        try:
+            return await self._request(
+                "DELETE", url, model=model, params=params, payload=payload, deadline=deadline
+            )
+        finally:
+            if self.cache is not None:
+                self.cache.written(url)
 
     async def _request(
         self,
         method: str,
         url: str,
         *,
-        model: t.Type[T],
+        model: t.Type[T] | None,
         params: QueryParams | None = None,
         payload: JSONObject | None = None,
+        content: bytes | None = None,
         headers: t.Mapping[str, str] | None = None,
         expected_status: t.Iterable[int] | int = (200, 201, 202, 204),
-    ) -> T | None:
-        hdrs = self._merge_headers(headers)
+        deadline: float | None = None,
+        hedge: bool = False,
+        raw: bool = False,
+    ) -> t.Any:
+        """
+        Issue a request, retrying on transport errors and retryable statuses.
+
+        Returns the validated `model`, or with `raw` the decoded JSON body, or None when
+        there is no body or neither was asked for.
+
+        `deadline` is a total budget in seconds for the call, covering every attempt and
+        every backoff sleep. Each attempt's timeout is clamped to whatever is left of it, and
+        no retry is started once the budget is spent. With a circuit breaker, every attempt
+        counts towards it, and no attempt is made while it is open.
+        """
+        await self._refresh_default_headers()
         expected = {expected_status} if isinstance(expected_status, int) else set(expected_status)
+        loop = asyncio.get_running_loop()
+        self._last_activity = loop.time()
+        sample = CURRENT_SAMPLE.get()
+        deadline_at = None if deadline is None else loop.time() + deadline
+        breaker = self.breaker
 
         last_err: Exception | None = None
         for attempt in range(1, self._retry.attempts + 1):
-            try:
-                resp = await self._client.request(
-                    method,
-                    url,
-                    params=params,
-                    json=payload,
-                    headers=hdrs,
+            timeout = self._timeout
+            if deadline_at is not None:
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    break
+                timeout = min(timeout, remaining)
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError(
+                    "Circuit open",
+                    url=f"{self.base_url}{url}",
+                    method=method,
+                    detail=f"retry in {breaker.retry_in:.2f}s",
                 )
+            if sample is not None and attempt > 1:
+                sample.retries += 1
+            sent_at = time.perf_counter()
+            send = functools.partial(
+                self._client.request,
+                method,
+                url,
+                params=params,
+                json=payload if content is None else None,
+                content=content,
+                headers=headers,
+                timeout=timeout,
+            )
+            try:
+                try:
+                    if hedge and self._hedger is not None:
+                        resp = await self._hedged(send, self._hedger, expected)
+                    else:
+                        resp = await send()
+                finally:
+                    if sample is not None:
+                        sample.network += time.perf_counter() - sent_at
+                if breaker is not None:
+                    if resp.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
                 if resp.status_code not in expected:
+                    if resp.status_code == 401:
+                        self._tokens.invalidate()
                     try:
                         detail = resp.json()
                     except Exception:
@@ -140,8 +556,8 @@ class HTTPClient:
                     if (
                         resp.status_code in self._retry.retry_on_status
                         and attempt < self._retry.attempts
+                        and await self._sleep_backoff(attempt, deadline_at)
                     ):
-                        self._sleep_backoff(attempt)
                         continue
                     raise APIException(
                         f"Unexpected status {resp.status_code}",
@@ -153,9 +569,23 @@ class HTTPClient:
                     )
                 if resp.status_code == 204 or not resp.content:
                     return None
-                payload = resp.json()
+                if raw:
+                    try:
+                        return resp.json()
+                    except ValueError as e:
+                        raise APIException(
+                            "Response is not JSON",
+                            status_code=resp.status_code,
+                            url=str(resp.request.url),
+                            method=method,
+                            detail=resp.text[:200],
+                            headers=resp.headers,
+                        ) from e
+                if model is None:
+                    return None
+                validate_at = time.perf_counter()
                 try:
-                    return model.model_validate(payload)
+                    return model.model_validate(resp.json())
                 except ValidationError as ve:
                     raise APIException(
                         "Response validation failed",
@@ -165,49 +595,118 @@ class HTTPClient:
                         detail=ve.errors(),
                         headers=resp.headers,
                     ) from ve
+                finally:
+                    if sample is not None:
+                        sample.validation += time.perf_counter() - validate_at
             except (httpx.TransportError, httpx.ReadTimeout, httpx.PoolTimeout) as te:
                 last_err = te
-                if attempt < self._retry.attempts:
-                    self._sleep_backoff(attempt)
+                if breaker is not None:
+                    breaker.record_failure()
+                if attempt < self._retry.attempts and await self._sleep_backoff(
+                    attempt, deadline_at
+                ):
                     continue
                 raise APIException(
-                    "Transport error",
+                    "Deadline exceeded" if self._expired(deadline_at) else "Transport error",
                     url=f"{self.base_url}{url}",
                     method=method,
                     detail=str(te),
                 ) from te
         raise APIException(
-            "Request failed after retries",
+            "Deadline exceeded" if self._expired(deadline_at) else "Request failed after retries",
             url=f"{self.base_url}{url}",
             method=method,
             detail=str(last_err),
         )
 
-    def _build_default_headers(self) -> dict[str, str]:
+    @staticmethod
+    async def _hedged(
+        send: t.Callable[[], t.Coroutine[t.Any, t.Any, httpx.Response]],
+        hedger: _Hedger,
+        expected: set[int],
+    ) -> httpx.Response:
+        """
+        Send once and, if no response arrives within the hedge delay, once more.
+
+        The duplicate goes out on another pooled connection while the first is still waiting.
+        The first response with an expected status wins and the other request is cancelled;
+        if neither succeeds, the last response (or error) is what the retry loop sees. The
+        delay tracks a quantile of recent RTTs, and duplicates are limited by a token bucket
+        so that a slow robot does not get twice the load.
+        """
+        loop = asyncio.get_running_loop()
+        hedger.earn()
+        started = {loop.create_task(send()): loop.time()}
+        try:
+            done, _ = await asyncio.wait(started, timeout=hedger.delay)
+            if not done and hedger.spend():
+                started[loop.create_task(send())] = loop.time()
+            primary, *_ = started
+            pending = set(started)
+            last_error: BaseException | None = None
+            last_response: httpx.Response | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    response = task.result()
+                    if response.status_code in expected:
+                        hedger.observe(loop.time() - started[task])
+                        if task is not primary:
+                            hedger.stats.hedge_won += 1
+                        return response
+                    last_response = response
+            if last_response is not None:
+                return last_response
+            assert last_error is not None
+            raise last_error
+        finally:
+            for task in started:
+                if not task.done():
+                    task.cancel()
+
+    def _build_default_headers(self, token: str | None) -> dict[str, str]:
         headers: dict[str, str] = {
             "Accept": "application/json",
             **self._default_headers,
         }
-        token = None
-        try:
-            token = self._get_token()
-        except Exception as e:
-            lg.warning(f"token provider raised: {e}", exc_info=e)
         if token:
             headers["Authorization"] = f"Bearer {token}"
         return headers
 
-    def _merge_headers(self, extra: t.Mapping[str, str] | None) -> dict[str, str]:
-        merged = self._build_default_headers()
-        if extra:
-            merged.update(extra)
-        return merged
-
-    def _sleep_backoff(self, attempt: int) -> None:
-        import time
+    async def _refresh_default_headers(self) -> None:
+        token = await self._tokens.get()
+        if self._tokens.version != self._headers_version:
+            self._client.headers = self._build_default_headers(token)
+            self._headers_version = self._tokens.version
 
-        delay = (2 ** (attempt - 1)) * self._retry.backoff_base_seconds
-        lg.debug(
-            f"retrying in {delay:.3f} (attempt {attempt+1}/{self._retry.attempts})",
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = min(
+            (2 ** (attempt - 1)) * self._retry.backoff_base_seconds,
+            self._retry.backoff_max_seconds,
         )
-        time.sleep(delay)
+        jitter = min(max(self._retry.backoff_jitter, 0.0), 1.0)
+        return delay * (1.0 - jitter * random.random())
+
+    @staticmethod
+    def _expired(deadline_at: float | None) -> bool:
+        return deadline_at is not None and asyncio.get_running_loop().time() >= deadline_at
+
+    async def _sleep_backoff(self, attempt: int, deadline_at: float | None = None) -> bool:
+        """
+        Sleep before the next attempt without blocking the event loop.
+
+        Returns False, without sleeping, if the next attempt could not start before
+        `deadline_at`; the caller should give up instead of retrying.
+        """
+        delay = self._backoff_delay(attempt)
+        if deadline_at is not None:
+            remaining = deadline_at - asyncio.get_running_loop().time()
+            if delay >= remaining:
+                lg.debug("not retrying, delay=%.3f exceeds remaining budget %.3f", delay, remaining)
+                return False
+        lg.debug("retrying in %.3f (attempt %d/%d)", delay, attempt + 1, self._retry.attempts)
+        await asyncio.sleep(delay)
+        return True
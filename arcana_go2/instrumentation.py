@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+import math
+import typing as t
+
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+PHASES = ("queue_wait", "encode", "network", "validation", "total")
+
+
+class CommandSample:
+    """
+    Timings, in seconds, for one command as it moves through the stack.
+
+    `ArcanaGO2Base.send_command` creates one per command and publishes it through
+    `CURRENT_SAMPLE`, so lower layers (the transport, `HTTPClient`) can add to it without it
+    being threaded through every signature.
+    """
+
+    __slots__ = (
+        "topic",
+        "api_id",
+        "queue_wait",
+        "encode",
+        "network",
+        "validation",
+        "total",
+        "retries",
+        "error",
+    )
+
+    def __init__(self, topic: str, api_id: int, queue_wait: float = 0.0) -> None:
+        self.topic = topic
+        self.api_id = api_id
+        self.queue_wait = queue_wait
+        self.encode = 0.0
+        self.network = 0.0  # summed over every attempt
+        self.validation = 0.0
+        self.total = 0.0
+        self.retries = 0
+        self.error: str | None = None  # exception type name when the command failed
+
+
+CURRENT_SAMPLE: ContextVar[CommandSample | None] = ContextVar("CURRENT_SAMPLE", default=None)
+
+StatsHook = t.Callable[[CommandSample], None]
+
+
+class LatencyHistogram:
+    """
+    Fixed log-spaced buckets from 10 us up to about a minute, about 19% wide each.
+
+    Recording is a log and an increment. Percentiles come back as the upper edge of the
+    bucket they fall in, so they overestimate by at most one bucket width.
+    """
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    MIN_SECONDS = 1e-5
+    GROWTH = 2**0.25
+    BUCKETS = 92
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds <= self.MIN_SECONDS:
+            index = 0
+        else:
+            index = min(
+                int(math.log(seconds / self.MIN_SECONDS, self.GROWTH)) + 1, self.BUCKETS - 1
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank and bucket:
+                if index == self.BUCKETS - 1:
+                    return self.max  # the last bucket has no upper edge
+                return min(self.MIN_SECONDS * self.GROWTH**index, self.max)
+        return self.max
+
+
+@dataclass
+class PhaseStats:
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+@dataclass
+class CommandStats:
+    topic: str
+    api_id: int
+    count: int
+    errors: int
+    retries: int
+    phases: dict[str, PhaseStats]
+
+
+class _CommandRecord:
+    __slots__ = ("count", "errors", "retries", "histograms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.histograms = {phase: LatencyHistogram() for phase in PHASES}
+
+
+class Instrumentation:
+    """Aggregates `CommandSample`s per (topic, api_id) and forwards each one to hooks."""
+
+    def __init__(self) -> None:
+        self._records: dict[tuple[str, int], _CommandRecord] = {}
+        self._hooks: list[StatsHook] = []
+
+    def add_hook(self, hook: StatsHook) -> None:
+        """Call `hook` with every finished sample, e.g. to feed a Prometheus histogram."""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: StatsHook) -> None:
+        self._hooks.remove(hook)
+
+    def record(self, sample: CommandSample) -> None:
+        key = (sample.topic, sample.api_id)
+        record = self._records.get(key)
+        if record is None:
+            record = self._records[key] = _CommandRecord()
+        record.count += 1
+        record.retries += sample.retries
+        if sample.error is not None:
+            record.errors += 1
+        histograms = record.histograms
+        histograms["queue_wait"].record(sample.queue_wait)
+        histograms["encode"].record(sample.encode)
+        histograms["network"].record(sample.network)
+        histograms["validation"].record(sample.validation)
+        histograms["total"].record(sample.total)
+        for hook in self._hooks:
+            try:
+                hook(sample)
+            except Exception as e:
+                lg.warning("stats hook %r raised: %s", hook, e, exc_info=e)
+
+    def snapshot(self) -> dict[tuple[str, int], CommandStats]:
+        return {
+            (topic, api_id): CommandStats(
+                topic=topic,
+                api_id=api_id,
+                count=record.count,
+                errors=record.errors,
+                retries=record.retries,
+                phases={
+                    phase: PhaseStats(
+                        count=histogram.count,
+                        mean=histogram.sum / histogram.count if histogram.count else 0.0,
+                        p50=histogram.percentile(0.5),
+                        p90=histogram.percentile(0.9),
+                        p99=histogram.percentile(0.99),
+                        max=histogram.max,
+                    )
+                    for phase, histogram in record.histograms.items()
+                },
+            )
+            for (topic, api_id), record in self._records.items()
+        }
+
+    def reset(self) -> None:
+        self._records.clear()
@@ -0,0 +1,485 @@
+"""
+An append-only binary journal of every command sent to the robot.
+
+A journal file is a 64 byte header followed by fixed-size 56 byte little-endian records:
+
+    offset  type      field
+    0       float64   t             `time.monotonic()` when the command was sent
+    8       float64   rtt           seconds until it completed or failed
+    16      float64   args[3]       x, y, z, or the single arg in args[0]; NaN when unused
+    40      int32     requester_id
+    44      uint16    api_id
+    46      int16     status        STATUS_OK, an HTTP status code, or STATUS_FAILED / _CANCELLED
+    48      uint8     topic         index into TOPICS
+    49      uint8     priority
+    50      uint8     layout        index into ARG_LAYOUTS, how `args` maps back to names
+    51      5 bytes   reserved
+
+The header holds `time.time()` and `time.monotonic()` taken together when the journal was
+opened, so `t` converts to wall-clock time. `JournalReader` memory-maps a journal as NumPy
+arrays (install `arcana-go2[numpy]`); `iter_records` and `replay_journal` need only the
+standard library. `python -m arcana_go2.journal summary|replay ...` does either from a shell.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import functools
+import math
+import os
+import struct
+import threading
+import time
+import types
+import typing as t
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.json_utils import JSONKey, JSONObject
+from arcana_go2.logger import make_logger
+
+if t.TYPE_CHECKING:
+    import numpy as np
+
+    from arcana_go2.arcana_go2_base import ArcanaGO2Base
+
+lg = make_logger(__name__)
+
+MAGIC = b"GO2JRNL\x00"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIdd32x")
+_RECORD = struct.Struct("<5diHh3B5x")
+HEADER_SIZE = _HEADER.size
+RECORD_SIZE = _RECORD.size
+
+TOPICS = ("", "rt/api/sport/request", "rt/api/obstacles_avoid/request")
+ARG_LAYOUTS: tuple[tuple[str, ...], ...] = ((), ("x", "y", "z"), ("data",), ("flag",), ("enable",))
+LAYOUT_UNKNOWN = 255  # args of some other shape; recorded as NaN and not replayable
+
+STATUS_OK = 0
+STATUS_FAILED = -1  # raised without an HTTP status, e.g. a timeout or a dropped connection
+STATUS_CANCELLED = -2
+
+_TOPIC_IDS = {topic: index for index, topic in enumerate(TOPICS)}
+_LAYOUT_IDS: dict[tuple[JSONKey, ...], int] = {
+    keys: index for index, keys in enumerate(ARG_LAYOUTS)
+}
+_NAN = math.nan
+
+
+@functools.cache
+def _numpy() -> tuple[types.ModuleType, np.dtype[np.void]]:
+    """NumPy and the record dtype; numpy is optional and slow to import, so readers import it."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("numpy is not installed, install arcana-go2[numpy]") from e
+    dtype = numpy.dtype(
+        {
+            "names": [
+                "t",
+                "rtt",
+                "args",
+                "requester_id",
+                "api_id",
+                "status",
+                "topic",
+                "priority",
+                "layout",
+            ],
+            "formats": ["<f8", "<f8", ("<f8", (3,)), "<i4", "<u2", "<i2", "u1", "u1", "u1"],
+            "offsets": [0, 8, 16, 40, 44, 46, 48, 49, 50],
+            "itemsize": RECORD_SIZE,
+        }
+    )
+    return numpy, dtype
+
+
+def status_for(error: BaseException | None) -> int:
+    """The journal status for a command that raised `error`, or succeeded if it is None."""
+    if error is None:
+        return STATUS_OK
+    if isinstance(error, asyncio.CancelledError):
+        return STATUS_CANCELLED
+    if isinstance(error, APIException) and error.status_code:
+        return error.status_code
+    return STATUS_FAILED
+
+
+class CommandJournal:
+    """
+    Records commands into a journal file without doing file I/O on the event loop.
+
+    `record` packs one record and appends it to an in-memory deque; a writer thread drains the
+    deque to the file in batches every `flush_interval` seconds, or sooner once `batch` records
+    are waiting. If the writer falls more than `max_pending` records behind, new records are
+    dropped and counted in `dropped` rather than letting memory grow; so are records that do
+    not fit the format and records that arrive after `close`. `record` never raises. The file
+    must not already exist: monotonic timestamps are only comparable within the session that
+    wrote them.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        flush_interval: float = 0.5,
+        batch: int = 1024,
+        max_pending: int = 1 << 20,
+    ) -> None:
+        self.path = os.fspath(path)
+        self._file = open(self.path, "xb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, RECORD_SIZE, time.time(), time.monotonic()))
+        self._pending: deque[bytes] = deque()
+        self._flush_interval = flush_interval
+        self._batch = batch
+        self._max_pending = max_pending
+        self._wake = threading.Event()
+        self._lock = threading.Lock()  # no record is appended once closing is set
+        self._closing = False
+        self.written = 0
+        self.dropped = 0
+        self._writer = threading.Thread(
+            target=self._write_loop, name=f"journal-{os.path.basename(self.path)}", daemon=True
+        )
+        self._writer.start()
+
+    def record(
+        self,
+        *,
+        sent_at: float,
+        requester_id: int,
+        topic: str,
+        api_id: int,
+        priority: int,
+        command_args: JSONObject | None,
+        status: int,
+        rtt: float,
+    ) -> None:
+        try:
+            layout = _LAYOUT_IDS.get(tuple(command_args) if command_args else (), LAYOUT_UNKNOWN)
+            a0 = a1 = a2 = _NAN
+            if command_args and layout != LAYOUT_UNKNOWN:
+                values = list(command_args.values())
+                a0 = float(values[0])  # type: ignore[arg-type]
+                if layout == 1:
+                    a1 = float(values[1])  # type: ignore[arg-type]
+                    a2 = float(values[2])  # type: ignore[arg-type]
+            raw = _RECORD.pack(
+                sent_at,
+                rtt,
+                a0,
+                a1,
+                a2,
+                requester_id,
+                api_id,
+                status,
+                _TOPIC_IDS.get(topic, 0),
+                priority,
+                layout,
+            )
+        except (struct.error, ValueError, TypeError) as e:
+            # called from the `finally` of a send: a record that does not fit must never fail
+            # the command it describes, e.g. `speedlevel(data="fast")` or a 64-bit requester id
+            self.dropped += 1
+            lg.debug("journal record of %s/%s dropped: %s", topic, api_id, e)
+            return
+        pending = self._pending
+        with self._lock:
+            if len(pending) >= self._max_pending or self._closing:
+                self.dropped += 1
+                return
+            pending.append(raw)
+        if len(pending) >= self._batch:
+            self._wake.set()
+
+    async def close(self) -> None:
+        """Write out everything recorded so far and close the file."""
+        await asyncio.to_thread(self._close)
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+        self._wake.set()
+        self._writer.join()
+        self._file.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            closing = self._closing
+            chunk = []
+            pending = self._pending
+            while pending:
+                chunk.append(pending.popleft())
+            if chunk:
+                try:
+                    self._file.write(b"".join(chunk))
+                    self._file.flush()
+                    self.written += len(chunk)
+                except OSError as e:
+                    self.dropped += len(chunk)
+                    lg.warning("journal write to %s failed: %s", self.path, e)
+            if closing:
+                return
+
+
+@dataclass(frozen=True)
+class JournalHeader:
+    version: int
+    record_size: int
+    wall_time: float  # time.time() when the journal was opened
+    monotonic: float  # time.monotonic() at the same instant
+
+
+@dataclass(frozen=True)
+class JournalRecord:
+    t: float
+    rtt: float
+    requester_id: int
+    topic: str
+    api_id: int
+    priority: int
+    status: int
+    command_args: JSONObject | None  # None for commands without args, or of unknown layout
+    replayable: bool
+
+
+def read_header(f: t.BinaryIO) -> JournalHeader:
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError("not a command journal: file is shorter than the header")
+    magic, version, record_size, wall_time, monotonic = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("not a command journal: bad magic")
+    if version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f"unsupported journal {version=} {record_size=}")
+    return JournalHeader(version, record_size, wall_time, monotonic)
+
+
+def _command_args(layout: int, args: t.Sequence[float]) -> JSONObject | None:
+    if layout == 0 or layout >= len(ARG_LAYOUTS):
+        return None
+    keys = ARG_LAYOUTS[layout]
+    if layout == 1:
+        return dict(zip(keys, args))
+    value = args[0]
+    return {keys[0]: int(value) if layout == 2 else bool(value)}
+
+
+def iter_records(path: str | os.PathLike[str]) -> t.Iterator[JournalRecord]:
+    """Stream a journal's records in order; a trailing partial record is ignored."""
+    with open(path, "rb") as f:
+        read_header(f)
+        while len(raw := f.read(RECORD_SIZE)) == RECORD_SIZE:
+            sent_at, rtt, a0, a1, a2, requester_id, api_id, status, topic, priority, layout = (
+                _RECORD.unpack(raw)
+            )
+            known_topic = 0 < topic < len(TOPICS)
+            yield JournalRecord(
+                t=sent_at,
+                rtt=rtt,
+                requester_id=requester_id,
+                topic=TOPICS[topic] if known_topic else "",
+                api_id=api_id,
+                priority=priority,
+                status=status,
+                command_args=_command_args(layout, (a0, a1, a2)),
+                replayable=known_topic and layout != LAYOUT_UNKNOWN,
+            )
+
+
+class JournalReader:
+    """
+    A read-only, memory-mapped view of a journal as a NumPy structured array.
+
+    Nothing is loaded up front; filtering and percentiles touch only the columns they use, so
+    journals of millions of commands can be analysed without reading them into memory.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        np, dtype = _numpy()
+        with open(path, "rb") as f:
+            self.header = read_header(f)
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_SIZE
+        if count:
+            self.records = np.memmap(
+                path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(count,)
+            )
+        else:
+            self.records = np.empty(0, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def wall_time(self, records: t.Any = None) -> t.Any:
+        """`time.time()`-based send times of `records` (default: all of them)."""
+        records = self.records if records is None else records
+        return records["t"] - self.header.monotonic + self.header.wall_time
+
+    def select(
+        self,
+        *,
+        api_id: int | None = None,
+        requester_id: int | None = None,
+        topic: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        errors_only: bool = False,
+    ) -> t.Any:
+        """Records matching every given filter; `since` / `until` are wall-clock times."""
+        np, _ = _numpy()
+        records = self.records
+        mask = np.ones(len(records), dtype=bool)
+        if api_id is not None:
+            mask &= records["api_id"] == api_id
+        if requester_id is not None:
+            mask &= records["requester_id"] == requester_id
+        if topic is not None:
+            mask &= records["topic"] == _TOPIC_IDS.get(topic, 0)
+        if since is not None or until is not None:
+            wall = self.wall_time()
+            if since is not None:
+                mask &= wall >= since
+            if until is not None:
+                mask &= wall < until
+        if errors_only:
+            mask &= records["status"] != STATUS_OK
+        return records[mask]
+
+    def summary(self) -> dict[tuple[str, int], dict[str, float]]:
+        """Per (topic, api_id): count, errors and RTT p50 / p95 / p99 / max in seconds."""
+        np, _ = _numpy()
+        records = self.records
+        result: dict[tuple[str, int], dict[str, float]] = {}
+        keys = records["topic"].astype(np.uint32) << 16 | records["api_id"]
+        for key in np.unique(keys):
+            group = records[keys == key]
+            rtt = group["rtt"]
+            p50, p95, p99 = np.percentile(rtt, (50, 95, 99)) if len(rtt) else (0.0, 0.0, 0.0)
+            topic = int(key >> 16)
+            result[(TOPICS[topic] if topic < len(TOPICS) else "", int(key & 0xFFFF))] = {
+                "count": float(len(group)),
+                "errors": float(np.count_nonzero(group["status"] != STATUS_OK)),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(rtt.max()) if len(rtt) else 0.0,
+            }
+        return result
+
+
+@dataclass
+class ReplayStats:
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0  # records of unknown topic or arg layout
+
+
+async def replay_journal(
+    path: str | os.PathLike[str],
+    base: ArcanaGO2Base,
+    *,
+    speed: float = 1.0,
+    timed: bool = True,
+    requester_id: int | None = None,
+    max_in_flight: int = 16,
+) -> ReplayStats:
+    """
+    Re-send a journal's commands through `base`, in order.
+
+    With `timed`, commands keep their original spacing (divided by `speed`), scheduled from
+    one start instant so round trips do not add up; otherwise they go out back to back.
+    `requester_id` overrides the recorded one. Failures are counted, not raised.
+    """
+    if speed <= 0:
+        raise ValueError(f"speed must be positive, got {speed=}")
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_in_flight)
+    stats = ReplayStats()
+    in_flight: set[asyncio.Task[None]] = set()
+
+    async def send(record: JournalRecord) -> None:
+        try:
+            await base.send_command(
+                requester_id=record.requester_id if requester_id is None else requester_id,
+                topic=record.topic,
+                api_id=record.api_id,
+                command_args=record.command_args,
+                priority=1 if record.priority else 0,
+                response_policy="light",
+            )
+            stats.sent += 1
+        except Exception as e:
+            stats.failed += 1
+            lg.warning("replay of %s/%s failed: %s", record.topic, record.api_id, e)
+        finally:
+            slots.release()
+
+    start = loop.time()
+    first: float | None = None
+    try:
+        for record in iter_records(path):
+            if not record.replayable:
+                stats.skipped += 1
+                continue
+            first = record.t if first is None else first
+            await slots.acquire()
+            if timed:
+                delay = start + (record.t - first) / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            task = loop.create_task(send(record))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        await asyncio.gather(*in_flight)
+    finally:
+        for task in in_flight:
+            task.cancel()
+    return stats
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or replay a command journal.")
+    sub = parser.add_subparsers(dest="action", required=True)
+    summary = sub.add_parser("summary", help="per command counts and RTT percentiles")
+    summary.add_argument("journal")
+    replay = sub.add_parser("replay", help="re-send a journal against a robot")
+    replay.add_argument("journal")
+    replay.add_argument("--url", required=True)
+    replay.add_argument("--speed", type=float, default=1.0)
+    replay.add_argument("--untimed", action="store_true", help="send back to back")
+    replay.add_argument("--id", type=int, default=None, help="override the requester id")
+    args = parser.parse_args(argv)
+
+    if args.action == "summary":
+        reader = JournalReader(args.journal)
+        print(f"{len(reader)} records")
+        for (topic, api_id), row in sorted(reader.summary().items()):
+            print(
+                f"{topic or '?':<32}{api_id:>6}{row['count']:>10.0f}{row['errors']:>8.0f}"
+                f"  p50 {row['p50'] * 1e3:.2f} ms  p99 {row['p99'] * 1e3:.2f} ms"
+            )
+        return 0
+
+    from arcana_go2.arcana_go2_base import ArcanaGO2Base
+
+    async def run() -> ReplayStats:
+        async with ArcanaGO2Base(base_url=args.url) as base:
+            return await replay_journal(
+                args.journal, base, speed=args.speed, timed=not args.untimed, requester_id=args.id
+            )
+
+    stats = asyncio.run(run())
+    print(f"sent {stats.sent}, failed {stats.failed}, skipped {stats.skipped}")
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,13 +16,59 @@ class LogLevel(enum.Enum):
 DEFAULT_LOG_LEVEL = LogLevel.INFO
 
 
+class _Event:
+    """A structured log message that is only rendered if a handler actually emits it."""
+
+    __slots__ = ("name", "fields")
+
+    def __init__(self, name: str, fields: dict[str, t.Any]):
+        self.name = name
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return " ".join([self.name, *(f"{key}={value!r}" for key, value in self.fields.items())])
+
+
 class Logger:
+    """
+    Thin wrapper around a stdlib logger.
+
+    Messages take %-style `args` so formatting is deferred until a record is emitted. On hot
+    paths, check `debug_enabled` before calling `debug` at all; that avoids even building the
+    argument tuple when DEBUG is off.
+    """
+
     def __init__(self, module_name: str, log_level: LogLevel):
         self._logger = logging.getLogger(module_name)
         self._logger.setLevel(log_level.value)
+        self._sample_counts: dict[str, int] = {}
+
+    @property
+    def debug_enabled(self) -> bool:
+        return self._logger.isEnabledFor(logging.DEBUG)
 
     def debug(self, message, *args, **kwargs):
-        self._logger.debug(message)
+        self._logger.debug(message, *args, **kwargs)
+
+    def debug_event(self, event: str, **fields: t.Any) -> None:
+        """Log `event` with key=value fields, also attached to the record as `record.fields`."""
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(_Event(event, fields), extra={"fields": fields})
+
+    def debug_sampled(self, key: str, every: int, event: str, **fields: t.Any) -> None:
+        """
+        Like `debug_event`, but only logs the first of every `every` calls sharing `key`.
+
+        Meant for per-command logging at control-loop rates, where logging every call would
+        swamp both the handler and the reader. The emitted record carries `sampled=every`.
+        """
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        count = self._sample_counts.get(key, 0)
+        self._sample_counts[key] = count + 1
+        if count % every == 0:
+            fields["sampled"] = every
+            self._logger.debug(_Event(event, fields), extra={"fields": fields})
 
 
     def info(self, message, *args, **kwargs):
@@ -38,17 +84,17 @@ class Logger:
 
 
     def info_raise(self, exception_type: t.Type[T], message, *args, **kwargs):
-        self._logger.info(message, *args, *kwargs)
+        self._logger.info(message, *args, **kwargs)
         raise exception_type(message, args, kwargs)
 
 
     def warn_raise(self, exception_type: t.Type[T], message, *args, **kwargs):
-        self._logger.warning(message, *args, *kwargs)
+        self._logger.warning(message, *args, **kwargs)
         raise exception_type(message, args, kwargs)
 
 
     def error_raise(self, exception_type: t.Type[T], message, *args, **kwargs):
-        self._logger.error(message, *args, *kwargs)
+        self._logger.error(message, *args, **kwargs)
         raise exception_type(message, args, kwargs)
     
 
@@ -62,7 +108,7 @@ def make_logger(module_name: str, log_level: LogLevel | None = None) -> Logger:
             try:
                 log_level = LogLevel(env_value)
             except ValueError:
-                logging.warning(f"got invalid logging level {env_value=} from env var while trying to create logger for {module_name=}. Using default level")
+                logging.warning("got invalid logging level env_value=%r from env var while trying to create logger for module_name=%r. Using default level", env_value, module_name)
     
     return Logger(module_name, log_level=log_level)
 
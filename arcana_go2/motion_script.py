@@ -0,0 +1,462 @@
+"""
+Timed playback of `ArcanaGO2` command scripts.
+
+A script is a timeline of steps, each an offset in seconds from the start of playback, an
+`ArcanaGO2` command name and its keyword args:
+
+    JSON  (.json)   [{"at": 0.0, "command": "standup"}, {"at": 2.5, "command": "move", ...}]
+    JSONL (.jsonl)  one such object per line
+    CSV   (.csv)    header `at,command,args`, `args` being a JSON object (or empty)
+
+JSONL and CSV scripts are read lazily, one step at a time, so their length is not bounded by
+memory; a JSON array is parsed whole. Run one with
+`python -m arcana_go2.motion_script script.jsonl --url http://robot:5656 --id 1`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+from dataclasses import dataclass
+import functools
+import inspect
+import itertools
+import json
+import math
+import os
+import sys
+import types
+import typing as t
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.arcana_go2_base import CommandResult
+from arcana_go2.instrumentation import LatencyHistogram
+from arcana_go2.json_utils import JSONObject
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ScriptStep:
+    at: float  # seconds from the start of playback
+    command: str  # an ArcanaGO2 method name, e.g. "move"
+    args: JSONObject
+    line: int = 0  # where the step came from, for error messages
+
+
+class ScriptError(ValueError):
+    """The script is malformed; `problems` lists every step that failed validation."""
+
+    def __init__(self, problems: list[str]) -> None:
+        shown = problems[:20]
+        more = f"\n... and {len(problems) - len(shown)} more" if len(problems) > len(shown) else ""
+        super().__init__("invalid motion script:\n" + "\n".join(shown) + more)
+        self.problems = problems
+
+
+@dataclass
+class ScriptSummary:
+    steps: int
+    duration: float  # offset of the last step
+
+
+@dataclass
+class StepReport:
+    index: int
+    command: str
+    at: float  # the scripted offset
+    dispatch_lateness: float  # seconds the send started after its (compensated) target time
+    lateness: float  # estimated arrival at the robot (send + half the RTT) minus `at`
+    latency: float  # round trip of the command
+    response: CommandResult = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class PlaybackReport:
+    steps: int
+    errors: int
+    duration: float  # wall time from the scheduled start to the last completion
+    mean_lateness: float
+    p95_lateness: float  # early arrivals count as on time here
+    max_lateness: float
+
+
+def _command_signature(command: str) -> inspect.Signature:
+    method = getattr(ArcanaGO2, command, None)
+    if (
+        command.startswith("_")
+        or command in ("close", "warmup")
+        or not inspect.iscoroutinefunction(method)
+    ):
+        raise ValueError(f"{command=} is not an ArcanaGO2 command")
+    return inspect.signature(method)
+
+
+@functools.cache
+def _command_hints(command: str) -> dict[str, t.Any]:
+    # the parameters only: the return annotation names types ArcanaGO2's module never imports
+    namespace = vars(sys.modules[ArcanaGO2.__module__])
+    hints: dict[str, t.Any] = {}
+    for name, parameter in _command_signature(command).parameters.items():
+        annotation = parameter.annotation
+        if isinstance(annotation, str):
+            annotation = eval(annotation, namespace)  # as typing.get_type_hints would
+        hints[name] = annotation
+    return hints
+
+
+def _matches(hint: t.Any, value: object) -> bool:
+    """Whether a JSON scalar `value` fits the annotation `hint` of a command parameter."""
+    origin = t.get_origin(hint)
+    if origin is t.Literal:
+        return any(value == option and type(value) is type(option) for option in t.get_args(hint))
+    if origin in (t.Union, types.UnionType):
+        return any(_matches(option, value) for option in t.get_args(hint))
+    if hint is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if hint is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    if hint in (bool, str, type(None)):
+        return isinstance(value, hint)
+    return True  # nothing a script could pass is checked beyond being a scalar
+
+
+def _describe(hint: t.Any) -> str:
+    origin = t.get_origin(hint)
+    if origin is t.Literal:
+        return " or ".join(repr(option) for option in t.get_args(hint))
+    if origin in (t.Union, types.UnionType):
+        return " or ".join(_describe(option) for option in t.get_args(hint))
+    return "null" if hint is type(None) else getattr(hint, "__name__", str(hint))
+
+
+class MotionScript:
+    """
+    A re-readable source of `ScriptStep`s: a script file or an in-memory sequence.
+
+    `requester_id` fills in `id` for steps that do not set their own.
+    """
+
+    def __init__(
+        self,
+        source: str | os.PathLike[str] | t.Sequence[ScriptStep],
+        *,
+        requester_id: int | None = None,
+    ) -> None:
+        self._source = source
+        self._requester_id = requester_id
+
+    def __iter__(self) -> t.Iterator[ScriptStep]:
+        steps = self._read() if isinstance(self._source, (str, os.PathLike)) else self._source
+        for step in steps:
+            if "id" not in step.args and self._requester_id is not None:
+                args = {"id": self._requester_id, **step.args}
+                step = ScriptStep(step.at, step.command, args, step.line)
+            yield step
+
+    def validate(self) -> ScriptSummary:
+        """
+        Check every step without sending anything, in one streaming pass.
+
+        Commands must exist, args must bind to the command's signature and be finite JSON
+        scalars of the annotated type (a number for a float, 0 or 1 for a priority), and offsets must be finite, non-negative and non-decreasing. Raises
+        `ScriptError` listing every problem found.
+        """
+        problems: list[str] = []
+        count, last_at = 0, 0.0
+        try:
+            for count, step in enumerate(self, start=1):
+                where = f"step {count}" + (f" (line {step.line})" if step.line else "")
+                if not math.isfinite(step.at) or step.at < 0:
+                    problems.append(f"{where}: offset {step.at!r} must be finite and >= 0")
+                elif step.at < last_at:
+                    problems.append(f"{where}: offset {step.at} is before the previous {last_at}")
+                else:
+                    last_at = step.at
+                try:
+                    _command_signature(step.command).bind(None, **step.args)
+                except (TypeError, ValueError) as e:
+                    problems.append(f"{where}: {step.command}: {e}")
+                    continue
+                hints = _command_hints(step.command)
+                for name, value in step.args.items():
+                    if not isinstance(value, (bool, int, float, str)) or (
+                        isinstance(value, float) and not math.isfinite(value)
+                    ):
+                        problems.append(f"{where}: {name}={value!r} is not a finite scalar")
+                    elif name in hints and not _matches(hints[name], value):
+                        problems.append(
+                            f"{where}: {name}={value!r} must be {_describe(hints[name])}"
+                        )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # an unreadable step ends the pass; `ScriptStep`s built by hand can be of any type
+            problems.append(f"after step {count}: {e}")
+        if problems:
+            raise ScriptError(problems)
+        return ScriptSummary(steps=count, duration=last_at)
+
+    def _read(self) -> t.Iterator[ScriptStep]:
+        path = os.fspath(t.cast("str | os.PathLike[str]", self._source))
+        suffix = os.path.splitext(path)[1].lower()
+        with open(path, newline="" if suffix == ".csv" else None) as f:
+            if suffix == ".json":
+                for entry in json.load(f):
+                    yield _step(entry, line=0)
+            elif suffix == ".jsonl":
+                for line, text in enumerate(f, start=1):
+                    if text.strip():
+                        yield _step(json.loads(text), line=line)
+            elif suffix == ".csv":
+                reader = csv.DictReader(f)
+                for row in reader:
+                    if (row.get("command") or "").strip():
+                        args = (row.get("args") or "").strip()
+                        entry = {
+                            "at": float(row["at"]),
+                            "command": row["command"].strip(),
+                            "args": json.loads(args) if args else {},
+                        }
+                        yield _step(entry, line=reader.line_num)
+            else:
+                raise ValueError(f"unsupported script format {suffix!r}, use .json, .jsonl or .csv")
+
+
+def _step(entry: t.Any, *, line: int) -> ScriptStep:
+    where = f"line {line}: " if line else ""
+    if not isinstance(entry, dict):
+        raise ValueError(f"{where}a step must be an object, got {entry!r}")
+    at, command, args = entry.get("at"), entry.get("command"), entry.get("args") or {}
+    if isinstance(at, bool) or not isinstance(at, (int, float)):
+        raise ValueError(f"{where}at must be a number of seconds, got {at!r}")
+    if not isinstance(command, str):
+        raise ValueError(f"{where}command must be a string, got {command!r}")
+    if not isinstance(args, dict):
+        raise ValueError(f"{where}args must be an object, got {args!r}")
+    return ScriptStep(float(at), command, args, line)
+
+
+_Send = t.Callable[[], t.Awaitable[CommandResult]]
+
+
+class MotionScriptPlayer:
+    """
+    Plays a `MotionScript` on an absolute schedule.
+
+    Step targets are computed from one start instant on the monotonic clock, never from the
+    previous step, and a step is sent without waiting for the one before it to be answered, so
+    round trips do not accumulate into drift. With `compensate`, each send is started early by
+    a running estimate of the one-way latency (half the smoothed RTT), aiming for the command
+    to reach the robot on time. Each step is bound to its `ArcanaGO2` method ahead of its
+    target time, so only the call itself happens on schedule. Steps sharing an offset are the
+    exception: each is sent once the one before it is answered, so they reach the robot in
+    script order. At most `max_in_flight` steps are outstanding; past that, sends wait and the
+    wait shows up as lateness.
+    """
+
+    def __init__(
+        self,
+        go2: ArcanaGO2,
+        *,
+        compensate: bool = True,
+        initial_rtt: float = 0.0,
+        smoothing: float = 0.2,
+        max_in_flight: int = 16,
+        stop_on_error: bool = False,
+    ) -> None:
+        self._go2 = go2
+        self._compensate = compensate
+        self._rtt = initial_rtt
+        self._smoothing = smoothing
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._stop_on_error = stop_on_error
+
+    @property
+    def rtt(self) -> float:
+        """The smoothed round trip used for compensation, in seconds."""
+        return self._rtt
+
+    async def play(
+        self,
+        script: MotionScript,
+        *,
+        start_delay: float = 0.0,
+        on_step: t.Callable[[StepReport], None] | None = None,
+    ) -> PlaybackReport:
+        """Validate and play `script`, returning aggregate lateness; see `play_iter`."""
+        await asyncio.to_thread(script.validate)
+        histogram = LatencyHistogram()
+        count = errors = 0
+        total_lateness = max_lateness = 0.0
+        started = asyncio.get_running_loop().time()
+        async for report in self.play_iter(script, start_delay=start_delay, validate=False):
+            count += 1
+            errors += not report.ok
+            total_lateness += report.lateness
+            max_lateness = max(max_lateness, report.lateness)
+            histogram.record(max(report.lateness, 0.0))
+            if on_step is not None:
+                on_step(report)
+        return PlaybackReport(
+            steps=count,
+            errors=errors,
+            duration=asyncio.get_running_loop().time() - started - start_delay,
+            mean_lateness=total_lateness / count if count else 0.0,
+            p95_lateness=histogram.percentile(0.95),
+            max_lateness=max_lateness,
+        )
+
+    async def play_iter(
+        self, script: MotionScript, *, start_delay: float = 0.0, validate: bool = True
+    ) -> t.AsyncIterator[StepReport]:
+        """
+        Play `script`, yielding a `StepReport` as each step completes.
+
+        The script is validated first (a streaming pass; pass `validate=False` if it already
+        was) and then read again as it plays, so only the steps in flight are held in memory.
+        Playback starts `start_delay` seconds after validation. Failed steps are reported, not
+        raised; with `stop_on_error` the first failure also stops later steps being sent.
+        """
+        if validate:
+            summary = await asyncio.to_thread(script.validate)
+            lg.debug("playing %d steps over %.3fs", summary.steps, summary.duration)
+        reports: asyncio.Queue[StepReport | None] = asyncio.Queue()
+        dispatcher = asyncio.get_running_loop().create_task(
+            self._dispatch_all(script, start_delay, reports)
+        )
+        try:
+            while (report := await reports.get()) is not None:
+                yield report
+                if self._stop_on_error and not report.ok:
+                    break
+            await dispatcher
+        finally:
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+
+    async def _dispatch_all(
+        self, script: MotionScript, start_delay: float, reports: asyncio.Queue[StepReport | None]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time() + start_delay
+        in_flight: set[asyncio.Task[None]] = set()
+        previous: asyncio.Task[None] | None = None
+        previous_at = math.nan
+        steps = iter(script)
+        try:
+            for index in itertools.count():
+                # binding happens here, ahead of the step's target time
+                step = next(steps, None)
+                if step is None:
+                    break
+                send = t.cast(
+                    _Send, functools.partial(getattr(self._go2, step.command), **step.args)
+                )
+                await self._slots.acquire()
+                try:
+                    target = start + step.at - (self._rtt / 2 if self._compensate else 0.0)
+                    delay = target - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    # steps at the same offset go out one after another, in script order
+                    after = previous if step.at == previous_at else None
+                    task = loop.create_task(
+                        self._run_step(index, step, send, start + step.at, target, reports, after)
+                    )
+                except BaseException:
+                    self._slots.release()
+                    raise
+                # released however the task ends, even if it is cancelled before it starts
+                task.add_done_callback(self._release_slot)
+                previous, previous_at = task, step.at
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            await asyncio.gather(*in_flight)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await reports.put(None)
+
+    def _release_slot(self, task: asyncio.Task[None]) -> None:
+        self._slots.release()
+
+    async def _run_step(
+        self,
+        index: int,
+        step: ScriptStep,
+        send: _Send,
+        scheduled_at: float,
+        target: float,
+        reports: asyncio.Queue[StepReport | None],
+        after: asyncio.Task[None] | None = None,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        if after is not None:
+            await asyncio.wait((after,))
+        sent_at = loop.time()
+        response: CommandResult = None
+        error: Exception | None = None
+        try:
+            response = await send()
+        except Exception as e:
+            lg.warning("step %d (%s at %ss) failed: %s", index, step.command, step.at, e)
+            error = e
+        latency = loop.time() - sent_at
+        if error is None:
+            self._rtt += self._smoothing * (latency - self._rtt)
+        await reports.put(
+            StepReport(
+                index=index,
+                command=step.command,
+                at=step.at,
+                dispatch_lateness=sent_at - target,
+                lateness=sent_at + latency / 2 - scheduled_at,
+                latency=latency,
+                response=response,
+                error=error,
+            )
+        )
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate or play an ArcanaGO2 motion script.")
+    parser.add_argument("script", help=".json, .jsonl or .csv timeline")
+    parser.add_argument("--url", help="robot base URL; without it the script is only validated")
+    parser.add_argument("--id", type=int, default=None, help="requester id for steps without one")
+    parser.add_argument("--start-delay", type=float, default=0.5)
+    parser.add_argument("--no-compensate", action="store_true")
+    args = parser.parse_args(argv)
+
+    script = MotionScript(args.script, requester_id=args.id)
+    try:
+        summary = script.validate()
+    except ScriptError as e:
+        print(e)
+        return 1
+    print(f"{summary.steps} steps over {summary.duration:.3f}s")
+    if args.url is None:
+        return 0
+
+    async def run() -> PlaybackReport:
+        async with ArcanaGO2(base_url=args.url) as go2:
+            await go2.warmup()
+            player = MotionScriptPlayer(go2, compensate=not args.no_compensate)
+            return await player.play(script, start_delay=args.start_delay)
+
+    report = asyncio.run(run())
+    print(
+        f"{report.steps} steps, {report.errors} errors in {report.duration:.3f}s; lateness "
+        f"mean {report.mean_lateness * 1e3:.2f} ms, p95 {report.p95_lateness * 1e3:.2f} ms, "
+        f"max {report.max_lateness * 1e3:.2f} ms"
+    )
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import json
+import os
+import typing as t
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2_base import ArcanaGO2Base, CommandResponse, CommandResult
+from arcana_go2.framed_server import FramedCommandServer
+from arcana_go2.json_utils import JSONObject, JSONValue
+from arcana_go2.logger import make_logger
+from arcana_go2.scheduler import CommandScheduler, SchedulerConfig
+
+lg = make_logger(__name__)
+
+_SPORT_TOPIC = "rt/api/sport/request"
+_MOTION = {(_SPORT_TOPIC, 1007), (_SPORT_TOPIC, 1008)}  # euler, move
+_STOPS = {(_SPORT_TOPIC, 1001), (_SPORT_TOPIC, 1003)}  # damp, stopmove
+
+DEFAULT_SOCKET = "/tmp/arcana-go2.sock"
+DEFAULT_SOCKET_MODE = 0o600  # only the daemon's own user may command the robot through it
+
+
+@dataclass
+class ProxyConfig:
+    lease: float = 0.5  # seconds a requester keeps motion control after its last setpoint
+    socket_mode: int = DEFAULT_SOCKET_MODE  # permissions of the socket file
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+
+
+@dataclass
+class ProxyStats:
+    forwarded: int = 0  # commands sent upstream
+    coalesced: int = 0  # motion setpoints answered by a newer or identical one instead
+    rejected: int = 0  # motion setpoints refused because another requester held motion
+    overtaken: int = 0  # pending motion setpoints replaced by another requester's, answered 409
+    failed: int = 0  # commands the robot (or the upstream connection) failed
+
+
+@dataclass
+class _MotionLease:
+    requester_id: int
+    priority: int
+    expires_at: float
+
+
+class _MotionSlot:
+    """The one pending and the one in-flight setpoint of a motion kind."""
+
+    __slots__ = ("pending", "pending_waiters", "in_flight", "in_flight_waiters", "sender")
+
+    def __init__(self) -> None:
+        self.pending: tuple[int, JSONObject | None, int] | None = None
+        self.pending_waiters: list[asyncio.Future[JSONValue]] = []
+        self.in_flight: tuple[int, JSONObject | None, int] | None = None
+        self.in_flight_waiters: list[asyncio.Future[JSONValue]] = []
+        self.sender: asyncio.Task[None] | None = None
+
+
+class ProxyDaemon:
+    """
+    Shares one upstream robot connection between every local process.
+
+    Clients connect over a Unix domain socket and speak the framed protocol in
+    `arcana_go2.framing`, which is what `ArcanaGO2(base_url="unix:///path/to.sock")` does.
+    Every command goes out through the one `ArcanaGO2Base` (and its connection pool), so the
+    Pi sees a single client no matter how many processes drive the robot.
+
+    Commands are arbitrated before they are sent:
+
+    - Stops (damp, stopmove) from anyone go straight upstream, skip the queue and release
+      motion control. They first withdraw every motion setpoint not yet answered, pending,
+      queued in the scheduler or in flight, so none of them (or a retry of one) can reach
+      the robot after the stop; their callers are answered 409.
+    - Motion setpoints (move, euler) are accepted from one requester at a time. Sending one
+      takes motion control for `lease` seconds; another requester gets it only once the lease
+      runs out or by sending at a higher priority, and is answered 409 until then.
+    - Motion setpoints are coalesced latest-wins: at most one per kind is in flight and one
+      pending, and a setpoint identical to the one in flight simply waits for its answer.
+      Callers whose setpoint was overtaken by their own newer one get the answer of the one
+      that replaced it; those overtaken by another requester's are answered 409, since
+      theirs never reaches the robot.
+    - Everything else goes through a `CommandScheduler`, priority 1 first.
+
+    Callers are answered with the robot's own response. The socket file is created with
+    `config.socket_mode` (owner only by default), since anyone who can connect to it can
+    command the robot.
+    """
+
+    def __init__(
+        self,
+        base: ArcanaGO2Base,
+        *,
+        path: str = DEFAULT_SOCKET,
+        config: ProxyConfig | None = None,
+    ) -> None:
+        self._base = base
+        self.config = config or ProxyConfig()
+        self._scheduler = CommandScheduler(base, self.config.scheduler)
+        self._server = FramedCommandServer(
+            handler=self._handle, path=path, mode=self.config.socket_mode
+        )
+        self._slots: dict[tuple[str, int], _MotionSlot] = {}
+        self._lease: _MotionLease | None = None
+        self.stats = ProxyStats()
+
+    async def __aenter__(self) -> ProxyDaemon:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        return self._server.url
+
+    @property
+    def motion_holder(self) -> int | None:
+        """The requester currently holding motion control, None if nobody does."""
+        lease = self._lease
+        if lease is None or lease.expires_at <= asyncio.get_running_loop().time():
+            return None
+        return lease.requester_id
+
+    async def start(self) -> None:
+        await self._server.start()
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        await self._server.close()
+        senders = self._withdraw_motion(APIException("Proxy closed", status_code=503))
+        await asyncio.gather(*senders, return_exceptions=True)
+        await self._scheduler.close()
+        lg.info("proxy closed with stats=%r", self.stats)
+
+    async def _handle(self, body: JSONObject) -> tuple[int, JSONValue]:
+        try:
+            requester_id = int(body["id"])  # type: ignore[arg-type]
+            topic = str(body["topic"])
+            api_id = int(body["api_id"])  # type: ignore[arg-type]
+            priority = 1 if body.get("priority") else 0
+            parameter = body.get("parameter") or ""
+            command_args = (
+                json.loads(parameter) if isinstance(parameter, str) and parameter else None
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, {"detail": f"malformed command: {e}"}
+
+        key = (topic, api_id)
+        try:
+            if key in _STOPS:
+                response = await self._stop(requester_id, topic, api_id, command_args)
+            elif key in _MOTION:
+                response = await self._motion(key, requester_id, command_args, priority)
+            else:
+                self.stats.forwarded += 1
+                response = _forwarded(
+                    await self._scheduler.submit(
+                        requester_id=requester_id,
+                        topic=topic,
+                        api_id=api_id,
+                        command_args=command_args,
+                        priority=priority,
+                    )
+                )
+        except APIException as e:
+            if e.status_code != 409:
+                self.stats.failed += 1
+            return e.status_code or 502, {"detail": str(e.detail or e)}
+        return 200, response
+
+    async def _stop(
+        self, requester_id: int, topic: str, api_id: int, command_args: JSONObject | None
+    ) -> JSONValue:
+        self._lease = None
+        self._withdraw_motion(APIException("Superseded by a stop", status_code=409))
+        self.stats.forwarded += 1
+        return _forwarded(
+            await self._base.send_command(
+                requester_id=requester_id,
+                topic=topic,
+                api_id=api_id,
+                command_args=command_args,
+                priority=1,
+            )
+        )
+
+    async def _motion(
+        self,
+        key: tuple[str, int],
+        requester_id: int,
+        command_args: JSONObject | None,
+        priority: int,
+    ) -> JSONValue:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        lease = self._lease
+        if (
+            lease is not None
+            and lease.requester_id != requester_id
+            and lease.expires_at > now
+            and priority <= lease.priority
+        ):
+            self.stats.rejected += 1
+            raise APIException(
+                "Motion held by another requester",
+                status_code=409,
+                detail=f"motion held by requester {lease.requester_id}",
+            )
+        self._lease = _MotionLease(requester_id, priority, now + self.config.lease)
+
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _MotionSlot()
+        setpoint = (requester_id, command_args, priority)
+        waiter: asyncio.Future[JSONValue] = loop.create_future()
+        if slot.pending is None and slot.in_flight == setpoint:
+            self.stats.coalesced += 1
+            slot.in_flight_waiters.append(waiter)
+        else:
+            if slot.pending is not None and slot.pending[0] != requester_id:
+                # the replaced setpoint is never sent, so its requester must not read this
+                # one's answer as its own
+                self.stats.overtaken += len(slot.pending_waiters)
+                overtaken = APIException(
+                    "Superseded by another requester",
+                    status_code=409,
+                    detail=f"motion taken over by requester {requester_id}",
+                )
+                for pending in slot.pending_waiters:
+                    if not pending.done():
+                        pending.set_exception(overtaken)
+                slot.pending_waiters = []
+            elif slot.pending is not None:
+                self.stats.coalesced += 1
+            slot.pending = setpoint
+            slot.pending_waiters.append(waiter)
+            if slot.sender is None or slot.sender.done():
+                slot.sender = loop.create_task(self._drain(key, slot))
+        # a client that hangs up must not cancel a send other callers are waiting on
+        return await asyncio.shield(waiter)
+
+    async def _drain(self, key: tuple[str, int], slot: _MotionSlot) -> None:
+        topic, api_id = key
+        while slot.pending is not None:
+            slot.in_flight, slot.pending = slot.pending, None
+            slot.in_flight_waiters, slot.pending_waiters = slot.pending_waiters, []
+            requester_id, command_args, priority = slot.in_flight
+            self.stats.forwarded += 1
+            response: JSONValue = None
+            error: Exception | None = None
+            try:
+                response = _forwarded(
+                    await self._scheduler.submit(
+                        requester_id=requester_id,
+                        topic=topic,
+                        api_id=api_id,
+                        command_args=command_args,
+                        priority=t.cast(t.Literal[0, 1], priority),
+                        idempotent=True,
+                    )
+                )
+            except Exception as e:
+                error = e
+            waiters, slot.in_flight, slot.in_flight_waiters = slot.in_flight_waiters, None, []
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if error is None:
+                    waiter.set_result(response)
+                else:
+                    waiter.set_exception(error)
+
+    def _withdraw_motion(self, error: APIException) -> list[asyncio.Task[None]]:
+        """
+        Fail every unanswered motion setpoint with `error` and cancel its sender.
+
+        Cancelling a sender cancels its `submit`, which the scheduler answers by never sending
+        a queued setpoint and aborting one in flight. Later setpoints start from fresh slots.
+        Returns the cancelled senders.
+        """
+        senders: list[asyncio.Task[None]] = []
+        for slot in self._slots.values():
+            if slot.sender is not None and not slot.sender.done():
+                slot.sender.cancel()
+                senders.append(slot.sender)
+            for waiter in (*slot.pending_waiters, *slot.in_flight_waiters):
+                if not waiter.done():
+                    waiter.set_exception(error)
+        self._slots.clear()
+        return senders
+
+
+def _forwarded(result: CommandResult) -> JSONValue:
+    """The robot's response to a command, as the body of the reply frame."""
+    if isinstance(result, CommandResponse):
+        return t.cast(JSONObject, result.model_dump())
+    return None  # the robot answered without a body
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    token = os.environ.get(args.token_env) if args.token_env else None
+    get_token = (lambda: token) if token else None
+    async with ArcanaGO2Base(base_url=args.url, get_token=get_token) as base:
+        async with ProxyDaemon(
+            base,
+            path=args.socket,
+            config=ProxyConfig(lease=args.lease, socket_mode=args.socket_mode),
+        ) as daemon:
+            await daemon.serve_forever()
+
+
+def main(argv: t.Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Share one robot connection between local processes over a Unix socket."
+    )
+    parser.add_argument("--url", required=True, help="the robot, e.g. http://192.168.12.1:5656")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--lease", type=float, default=0.5, help="motion lease in seconds")
+    parser.add_argument(
+        "--socket-mode",
+        type=lambda mode: int(mode, 8),
+        default=DEFAULT_SOCKET_MODE,
+        help="octal permissions of the socket, e.g. 660 to let the group in (default: 600)",
+    )
+    parser.add_argument("--token-env", default=None, help="environment variable with the token")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import time
+import typing as t
+
+from arcana_go2.http_utils import QueryParams
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+V = t.TypeVar("V")
+CacheKey = tuple[str, tuple[t.Any, ...], t.Any]
+
+
+@dataclass
+class CachePolicy:
+    ttl: float = 0.0  # seconds a response is served from the cache; 0 only shares in-flight GETs
+    # path prefixes of writes (POST, PUT, PATCH, DELETE) that drop it; None means any write
+    invalidated_by: tuple[str, ...] | None = None
+
+
+@dataclass
+class ResponseCacheConfig:
+    max_entries: int = 256  # least recently used responses are evicted beyond this
+    default: CachePolicy = field(default_factory=CachePolicy)  # for paths without a policy
+    policies: dict[str, CachePolicy] = field(default_factory=dict)  # by path prefix, longest wins
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0  # answered from the cache
+    misses: int = 0  # requests actually sent
+    coalesced: int = 0  # joined an identical request already in flight
+    invalidated: int = 0  # responses dropped by a write or `invalidate`
+    evicted: int = 0  # responses dropped to stay within `max_entries`
+
+
+class _Entry:
+    __slots__ = ("url", "policy", "value", "expires_at")
+
+    def __init__(self, url: str, policy: CachePolicy, value: t.Any, expires_at: float) -> None:
+        self.url = url
+        self.policy = policy
+        self.value = value
+        self.expires_at = expires_at
+
+
+def cache_key(url: str, params: QueryParams | None, model: t.Any) -> CacheKey:
+    """Identical GETs share a key: same path, same query (in any order) and same model."""
+    if not params:
+        return (url, (), model)
+    items = tuple(
+        sorted(
+            (key, tuple(value) if isinstance(value, (list, tuple)) else value)
+            for key, value in params.items()
+        )
+    )
+    return (url, items, model)
+
+
+def _retrieve(task: asyncio.Task[t.Any]) -> None:
+    # every waiter may have given up; the failure is theirs to see, not the loop's to log
+    if not task.cancelled():
+        task.exception()
+
+
+class ResponseCache:
+    """
+    Single-flight and TTL caching for idempotent reads.
+
+    Concurrent fetches of the same key share one request: the first caller sends it and the
+    rest wait for its result, which is shared with every waiter (treat it as read-only). If
+    the path's policy has a `ttl`, the result is then served from memory until it expires or
+    a write invalidates it. A write also detaches fetches still in flight, so their results
+    still reach their own callers but are neither cached nor shared with later callers.
+    Failures are never cached.
+    """
+
+    _MAX_RESOLVED = 1024
+
+    def __init__(
+        self,
+        config: ResponseCacheConfig | None = None,
+        *,
+        clock: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or ResponseCacheConfig()
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._in_flight: dict[CacheKey, asyncio.Task[t.Any]] = {}
+        self._resolved: dict[str, CachePolicy] = {}
+        self.stats = ResponseCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def policy(self, url: str) -> CachePolicy:
+        policy = self._resolved.get(url)
+        if policy is None:
+            matches = [prefix for prefix in self.config.policies if url.startswith(prefix)]
+            policy = self.config.policies[max(matches, key=len)] if matches else self.config.default
+            if len(self._resolved) >= self._MAX_RESOLVED:
+                self._resolved.clear()
+            self._resolved[url] = policy
+        return policy
+
+    async def fetch(
+        self,
+        url: str,
+        key: CacheKey,
+        load: t.Callable[[], t.Awaitable[V]],
+        *,
+        deadline: float | None = None,
+    ) -> V:
+        """
+        The cached value of `key`, or the result of `load` shared with concurrent callers.
+
+        `deadline` bounds how long this caller waits; giving up does not cancel a load other
+        callers are waiting on.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.value
+            del self._entries[key]
+        task = self._in_flight.get(key)
+        if task is None:
+            self.stats.misses += 1
+            task = asyncio.get_running_loop().create_task(self._load(url, key, load))
+            task.add_done_callback(_retrieve)
+            self._in_flight[key] = task
+        else:
+            self.stats.coalesced += 1
+        if deadline is None:
+            return await asyncio.shield(task)
+        return await asyncio.wait_for(asyncio.shield(task), deadline)
+
+    def invalidate(self, prefix: str | None = None) -> int:
+        """Drop every response whose path starts with `prefix` (all with None); returns count."""
+        return self._drop(lambda url, policy: prefix is None or url.startswith(prefix))
+
+    def written(self, url: str) -> None:
+        """Called after a write to `url`, drops the responses whose policy it invalidates."""
+        if not self._entries and not self._in_flight:
+            return
+        self._drop(
+            lambda _, policy: policy.invalidated_by is None
+            or any(url.startswith(prefix) for prefix in policy.invalidated_by)
+        )
+
+    def _drop(self, matches: t.Callable[[str, CachePolicy], bool]) -> int:
+        stale = [key for key, entry in self._entries.items() if matches(entry.url, entry.policy)]
+        for key in stale:
+            del self._entries[key]
+        for key in [key for key in self._in_flight if matches(key[0], self.policy(key[0]))]:
+            del self._in_flight[key]
+        self.stats.invalidated += len(stale)
+        return len(stale)
+
+    async def _load(self, url: str, key: CacheKey, load: t.Callable[[], t.Awaitable[V]]) -> V:
+        task = asyncio.current_task()
+        try:
+            value = await load()
+        except BaseException:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+            raise
+        if self._in_flight.get(key) is not task:
+            return value  # invalidated while in flight; may predate the write
+        del self._in_flight[key]
+        policy = self.policy(url)
+        if policy.ttl > 0:
+            self._entries[key] = _Entry(url, policy, value, self._clock() + policy.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evicted += 1
+        return value
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import functools
+import typing as t
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2_base import ArcanaGO2Base, CommandResult
+from arcana_go2.json_utils import JSONObject
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+
+@dataclass
+class SchedulerConfig:
+    max_in_flight: int = 4  # concurrent requests to the robot
+    queue_size: int = 64  # per priority; submitters wait once their queue is full
+
+
+@dataclass
+class _Job:
+    kwargs: dict[str, t.Any]
+    future: asyncio.Future[CommandResult]
+    deadline_at: float | None
+    queued_at: float
+    on_dispatch: t.Callable[[], None] | None
+
+
+class CommandScheduler:
+    """
+    Sends commands through an `ArcanaGO2Base` in priority order with bounded concurrency.
+
+    Priority 1 and priority 0 commands wait in separate bounded queues, and a free worker
+    always drains priority 1 first, so a motion command overtakes any queued mode changes or
+    tricks. A full queue makes `submit` wait (backpressure) rather than grow without bound.
+    Time spent queued counts against a command's deadline; a command whose deadline passes
+    while queued is failed without being sent. Cancelling `submit` withdraws the command: it
+    is not sent if still queued, and its request is aborted if already in flight.
+    """
+
+    def __init__(self, base: ArcanaGO2Base, config: SchedulerConfig | None = None) -> None:
+        self._base = base
+        self._config = config or SchedulerConfig()
+        self._queues: tuple[asyncio.Queue[_Job], asyncio.Queue[_Job]] = (
+            asyncio.Queue(self._config.queue_size),
+            asyncio.Queue(self._config.queue_size),
+        )
+        self._ready = asyncio.Semaphore(0)
+        self._workers: list[asyncio.Task[None]] = []
+
+    def queued(self, priority: t.Literal[0, 1]) -> int:
+        return self._queues[priority].qsize()
+
+    async def submit(
+        self,
+        *,
+        requester_id: int,
+        topic: str,
+        api_id: int,
+        command_args: JSONObject | None,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        response_policy: t.Literal["full", "light"] = "full",
+        idempotent: bool = False,
+        on_dispatch: t.Callable[[], None] | None = None,
+    ) -> CommandResult:
+        """`on_dispatch` is called when a worker takes the command off the queue to send it."""
+        self._ensure_workers()
+        loop = asyncio.get_running_loop()
+        job = _Job(
+            kwargs={
+                "requester_id": requester_id,
+                "topic": topic,
+                "api_id": api_id,
+                "command_args": command_args,
+                "priority": priority,
+                "response_policy": response_policy,
+                "idempotent": idempotent,
+            },
+            future=loop.create_future(),
+            deadline_at=None if deadline is None else loop.time() + deadline,
+            queued_at=loop.time(),
+            on_dispatch=on_dispatch,
+        )
+        await self._queues[1 if priority else 0].put(job)
+        self._ready.release()
+        return await job.future
+
+    async def close(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        for queue in self._queues:
+            while not queue.empty():
+                job = queue.get_nowait()
+                if not job.future.done():
+                    job.future.set_exception(APIException("Scheduler closed"))
+
+    def _ensure_workers(self) -> None:
+        if self._workers:
+            return
+        loop = asyncio.get_running_loop()
+        lg.debug("starting %d scheduler workers", self._config.max_in_flight)
+        self._workers = [loop.create_task(self._work()) for _ in range(self._config.max_in_flight)]
+
+    async def _work(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._ready.acquire()
+            urgent, normal = self._queues[1], self._queues[0]
+            job = urgent.get_nowait() if not urgent.empty() else normal.get_nowait()
+            if job.future.done():  # the submitter gave up while queued
+                continue
+            deadline = None
+            if job.deadline_at is not None:
+                deadline = job.deadline_at - loop.time()
+                if deadline <= 0:
+                    job.future.set_exception(
+                        APIException("Deadline exceeded", detail="expired while queued")
+                    )
+                    continue
+            if job.on_dispatch is not None:
+                job.on_dispatch()
+            send = loop.create_task(
+                self._base.send_command(
+                    **job.kwargs, deadline=deadline, queue_wait=loop.time() - job.queued_at
+                )
+            )
+            job.future.add_done_callback(functools.partial(_abort_withdrawn, send))
+            try:
+                await asyncio.wait((send,))
+            except asyncio.CancelledError:
+                send.cancel()
+                if not job.future.done():
+                    job.future.set_exception(APIException("Scheduler closed"))
+                raise
+            if job.future.done():  # withdrawn mid-send
+                if not send.cancelled():
+                    send.exception()  # nobody is left to see it
+            elif send.cancelled():
+                job.future.set_exception(APIException("Command cancelled"))
+            elif (error := send.exception()) is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(send.result())
+
+
+def _abort_withdrawn(send: asyncio.Task[CommandResult], future: asyncio.Future[t.Any]) -> None:
+    # a submitter that gives up mid-send aborts the request, and any retry of it
+    if future.cancelled():
+        send.cancel()
@@ -0,0 +1,126 @@
+"""
+Regenerates `COMMANDS` and the blocking and `_future` command methods of `ArcanaGO2Sync`
+from the command signatures of `ArcanaGO2`:
+
+    python -m arcana_go2.scripts.gen_sync_client          # rewrite arcana_go2/sync_client.py
+    python -m arcana_go2.scripts.gen_sync_client --check  # exit 1 if it is out of date
+
+The methods are written out rather than attached at import time so type checkers and IDEs
+see them. Output is formatted the way black (line length 100) would format it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import os
+import sys
+import typing as t
+
+BEGIN_NAMES = "# BEGIN GENERATED COMMAND NAMES, see arcana_go2.scripts.gen_sync_client\n"
+END_NAMES = "# END GENERATED COMMAND NAMES\n"
+BEGIN = "    # BEGIN GENERATED COMMANDS, see arcana_go2.scripts.gen_sync_client\n"
+END = "    # END GENERATED COMMANDS\n"
+LINE_LENGTH = 100
+
+PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sync_client.py")
+
+_NOT_COMMANDS = {"close", "warmup"}
+
+
+def commands() -> tuple[str, ...]:
+    """Every public `ArcanaGO2` coroutine method that sends a command, in name order."""
+    from arcana_go2.arcana_go2 import ArcanaGO2
+
+    return tuple(
+        name
+        for name in dir(ArcanaGO2)
+        if not name.startswith("_")
+        and name not in _NOT_COMMANDS
+        and inspect.iscoroutinefunction(getattr(ArcanaGO2, name))
+    )
+
+
+def generate_names(names: t.Iterable[str]) -> str:
+    lines = ["# every public ArcanaGO2 coroutine method that sends a command", "COMMANDS = ("]
+    lines += [f'    "{name}",' for name in names]
+    return "\n".join([*lines, ")"]) + "\n"
+
+
+def _def(name: str, params: list[str], returns: str) -> list[str]:
+    head = f"    def {name}("
+    tail = f") -> {returns}:"
+    if len(head) + len(", ".join(params)) + len(tail) <= LINE_LENGTH:
+        return [head + ", ".join(params) + tail]
+    if 8 + len(", ".join(params)) <= LINE_LENGTH:
+        return [head, "        " + ", ".join(params), "    " + tail]
+    return [head, *(f"        {param}," for param in params), "    " + tail]
+
+
+def _return(wrapper: str, command: str, arguments: list[str]) -> list[str]:
+    call = f"self._go2.{command}({', '.join(arguments)})"
+    if len(f"        return self.{wrapper}({call})") <= LINE_LENGTH:
+        return [f"        return self.{wrapper}({call})"]
+    if 12 + len(call) <= LINE_LENGTH:
+        return [f"        return self.{wrapper}(", f"            {call}", "        )"]
+    lines = [f"        return self.{wrapper}(", f"            self._go2.{command}("]
+    if 16 + len(", ".join(arguments)) <= LINE_LENGTH:
+        lines.append("                " + ", ".join(arguments))
+    else:
+        lines.extend(f"                {argument}," for argument in arguments)
+    return [*lines, "            )", "        )"]
+
+
+def generate(commands: t.Iterable[str]) -> str:
+    from arcana_go2.arcana_go2 import ArcanaGO2
+
+    lines: list[str] = []
+    for name in commands:
+        signature = inspect.signature(getattr(ArcanaGO2, name))
+        params = ["self", "*"]
+        arguments: list[str] = []
+        for parameter in list(signature.parameters.values())[1:]:
+            assert parameter.kind is inspect.Parameter.KEYWORD_ONLY, (name, parameter)
+            param = f"{parameter.name}: {parameter.annotation}"
+            if parameter.default is not inspect.Parameter.empty:
+                param += f" = {parameter.default!r}"
+            params.append(param)
+            arguments.append(f"{parameter.name}={parameter.name}")
+        returns = signature.return_annotation
+        lines += _def(name, params, returns)
+        lines += _return("_call", name, arguments)
+        lines.append("")
+        lines += _def(f"{name}_future", params, f"concurrent.futures.Future[{returns}]")
+        lines += _return("_submit", name, arguments)
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _replace(source: str, begin: str, end: str, generated: str) -> str:
+    start = source.index(begin) + len(begin)
+    stop = source.index(end, start)
+    return source[:start] + generated + source[stop:]
+
+
+def main(argv: t.Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate ArcanaGO2Sync's command methods.")
+    parser.add_argument("--check", action="store_true", help="only check, exit 1 if stale")
+    args = parser.parse_args(argv)
+
+    names = commands()
+    with open(PATH) as f:
+        source = f.read()
+    updated = _replace(source, BEGIN_NAMES, END_NAMES, generate_names(names))
+    updated = _replace(updated, BEGIN, END, generate(names))
+    if updated == source:
+        return 0
+    if args.check:
+        print(f"{PATH} is out of date, run python -m arcana_go2.scripts.gen_sync_client")
+        return 1
+    with open(PATH, "w") as f:
+        f.write(updated)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
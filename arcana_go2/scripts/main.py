@@ -1,14 +1,8 @@
-import asyncio
 import sys
-from arcana_go2.arcana_go2 import ArcanaGO2
-from arcana_go2.logger import LogLevel
 
-async def main():
-    async with ArcanaGO2(base_url="http://localhost:5656") as go2:
-        await go2.sit(id=0, priority=0)
-    
+from arcana_go2.cli import main
 
+# kept for `python -m arcana_go2.scripts.main`; the `arcana-go2` console script is the real CLI.
+# With no arguments it still sits the robot at the default URL, as it always has.
 if __name__ == "__main__":
-    asyncio.run(main())
-    sys.exit(0)
-    
\ No newline at end of file
+    sys.exit(main(sys.argv[1:] or ["sit"]))
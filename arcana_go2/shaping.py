@@ -0,0 +1,206 @@
+"""
+Setpoint shaping for `move` / `euler`: deadband, velocity and acceleration limits and
+smoothing, computed with NumPy over every robot (or every step of a trajectory) at once.
+
+Each robot is a row of a `(robots, 3)` array, so one `shape` call does the same work for a
+fleet of fifty robots as for one. Install `arcana-go2[numpy]` to use it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import time
+import typing as t
+
+from arcana_go2.logger import make_logger
+
+if t.TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+else:
+    try:  # optional, only shaping needs it
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        np = None
+
+lg = make_logger(__name__)
+
+Vector = tuple[float, float, float]
+
+
+@dataclass
+class ShapingConfig:
+    max_velocity: Vector | None = None  # per axis limit on |x|, |y|, |z| of the command
+    max_acceleration: Vector | None = None  # per axis limit on how fast the output may change, /s
+    deadband: Vector = (0.0, 0.0, 0.0)  # inputs smaller than this (per axis) become 0
+    smoothing: float = 0.0  # exponential smoothing: weight of the previous value, 0 disables
+    cutoff_hz: float | None = None  # first-order low-pass instead of `smoothing`, follows dt
+    min_change: float = 0.0  # outputs closer than this (every axis) to the last sent are not sent
+    default_dt: float = 0.02  # step assumed for a robot's first setpoint
+
+
+@dataclass
+class ShapingStats:
+    shaped: int = 0  # setpoints shaped, counting each robot of a batch
+    suppressed: int = 0  # shaped setpoints not sent because they changed too little
+
+
+class SetpointShaper:
+    """
+    Stateful shaping of `(x, y, z)` setpoints for one or many robots.
+
+    Every step applies, per axis: the deadband, the velocity limit, the filter (exponential
+    `smoothing`, or a low-pass at `cutoff_hz` whose factor follows the actual time step), and
+    finally the acceleration limit relative to the previous output. State starts at rest and
+    `reset` puts it back there, e.g. after a stop. Each robot can have its own config.
+
+    `changed` / `mark_sent` implement `min_change`: a robot whose output has not moved since
+    the last setpoint sent to it need not be sent again.
+    """
+
+    def __init__(
+        self,
+        config: ShapingConfig | t.Sequence[ShapingConfig] | None = None,
+        *,
+        robots: int = 1,
+        clock: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        if np is None:
+            raise ImportError("numpy is not installed, install arcana-go2[numpy]")
+        if config is None or isinstance(config, ShapingConfig):
+            configs = [config or ShapingConfig()] * robots
+        else:
+            configs = list(config)
+        self.configs = configs
+        self.robots = len(configs)
+        self._clock = clock
+
+        def per_axis(values: t.Iterable[Vector | None]) -> NDArray[np.float64]:
+            rows = [(math.inf,) * 3 if value is None else value for value in values]
+            return np.array(rows, dtype=np.float64)
+
+        def per_robot(values: t.Iterable[float]) -> NDArray[np.float64]:
+            return np.array(list(values), dtype=np.float64).reshape(-1, 1)
+
+        self._vmax = per_axis(c.max_velocity for c in configs)
+        amax = per_axis(c.max_acceleration for c in configs)
+        self._accel_limited = np.isfinite(amax)
+        self._amax = np.where(self._accel_limited, amax, 0.0)  # so that 0 * dt never is inf * 0
+        self._deadband = per_axis(c.deadband for c in configs)
+        self._keep = per_robot(c.smoothing for c in configs)
+        # low-pass time constant, NaN where a robot uses plain exponential smoothing
+        self._rc = per_robot(
+            math.nan if c.cutoff_hz is None else 1.0 / (2 * math.pi * c.cutoff_hz) for c in configs
+        )
+        self._lowpass = ~np.isnan(self._rc)
+        self._min_change = per_robot(c.min_change for c in configs).ravel()
+        self._default_dt = per_robot(c.default_dt for c in configs)
+
+        self._target = np.zeros((self.robots, 3))
+        self._filtered = np.zeros((self.robots, 3))
+        self._output = np.zeros((self.robots, 3))
+        self._sent = np.full((self.robots, 3), np.nan)  # NaN: nothing sent yet
+        self._last_at = np.full((self.robots, 1), np.nan)
+        self.stats = ShapingStats()
+
+    @property
+    def target(self) -> NDArray[np.float64]:
+        """The last (deadbanded, limited) target of each robot, read-only."""
+        view = self._target.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def output(self) -> NDArray[np.float64]:
+        """The last shaped output of each robot, read-only."""
+        view = self._output.view()
+        view.flags.writeable = False
+        return view
+
+    def shape(self, setpoints: t.Any, *, dt: float | None = None) -> NDArray[np.float64]:
+        """
+        Shape one setpoint per robot, `(robots, 3)` (or `(3,)` for a single robot).
+
+        `dt` is the time since the previous step; by default it is measured per robot with
+        the clock. Returns a new array of the same shape.
+        """
+        target = self._limit(self._as_rows(setpoints))
+        now = self._clock()
+        if dt is None:
+            elapsed = now - self._last_at
+            step = np.where(np.isnan(elapsed), self._default_dt, np.maximum(elapsed, 0.0))
+        else:
+            step = np.full((self.robots, 1), dt)
+        self._last_at[:] = now
+        self._target = target
+        self._filtered, self._output = self._step(target, self._filtered, self._output, step)
+        self.stats.shaped += self.robots
+        return self._output.reshape(np.shape(setpoints)).copy()
+
+    def shape_trajectory(self, points: t.Any, dt: float) -> NDArray[np.float64]:
+        """
+        Shape a buffered trajectory sampled every `dt` seconds, without changing any state.
+
+        `points` is `(steps, 3)` for one robot or `(steps, robots, 3)`. Deadband and velocity
+        limits run over the whole array at once; the filter and acceleration limit depend on
+        the previous step, so they advance step by step, each step covering every robot.
+        """
+        array = np.asarray(points, dtype=np.float64)
+        steps = array.reshape(len(array), self.robots, 3)
+        limited = self._limit(steps)
+        shaped = np.empty_like(limited)
+        filtered, output = self._filtered.copy(), self._output.copy()
+        step = np.full((self.robots, 1), dt)
+        for index in range(len(limited)):
+            filtered, output = self._step(limited[index], filtered, output, step)
+            shaped[index] = output
+        return shaped.reshape(array.shape)
+
+    def changed(self, output: t.Any | None = None) -> NDArray[np.bool_]:
+        """Per robot, whether `output` (default the last one) differs enough to be sent."""
+        rows = self._output if output is None else self._as_rows(output)
+        delta = np.abs(rows - self._sent).max(axis=1)
+        # NaN (never sent) compares False, so it is tested separately
+        return np.isnan(delta) | (delta > self._min_change)
+
+    def mark_sent(self, robots: t.Any = None) -> None:
+        """Record the current output of `robots` (a mask or indices; all by default) as sent."""
+        index = slice(None) if robots is None else robots
+        self._sent[index] = self._output[index]
+
+    def forget_sent(self, robots: t.Any = None) -> None:
+        """Forget what was sent to `robots`, e.g. because the send failed."""
+        index = slice(None) if robots is None else robots
+        self._sent[index] = np.nan
+
+    def reset(self, robots: t.Any = None) -> None:
+        """Back to rest: zero target, filter and output, e.g. once the robot has stopped."""
+        index = slice(None) if robots is None else robots
+        for state in (self._target, self._filtered, self._output):
+            state[index] = 0.0
+        self._sent[index] = np.nan
+        self._last_at[index] = np.nan
+
+    def _as_rows(self, setpoints: t.Any) -> NDArray[np.float64]:
+        array = np.asarray(setpoints, dtype=np.float64)
+        if array.size != self.robots * 3:
+            raise ValueError(f"expected {self.robots} setpoints of 3 values, got {array.shape}")
+        return array.reshape(self.robots, 3)
+
+    def _limit(self, target: NDArray[np.float64]) -> NDArray[np.float64]:
+        target = np.where(np.abs(target) < self._deadband, 0.0, target)
+        return np.clip(target, -self._vmax, self._vmax)
+
+    def _step(
+        self,
+        target: NDArray[np.float64],
+        filtered: NDArray[np.float64],
+        output: NDArray[np.float64],
+        dt: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        gain = np.where(self._lowpass, dt / (dt + np.nan_to_num(self._rc)), 1.0 - self._keep)
+        filtered = filtered + gain * (target - filtered)
+        limit = np.where(self._accel_limited, self._amax * dt, np.inf)
+        output = output + np.clip(filtered - output, -limit, limit)
+        return filtered, output
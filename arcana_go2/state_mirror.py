@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import time
+import typing as t
+
+from arcana_go2.json_utils import JSONValue
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+
+@dataclass
+class StateMirrorConfig:
+    ttl: float = 5.0  # seconds an acknowledged state is trusted; the robot may change on its own
+
+
+@dataclass
+class StateMirrorStats:
+    sent: int = 0  # state-changing commands sent
+    suppressed: int = 0  # commands skipped because the mirror said they would change nothing
+    collapsed: int = 0  # commands that joined an identical one already in flight
+
+
+class StateMirror:
+    """
+    The last acknowledged value of each robot mode or setting, e.g. `"posture": "standing"`.
+
+    A value is set only once the robot has acknowledged the command that produced it, and is
+    trusted for `ttl` seconds after that; anything older (or never set) is unknown, so a
+    command is only ever skipped on fresh, positive knowledge.
+    """
+
+    def __init__(
+        self,
+        config: StateMirrorConfig | None = None,
+        *,
+        clock: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or StateMirrorConfig()
+        self._clock = clock
+        self._values: dict[str, tuple[JSONValue, float]] = {}
+        self.stats = StateMirrorStats()
+
+    def get(self, key: str) -> JSONValue | None:
+        """The value of `key`, None if it is unknown or stale."""
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, at = entry
+        if self._clock() - at > self.config.ttl:
+            del self._values[key]
+            return None
+        return value
+
+    def is_current(self, key: str, value: JSONValue) -> bool:
+        return key in self._values and self.get(key) == value
+
+    def update(self, key: str, value: JSONValue) -> None:
+        self._values[key] = (value, self._clock())
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Forget `key`, or everything, e.g. after the robot was handled by someone else."""
+        if key is None:
+            self._values.clear()
+        else:
+            self._values.pop(key, None)
+
+    def snapshot(self) -> dict[str, JSONValue]:
+        """Every value that is still fresh."""
+        return {key: value for key in list(self._values) if (value := self.get(key)) is not None}
@@ -0,0 +1,275 @@
+"""
+Continuous robot state: a background poller that samples a JSON state endpoint through
+`HTTPClient` into a preallocated NumPy ring buffer.
+
+Memory stays flat however long a monitor runs: the ring is allocated once and samples are
+written into it in place. Readers get read-only views into the ring rather than copies. Install
+`arcana-go2[numpy]` to use it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import math
+import time
+import typing as t
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.http_client import HTTPClient
+from arcana_go2.http_utils import QueryParams
+from arcana_go2.json_utils import JSONValue
+from arcana_go2.logger import make_logger
+
+if t.TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+else:
+    try:  # optional, only the ring buffer needs it
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        np = None
+
+lg = make_logger(__name__)
+
+# every row starts with these, then one column per field
+TIME_COLUMN = 0  # time.monotonic() when the response arrived
+RTT_COLUMN = 1  # seconds the poll took
+_FIXED_COLUMNS = 2
+
+
+class StateRing:
+    """
+    A fixed-size ring of state samples, one float64 row per sample.
+
+    Each sample is written twice, at `i` and `i + capacity` of a buffer twice the capacity,
+    so the latest `n <= capacity` samples are always one contiguous slice. `latest` and
+    `since` therefore return views, never copies. A view stays valid until the writer laps
+    it, i.e. for `capacity - n` more samples; copy it (`view.copy()`) to keep it longer.
+    Fields missing from a sample are NaN.
+    """
+
+    def __init__(self, fields: t.Sequence[str], capacity: int = 4096) -> None:
+        if np is None:
+            raise ImportError("numpy is not installed, install arcana-go2[numpy]")
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity=}")
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self.columns = {"t": TIME_COLUMN, "rtt": RTT_COLUMN}
+        self.columns.update({name: _FIXED_COLUMNS + i for i, name in enumerate(self.fields)})
+        self._data = np.full((2 * capacity, _FIXED_COLUMNS + len(self.fields)), np.nan)
+        self._view = self._data.view()
+        self._view.flags.writeable = False
+        self.count = 0  # samples ever appended; the sequence number of the next one
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, at: float, rtt: float, values: t.Sequence[float]) -> None:
+        """Write one sample in place; `values` are in `fields` order."""
+        slot = self.count % self.capacity
+        data = self._data
+        for row in (slot, slot + self.capacity):
+            data[row, TIME_COLUMN] = at
+            data[row, RTT_COLUMN] = rtt
+            for column, value in enumerate(values, _FIXED_COLUMNS):
+                data[row, column] = value
+        self.count += 1
+
+    def latest(self, n: int | None = None) -> NDArray[np.float64]:
+        """The latest `n` samples (all that are kept by default), oldest first."""
+        n = len(self) if n is None else min(n, len(self))
+        end = (self.count - 1) % self.capacity + 1 + self.capacity if self.count else 0
+        return self._view[end - n : end]
+
+    def since(self, seq: int) -> tuple[NDArray[np.float64], int]:
+        """
+        Samples from sequence number `seq` on, and the sequence number to ask for next.
+
+        Samples already overwritten are skipped; compare the row count with
+        `next - seq` to notice.
+        """
+        return self.latest(self.count - max(seq, 0)), self.count
+
+    def column(self, name: str, n: int | None = None) -> NDArray[np.float64]:
+        """One field (or "t" / "rtt") of the latest `n` samples."""
+        return self.latest(n)[:, self.columns[name]]
+
+    def window(self, seconds: float, now: float | None = None) -> NDArray[np.float64]:
+        """The samples that arrived within the last `seconds`."""
+        rows = self.latest()
+        cutoff = (time.monotonic() if now is None else now) - seconds
+        return rows[np.searchsorted(rows[:, TIME_COLUMN], cutoff, side="right") :]
+
+
+@dataclass
+class PollerConfig:
+    min_interval: float = 0.02  # fastest polling, while the state keeps changing
+    max_interval: float = 1.0  # slowest polling, while it does not; also the per-poll deadline
+    speedup: float = 0.5  # interval multiplier after a sample that changed
+    slowdown: float = 1.5  # interval multiplier after a sample that did not
+    change_threshold: float = 1e-9  # a sample changed if any field moved by more than this
+    capacity: int = 4096  # samples kept in the ring
+
+
+@dataclass
+class PollerStats:
+    polls: int = 0
+    changed: int = 0  # samples that differed from the previous one
+    errors: int = 0
+    interval: float = 0.0  # the current polling interval, seconds
+    failure: BaseException | None = None  # what stopped the poller, if anything but `close`
+
+
+def _compile(field: str) -> tuple[str | int, ...]:
+    return tuple(int(part) if part.isdigit() else part for part in field.split("."))
+
+
+def _lookup(body: JSONValue, path: tuple[str | int, ...]) -> float:
+    value: t.Any = body
+    for part in path:
+        try:
+            value = value[part]
+        except (KeyError, IndexError, TypeError):
+            return math.nan
+    if isinstance(value, bool):
+        return float(value)
+    return float(value) if isinstance(value, (int, float)) else math.nan
+
+
+class StatePoller:
+    """
+    Polls a JSON state endpoint in the background and records the chosen fields.
+
+    `fields` are dotted paths into the response, e.g. `"velocity.x"` or `"imu.rpy.0"`; each
+    becomes a column of `ring`. The interval adapts: it shrinks towards `min_interval` while
+    samples keep changing and grows towards `max_interval` while they do not (or while polls
+    fail), so an idle robot is polled rarely and a moving one closely.
+
+    Consume it with `async for rows in poller`, which yields read-only views of the samples
+    that arrived since the previous iteration (usually one row), or read windows of the ring
+    directly. Polls go through `HTTPClient.get_json`, so with a response cache other readers
+    of the same endpoint share its requests. A failed poll is counted and retried; anything
+    else that stops the poller is kept in `stats.failure` and ends the iterators.
+    """
+
+    def __init__(
+        self,
+        client: HTTPClient,
+        path: str,
+        fields: t.Sequence[str],
+        *,
+        params: QueryParams | None = None,
+        config: PollerConfig | None = None,
+    ) -> None:
+        self.config = config or PollerConfig()
+        self.ring = StateRing(fields, self.config.capacity)
+        self.stats = PollerStats(interval=self.config.min_interval)
+        self._client = client
+        self._path = path
+        self._params = params
+        self._lookups = [_compile(field) for field in fields]
+        self._values = [math.nan] * len(fields)  # reused for every sample
+        self._previous = [math.nan] * len(fields)
+        self._new_sample = asyncio.Condition()
+        self._runner: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> StatePoller:
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def __aiter__(self) -> t.AsyncIterator[NDArray[np.float64]]:
+        return self.samples()
+
+    @property
+    def running(self) -> bool:
+        runner = self._runner
+        return runner is not None and not runner.done() and self.stats.failure is None
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.stats.failure = None
+        lg.debug("polling %s for %d fields", self._path, len(self._lookups))
+        self._runner = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        async with self._new_sample:
+            self._new_sample.notify_all()  # wake iterators so they can see the poller stopped
+        lg.debug("closed state poller with stats=%r", self.stats)
+
+    async def samples(self, *, from_start: bool = False) -> t.AsyncIterator[NDArray[np.float64]]:
+        """
+        Yield views of new samples as they arrive, until the poller is closed.
+
+        Starts with the next sample, or with everything still in the ring if `from_start`.
+        A consumer that falls more than `capacity` samples behind skips the overwritten ones.
+        """
+        seq = 0 if from_start else self.ring.count
+        while True:
+            async with self._new_sample:
+                await self._new_sample.wait_for(lambda: self.ring.count > seq or not self.running)
+            if self.ring.count <= seq:
+                return
+            rows, seq = self.ring.since(seq)
+            yield rows
+
+    async def _run(self) -> None:
+        try:
+            await self._poll()
+        except Exception as e:
+            self.stats.failure = e
+            lg.error("state poller of %s stopped: %r", self._path, e)
+            async with self._new_sample:
+                self._new_sample.notify_all()  # so iterators see it is no longer running
+
+    async def _poll(self) -> None:
+        config = self.config
+        interval = config.min_interval
+        while True:
+            started = time.monotonic()
+            self.stats.polls += 1
+            try:
+                body = await self._client.get_json(
+                    self._path, params=self._params, deadline=config.max_interval
+                )
+            except APIException as e:
+                self.stats.errors += 1
+                lg.debug("state poll of %s failed: %s", self._path, e)
+                interval = min(interval * config.slowdown, config.max_interval)
+            else:
+                arrived = time.monotonic()
+                if self._record(body, arrived, arrived - started):
+                    self.stats.changed += 1
+                    interval = max(interval * config.speedup, config.min_interval)
+                else:
+                    interval = min(interval * config.slowdown, config.max_interval)
+                async with self._new_sample:
+                    self._new_sample.notify_all()
+            self.stats.interval = interval
+            await asyncio.sleep(max(started + interval - time.monotonic(), 0.0))
+
+    def _record(self, body: JSONValue, at: float, rtt: float) -> bool:
+        values, previous = self._values, self._previous
+        changed = False
+        threshold = self.config.change_threshold
+        for index, path in enumerate(self._lookups):
+            value = _lookup(body, path)
+            old = previous[index]
+            if abs(value - old) > threshold or math.isnan(value) != math.isnan(old):
+                changed = True
+            values[index] = value
+        self.ring.append(at, rtt, values)
+        self._values, self._previous = previous, values
+        return changed
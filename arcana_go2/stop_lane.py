@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import time
+import typing as t
+
+import httpx
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2_base import CommandAck, CommandResponse
+from arcana_go2.command_encoding import JSON_CONTENT_TYPE, CommandEncoder
+from arcana_go2.journal import CommandJournal, status_for
+from arcana_go2.logger import make_logger
+from arcana_go2.token_manager import TokenProvider, as_token_manager
+from arcana_go2.transport import COMMAND_ENDPOINT
+
+lg = make_logger(__name__)
+
+STOP_TOPIC = "rt/api/sport/request"
+
+
+@dataclass
+class StopLaneConfig:
+    timeout: float = 0.3  # per copy, covers connect, write and read
+    copies: int = 2  # redundant copies fired per stop, each on its own connection
+    history: int = 1024  # latency samples kept for percentiles
+
+
+@dataclass
+class StopLaneStats:
+    sent: int = 0
+    failed: int = 0
+    latencies: deque[float] = field(default_factory=deque)
+
+    def percentile(self, q: float) -> float | None:
+        """Latency in seconds at quantile `q` (0..1) of the recorded stops, None if none."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class StopLane:
+    """
+    A reserved path for safety commands (`damp`, `stopmove`).
+
+    It owns its own small connection pool, separate from the one regular commands use, with
+    headers built once and short timeouts. A stop skips queues, retries and response
+    validation: `copies` identical requests go out at once and the first 2xx wins. The rest
+    are left to finish in the background so their connections stay warm. A `deadline` bounds
+    the whole stop, on top of the per copy `timeout`.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        get_token: TokenProvider | None = None,
+        config: StopLaneConfig | None = None,
+        verify_tls: bool | str = True,
+        journal: CommandJournal | None = None,
+    ) -> None:
+        if not base_url.startswith(("http://", "https://")):
+            raise ValueError(f"the stop lane needs an http(s) base url, got {base_url=}")
+        self._config = config or StopLaneConfig()
+        self._copies = max(self._config.copies, 1)
+        self._tokens = as_token_manager(get_token)
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=self._config.timeout,
+            verify=verify_tls,
+            limits=httpx.Limits(
+                max_connections=self._copies, max_keepalive_connections=self._copies
+            ),
+        )
+        self._headers = self._build_headers(None)
+        self._headers_version = -1
+        self._encoder = CommandEncoder()
+        self._stragglers: set[asyncio.Task[httpx.Response]] = set()
+        self._journal = journal
+        self.stats = StopLaneStats(latencies=deque(maxlen=self._config.history))
+
+    async def warmup(self) -> None:
+        """Open one keepalive connection per copy so the first stop skips the TCP handshake."""
+        await self._refresh_headers()
+
+        async def touch() -> None:
+            try:
+                await self._client.get("/", headers=self._headers)
+            except httpx.HTTPError as e:
+                lg.warning("stop lane warmup failed: %s", e)
+
+        await asyncio.gather(*(touch() for _ in range(self._copies)))
+
+    async def close(self) -> None:
+        for task in self._stragglers:
+            task.cancel()
+        await asyncio.gather(*self._stragglers, return_exceptions=True)
+        await self._client.aclose()
+
+    async def send(
+        self,
+        *,
+        requester_id: int,
+        api_id: int,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+    ) -> CommandResponse | CommandAck | None:
+        if self._journal is None:
+            return await self._send(requester_id, api_id, priority, deadline)
+        sent_at = time.monotonic()
+        error: BaseException | None = None
+        try:
+            return await self._send(requester_id, api_id, priority, deadline)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._journal.record(
+                sent_at=sent_at,
+                requester_id=requester_id,
+                topic=STOP_TOPIC,
+                api_id=api_id,
+                priority=int(priority),
+                command_args=None,
+                status=status_for(error),
+                rtt=time.monotonic() - sent_at,
+            )
+
+    async def _send(
+        self, requester_id: int, api_id: int, priority: t.Literal[0, 1], deadline: float | None
+    ) -> CommandResponse | CommandAck | None:
+        await self._refresh_headers()
+        body = self._encoder.encode(requester_id, STOP_TOPIC, api_id, None, int(priority))
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        copies = [
+            loop.create_task(
+                self._client.post(COMMAND_ENDPOINT, content=body, headers=self._headers)
+            )
+            for _ in range(self._copies)
+        ]
+        errors: list[str] = []
+        timed_out = False
+        try:
+            for next_done in asyncio.as_completed(copies, timeout=deadline):
+                try:
+                    resp = await next_done
+                except httpx.HTTPError as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+                    continue
+                if not 200 <= resp.status_code < 300:
+                    errors.append(f"status {resp.status_code}")
+                    continue
+                self.stats.sent += 1
+                self.stats.latencies.append(time.perf_counter() - start)
+                if not resp.content:
+                    return None
+                # the robot echoes the command back; trust it rather than validating, and
+                # never fail a stop the robot accepted over a body that is not that echo
+                try:
+                    echoed = resp.json()
+                except ValueError:
+                    echoed = None
+                if isinstance(echoed, dict):
+                    return CommandResponse.model_construct(**echoed)
+                return CommandAck(requester_id, STOP_TOPIC, api_id, int(priority))
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            for copy in copies:
+                if not copy.done():
+                    self._stragglers.add(copy)
+                    copy.add_done_callback(self._reap)
+        self.stats.failed += 1
+        raise APIException(
+            "Deadline exceeded" if timed_out else "Stop failed on every copy",
+            url=f"{self._client.base_url}{COMMAND_ENDPOINT}",
+            method="POST",
+            detail=errors,
+        )
+
+    def _reap(self, task: asyncio.Task[httpx.Response]) -> None:
+        self._stragglers.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            lg.debug("redundant stop copy failed: %s", task.exception())
+
+    async def _refresh_headers(self) -> None:
+        token = await self._tokens.get()
+        if self._tokens.version != self._headers_version:
+            self._headers = self._build_headers(token)
+            self._headers_version = self._tokens.version
+
+    def _build_headers(self, token: str | None) -> dict[str, str]:
+        headers = {"Accept": "application/json", **JSON_CONTENT_TYPE}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
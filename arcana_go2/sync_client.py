@@ -0,0 +1,561 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import typing as t
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.arcana_go2_base import CommandResult, ResponsePolicy
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+T = t.TypeVar("T")
+
+# BEGIN GENERATED COMMAND NAMES, see arcana_go2.scripts.gen_sync_client
+# every public ArcanaGO2 coroutine method that sends a command
+COMMANDS = (
+    "content",
+    "damp",
+    "dance1",
+    "dance2",
+    "euler",
+    "frontjump",
+    "frontpounce",
+    "handstand",
+    "hello",
+    "move",
+    "obstacle_avoid_switch_set",
+    "pose",
+    "recoverystand",
+    "risesit",
+    "sit",
+    "speedlevel",
+    "standdown",
+    "standup",
+    "staticwalk",
+    "stopmove",
+    "stretch",
+    "switch_joystick",
+)
+# END GENERATED COMMAND NAMES
+
+
+class ArcanaGO2Sync:
+    """
+    A blocking, thread-safe front for `ArcanaGO2`, for ROS callbacks, GUIs and scripts.
+
+    It owns one event loop on a background thread and one long-lived `ArcanaGO2` on it, so
+    every call reuses the same warm connection pool instead of paying for a new loop and
+    client the way `asyncio.run` per call does. Each command exists twice: `go2.sit(id=1)`
+    blocks until the robot answers, `go2.sit_future(id=1)` returns a
+    `concurrent.futures.Future` straight away. Both take the same arguments as on `ArcanaGO2`
+    and may be called from any thread except the loop's own.
+    """
+
+    def __init__(self, *, warmup: bool = False, **kwargs: t.Any) -> None:
+        """`kwargs` are passed to `ArcanaGO2`; `warmup` opens connections before returning."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="arcana-go2-loop", daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+        try:
+            self._go2: ArcanaGO2 = self._call(self._create(kwargs))
+        except BaseException:
+            self._stop_loop()
+            raise
+        if warmup:
+            self.warmup()
+
+    @staticmethod
+    async def _create(kwargs: dict[str, t.Any]) -> ArcanaGO2:
+        # built on the loop so everything it creates belongs to that loop
+        return ArcanaGO2(**kwargs)
+
+    def __enter__(self) -> ArcanaGO2Sync:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def client(self) -> ArcanaGO2:
+        """The underlying async client; only use it from coroutines passed to `run`."""
+        return self._go2
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self._call(self._go2.close())
+        finally:
+            self._stop_loop()
+
+    def _stop_loop(self) -> None:
+        self._closed = True
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def warmup(self) -> None:
+        self._call(self._go2.warmup())
+
+    def run(self, fn: t.Callable[[ArcanaGO2], t.Awaitable[T]]) -> T:
+        """Run `fn(client)` on the loop and wait for it, e.g. to use a velocity stream."""
+        return self._call(self._apply(fn))
+
+    def submit(self, fn: t.Callable[[ArcanaGO2], t.Awaitable[T]]) -> concurrent.futures.Future[T]:
+        """Like `run`, but return a future instead of waiting."""
+        return self._submit(self._apply(fn))
+
+    async def _apply(self, fn: t.Callable[[ArcanaGO2], t.Awaitable[T]]) -> T:
+        # called on the loop, so `fn` may create tasks or streams before its first await
+        return await fn(self._go2)
+
+    def _submit(self, coro: t.Coroutine[t.Any, t.Any, T]) -> concurrent.futures.Future[T]:
+        if self._closed:
+            coro.close()
+            raise RuntimeError("ArcanaGO2Sync is closed")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _call(self, coro: t.Coroutine[t.Any, t.Any, T]) -> T:
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("blocking ArcanaGO2Sync call from its own loop would deadlock")
+        return self._submit(coro).result()
+
+    # velocity_stream, stats() and the other non-command helpers are reached through `run`
+
+    # BEGIN GENERATED COMMANDS, see arcana_go2.scripts.gen_sync_client
+    def content(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.content(id=id, priority=priority, deadline=deadline))
+
+    def content_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.content(id=id, priority=priority, deadline=deadline))
+
+    def damp(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.damp(id=id, priority=priority, deadline=deadline))
+
+    def damp_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.damp(id=id, priority=priority, deadline=deadline))
+
+    def dance1(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.dance1(id=id, priority=priority, deadline=deadline))
+
+    def dance1_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.dance1(id=id, priority=priority, deadline=deadline))
+
+    def dance2(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.dance2(id=id, priority=priority, deadline=deadline))
+
+    def dance2_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.dance2(id=id, priority=priority, deadline=deadline))
+
+    def euler(
+        self,
+        *,
+        id: int,
+        x: float,
+        y: float,
+        z: float,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+        response_policy: ResponsePolicy | None = None,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.euler(
+                id=id,
+                x=x,
+                y=y,
+                z=z,
+                priority=priority,
+                deadline=deadline,
+                response_policy=response_policy,
+            )
+        )
+
+    def euler_future(
+        self,
+        *,
+        id: int,
+        x: float,
+        y: float,
+        z: float,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+        response_policy: ResponsePolicy | None = None,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.euler(
+                id=id,
+                x=x,
+                y=y,
+                z=z,
+                priority=priority,
+                deadline=deadline,
+                response_policy=response_policy,
+            )
+        )
+
+    def frontjump(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.frontjump(id=id, priority=priority, deadline=deadline))
+
+    def frontjump_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.frontjump(id=id, priority=priority, deadline=deadline))
+
+    def frontpounce(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.frontpounce(id=id, priority=priority, deadline=deadline))
+
+    def frontpounce_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.frontpounce(id=id, priority=priority, deadline=deadline))
+
+    def handstand(
+        self, *, id: int, flag: bool, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(
+            self._go2.handstand(id=id, flag=flag, priority=priority, deadline=deadline)
+        )
+
+    def handstand_future(
+        self, *, id: int, flag: bool, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.handstand(id=id, flag=flag, priority=priority, deadline=deadline)
+        )
+
+    def hello(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.hello(id=id, priority=priority, deadline=deadline))
+
+    def hello_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.hello(id=id, priority=priority, deadline=deadline))
+
+    def move(
+        self,
+        *,
+        id: int,
+        x: float,
+        y: float,
+        z: float,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+        response_policy: ResponsePolicy | None = None,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.move(
+                id=id,
+                x=x,
+                y=y,
+                z=z,
+                priority=priority,
+                deadline=deadline,
+                response_policy=response_policy,
+            )
+        )
+
+    def move_future(
+        self,
+        *,
+        id: int,
+        x: float,
+        y: float,
+        z: float,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+        response_policy: ResponsePolicy | None = None,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.move(
+                id=id,
+                x=x,
+                y=y,
+                z=z,
+                priority=priority,
+                deadline=deadline,
+                response_policy=response_policy,
+            )
+        )
+
+    def obstacle_avoid_switch_set(
+        self,
+        *,
+        id: int,
+        enable: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.obstacle_avoid_switch_set(
+                id=id, enable=enable, priority=priority, deadline=deadline, force=force
+            )
+        )
+
+    def obstacle_avoid_switch_set_future(
+        self,
+        *,
+        id: int,
+        enable: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.obstacle_avoid_switch_set(
+                id=id, enable=enable, priority=priority, deadline=deadline, force=force
+            )
+        )
+
+    def pose(
+        self,
+        *,
+        id: int,
+        flag: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.pose(id=id, flag=flag, priority=priority, deadline=deadline, force=force)
+        )
+
+    def pose_future(
+        self,
+        *,
+        id: int,
+        flag: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.pose(id=id, flag=flag, priority=priority, deadline=deadline, force=force)
+        )
+
+    def recoverystand(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.recoverystand(id=id, priority=priority, deadline=deadline))
+
+    def recoverystand_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.recoverystand(id=id, priority=priority, deadline=deadline))
+
+    def risesit(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.risesit(id=id, priority=priority, deadline=deadline, force=force)
+        )
+
+    def risesit_future(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.risesit(id=id, priority=priority, deadline=deadline, force=force)
+        )
+
+    def sit(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
+        return self._call(self._go2.sit(id=id, priority=priority, deadline=deadline, force=force))
+
+    def sit_future(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.sit(id=id, priority=priority, deadline=deadline, force=force))
+
+    def speedlevel(
+        self,
+        *,
+        id: int,
+        data: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.speedlevel(
+                id=id, data=data, priority=priority, deadline=deadline, force=force
+            )
+        )
+
+    def speedlevel_future(
+        self,
+        *,
+        id: int,
+        data: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.speedlevel(
+                id=id, data=data, priority=priority, deadline=deadline, force=force
+            )
+        )
+
+    def standdown(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.standdown(id=id, priority=priority, deadline=deadline, force=force)
+        )
+
+    def standdown_future(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.standdown(id=id, priority=priority, deadline=deadline, force=force)
+        )
+
+    def standup(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.standup(id=id, priority=priority, deadline=deadline, force=force)
+        )
+
+    def standup_future(
+        self,
+        *,
+        id: int,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.standup(id=id, priority=priority, deadline=deadline, force=force)
+        )
+
+    def staticwalk(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.staticwalk(id=id, priority=priority, deadline=deadline))
+
+    def staticwalk_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.staticwalk(id=id, priority=priority, deadline=deadline))
+
+    def stopmove(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.stopmove(id=id, priority=priority, deadline=deadline))
+
+    def stopmove_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.stopmove(id=id, priority=priority, deadline=deadline))
+
+    def stretch(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> CommandResult:
+        return self._call(self._go2.stretch(id=id, priority=priority, deadline=deadline))
+
+    def stretch_future(
+        self, *, id: int, priority: t.Literal[0, 1] = 0, deadline: float | None = None
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(self._go2.stretch(id=id, priority=priority, deadline=deadline))
+
+    def switch_joystick(
+        self,
+        *,
+        id: int,
+        flag: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> CommandResult:
+        return self._call(
+            self._go2.switch_joystick(
+                id=id, flag=flag, priority=priority, deadline=deadline, force=force
+            )
+        )
+
+    def switch_joystick_future(
+        self,
+        *,
+        id: int,
+        flag: bool,
+        priority: t.Literal[0, 1] = 0,
+        deadline: float | None = None,
+        force: bool = False,
+    ) -> concurrent.futures.Future[CommandResult]:
+        return self._submit(
+            self._go2.switch_joystick(
+                id=id, flag=flag, priority=priority, deadline=deadline, force=force
+            )
+        )
+
+    # END GENERATED COMMANDS
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import inspect
+import typing as t
+
+from arcana_go2.logger import make_logger
+
+lg = make_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Token:
+    value: str | None
+    expires_in: float | None = None  # seconds from when it was fetched; None uses the manager ttl
+
+
+TokenSource = t.Callable[[], "str | Token | None | t.Awaitable[str | Token | None]"]
+
+
+class TokenManager:
+    """
+    Caches the auth token from a `TokenSource` and refreshes it off the request path.
+
+    The source may be sync or async and may return a bare token string or a `Token` with its
+    own lifetime. Sync sources run in a worker thread so a slow one (vault lookup, file read)
+    never blocks the event loop. Concurrent callers that find the token missing or expired
+    share a single refresh. Once a token is within `refresh_margin` of expiring (or half its
+    lifetime, for tokens shorter-lived than that), the next `get` starts a background refresh
+    and returns the still-valid current token. `version` changes only when the token value
+    does, so consumers can cache whatever they derive from it.
+
+    Bare tokens are cached for `ttl` seconds (5 minutes by default), so a source is no longer
+    called once per request; pass `ttl=0` to call it for every request, or `ttl=None` to
+    fetch once. A failed refresh keeps the last good token in use and is retried in the
+    background, `retry_backoff` seconds later and doubling up to `max_retry_backoff`, even
+    past the token's expiry. `get` only waits for the source when there is no token yet, after
+    `invalidate`, or when a token expired while nothing asked for it.
+    """
+
+    def __init__(
+        self,
+        source: TokenSource | None = None,
+        *,
+        ttl: float | None = 300.0,
+        refresh_margin: float = 30.0,
+        retry_backoff: float = 1.0,
+        max_retry_backoff: float = 30.0,
+    ) -> None:
+        self._source = source
+        self._ttl = ttl
+        self._refresh_margin = refresh_margin
+        self._retry_backoff = retry_backoff
+        self._max_retry_backoff = max_retry_backoff
+        self._value: str | None = None
+        self._expires_at: float | None = None
+        self._refresh_at: float | None = None
+        self._fetched = False
+        self._failures = 0  # refreshes failed in a row
+        self._refreshing: asyncio.Task[str | None] | None = None
+        self.version = 0
+
+    @property
+    def current(self) -> str | None:
+        """The cached token, without checking whether it is still fresh."""
+        return self._value
+
+    async def get(self) -> str | None:
+        if self._source is None:
+            return None
+        if not self._fetched:
+            return await self.refresh()
+        if self._expires_at is None or self._refresh_at is None:
+            return self._value
+        now = asyncio.get_running_loop().time()
+        if now < self._refresh_at:
+            return self._value
+        if now >= self._expires_at and not self._failures:
+            return await self.refresh()  # it aged out unused, sending it would only fail
+        if self._refreshing is None:
+            self._start_refresh()
+        return self._value
+
+    async def refresh(self) -> str | None:
+        """Fetch a new token, joining the refresh already in flight if there is one."""
+        task = self._refreshing or self._start_refresh()
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        """Force the next `get` to fetch, e.g. after the server rejects the token."""
+        self._fetched = False
+
+    def _start_refresh(self) -> asyncio.Task[str | None]:
+        task = asyncio.get_running_loop().create_task(self._fetch())
+        self._refreshing = task
+        task.add_done_callback(self._refresh_done)
+        return task
+
+    def _refresh_done(self, task: asyncio.Task[str | None]) -> None:
+        self._refreshing = None
+
+    async def _fetch(self) -> str | None:
+        assert self._source is not None
+        loop = asyncio.get_running_loop()
+        try:
+            if inspect.iscoroutinefunction(self._source):
+                result = await self._source()
+            else:
+                result = await asyncio.to_thread(self._source)
+                if inspect.isawaitable(result):
+                    result = await result
+        except Exception as e:
+            self._failures += 1
+            backoff = min(self._retry_backoff * 2 ** (self._failures - 1), self._max_retry_backoff)
+            lg.warning("token provider raised, retrying in %.1fs: %s", backoff, e, exc_info=e)
+            # keep serving the last good token, if any; without one the next `get` fetches
+            self._refresh_at = loop.time() + backoff
+            return self._value
+
+        token = result if isinstance(result, Token) else Token(t.cast("str | None", result))
+        lifetime = token.expires_in if token.expires_in is not None else self._ttl
+        if lifetime is None:
+            self._expires_at = self._refresh_at = None
+        else:
+            # short-lived tokens refresh halfway through rather than continuously
+            self._expires_at = loop.time() + lifetime
+            self._refresh_at = self._expires_at - min(self._refresh_margin, lifetime / 2)
+        self._fetched = True
+        self._failures = 0
+        if token.value != self._value:
+            self._value = token.value
+            self.version += 1
+        return self._value
+
+
+TokenProvider: t.TypeAlias = "TokenSource | TokenManager"
+
+
+def as_token_manager(provider: TokenProvider | None) -> TokenManager:
+    """Wrap a bare token callback in a `TokenManager`; managers are shared, not wrapped."""
+    return provider if isinstance(provider, TokenManager) else TokenManager(provider)
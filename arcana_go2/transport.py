@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+import typing as t
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel, ValidationError
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.command_encoding import JSON_CONTENT_TYPE
+from arcana_go2.framing import FrameError, encode_request_frame, read_frame
+from arcana_go2.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from arcana_go2.http_client import HedgeConfig, HedgeStats, HTTPClient, PoolConfig, SharedPool
+from arcana_go2.instrumentation import CURRENT_SAMPLE
+from arcana_go2.json_utils import JSONObject
+from arcana_go2.logger import make_logger
+from arcana_go2.token_manager import TokenProvider
+
+lg = make_logger(__name__)
+
+T = t.TypeVar("T", bound=BaseModel)
+
+COMMAND_ENDPOINT = "/api/webrtc"
+
+
+class CommandTransport(t.Protocol):
+    """
+    Carries one JSON-encoded command body to the robot and returns its validated response.
+
+    With `model=None` the response is only status-checked and None is returned. `hedge` says
+    the command is idempotent, so a transport may send it more than once to cut tail latency.
+    """
+
+    async def request(
+        self,
+        body: bytes,
+        *,
+        model: t.Type[T] | None,
+        deadline: float | None = None,
+        hedge: bool = False,
+    ) -> T | None: ...
+
+    async def warmup(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class HTTPCommandTransport:
+    """The default transport: one POST to `/api/webrtc` per command."""
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        get_token: TokenProvider | None = None,
+        timeout: float = 15.0,
+        pool: PoolConfig | None = None,
+        hedge: HedgeConfig | None = None,
+        circuit_breaker: CircuitBreakerConfig | None = None,
+        shared_pool: SharedPool | None = None,
+    ) -> None:
+        self.client = HTTPClient(
+            base_url=base_url,
+            get_token=get_token,
+            timeout=timeout,
+            pool=pool,
+            hedge=hedge,
+            circuit_breaker=circuit_breaker,
+            shared_pool=shared_pool,
+        )
+
+    @property
+    def hedge_stats(self) -> HedgeStats | None:
+        return self.client.hedge_stats
+
+    @property
+    def breaker(self) -> CircuitBreaker | None:
+        return self.client.breaker
+
+    async def request(
+        self,
+        body: bytes,
+        *,
+        model: t.Type[T] | None,
+        deadline: float | None = None,
+        hedge: bool = False,
+    ) -> T | None:
+        return await self.client.post(
+            COMMAND_ENDPOINT,
+            model=model,
+            content=body,
+            headers=JSON_CONTENT_TYPE,
+            deadline=deadline,
+            hedge=hedge,
+        )
+
+    async def warmup(self) -> None:
+        await self.client.warmup()
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class FramedCommandTransport:
+    """
+    A persistent, pipelined connection speaking the length-prefixed JSON protocol in
+    `arcana_go2.framing`.
+
+    Requests are written as soon as they are issued without waiting for earlier acks, and
+    responses are matched back to their callers by correlation id, so they may arrive in any
+    order. The connection is opened on first use and reopened after it drops; requests that were
+    in flight when it dropped fail with an `APIException`. Give either `host` and `port` for
+    TCP or `path` for a Unix domain socket.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str | None = None,
+        port: int | None = None,
+        path: str | None = None,
+        timeout: float = 15.0,
+    ) -> None:
+        if path is None and (host is None or port is None):
+            raise ValueError("framed transport needs host and port, or a unix socket path")
+        self._host = host
+        self._port = port
+        self._path = path
+        self._timeout = timeout
+        self._cids = itertools.count()
+        self._pending: dict[int, asyncio.Future[JSONObject]] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def url(self) -> str:
+        if self._path is not None:
+            return f"unix://{self._path}"
+        return f"tcp://{self._host}:{self._port}"
+
+    async def warmup(self) -> None:
+        await self.connect()
+
+    async def connect(self) -> None:
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            lg.debug("opening framed connection to %s", self.url)
+            try:
+                reader, writer = await asyncio.wait_for(
+                    (
+                        asyncio.open_unix_connection(self._path)
+                        if self._path is not None
+                        else asyncio.open_connection(self._host, self._port)
+                    ),
+                    self._timeout,
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                raise APIException("Transport error", url=self.url, detail=str(e)) from e
+            self._writer = writer
+            self._reader_task = asyncio.get_running_loop().create_task(self._read_loop(reader))
+
+    async def close(self) -> None:
+        lg.debug("closing framed connection to %s", self.url)
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+
+    async def request(
+        self,
+        body: bytes,
+        *,
+        model: t.Type[T] | None,
+        deadline: float | None = None,
+        hedge: bool = False,
+    ) -> T | None:
+        # `hedge` is ignored: every request shares the one connection, so a duplicate would
+        # queue behind the original rather than race it
+        loop = asyncio.get_running_loop()
+        deadline_at = None if deadline is None else loop.time() + deadline
+        await self.connect()
+        writer = self._writer
+        if writer is None:
+            raise APIException("Transport error", url=self.url, detail="connection closed")
+
+        cid = next(self._cids)
+        future: asyncio.Future[JSONObject] = loop.create_future()
+        self._pending[cid] = future
+        sent_at = time.perf_counter()
+        try:
+            writer.write(encode_request_frame(cid, body))
+            await writer.drain()
+            timeout = self._timeout
+            if deadline_at is not None:
+                timeout = min(timeout, max(deadline_at - loop.time(), 0.0))
+            frame = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError as e:
+            message = "Deadline exceeded" if deadline_at is not None else "Request timed out"
+            raise APIException(message, url=self.url, detail=f"{cid=}") from e
+        except (OSError, FrameError) as e:
+            raise APIException("Transport error", url=self.url, detail=str(e)) from e
+        finally:
+            self._pending.pop(cid, None)
+            sample = CURRENT_SAMPLE.get()
+            if sample is not None:
+                sample.network += time.perf_counter() - sent_at
+
+        status = frame.get("status")
+        response = frame.get("body")
+        if not isinstance(status, int) or isinstance(status, bool):
+            # a frame the peer got wrong must not pass for a command the robot accepted
+            raise APIException("Malformed response", url=self.url, detail=f"no status in {cid=}")
+        if not 200 <= status < 300:
+            raise APIException(
+                f"Unexpected status {status}", status_code=status, url=self.url, detail=response
+            )
+        if response is None or model is None:
+            return None
+        validate_at = time.perf_counter()
+        try:
+            return model.model_validate(response)
+        except ValidationError as ve:
+            raise APIException(
+                "Response validation failed", status_code=status, url=self.url, detail=ve.errors()
+            ) from ve
+        finally:
+            if sample is not None:
+                sample.validation += time.perf_counter() - validate_at
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        error: Exception | None = None
+        try:
+            while (frame := await read_frame(reader)) is not None:
+                future = self._pending.pop(t.cast(int, frame.get("cid")), None)
+                if future is not None and not future.done():
+                    future.set_result(frame)
+        except (OSError, FrameError, ValueError) as e:
+            error = e
+            lg.warning("framed connection to %s failed: %s", self.url, e)
+        finally:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                writer.close()
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(
+                        APIException(
+                            "Transport error",
+                            url=self.url,
+                            detail=str(error) if error else "connection closed",
+                        )
+                    )
+
+
+def make_transport(
+    *,
+    base_url: str,
+    get_token: TokenProvider | None = None,
+    timeout: float = 15.0,
+    pool: PoolConfig | None = None,
+    hedge: HedgeConfig | None = None,
+    circuit_breaker: CircuitBreakerConfig | None = None,
+    shared_pool: SharedPool | None = None,
+) -> CommandTransport:
+    """
+    Pick a transport from the URL scheme: `tcp://host:port` and `unix:///path/to.sock` (e.g. a
+    `proxy_daemon`) are framed, anything else HTTP.
+
+    `pool`, `hedge`, `circuit_breaker` and `shared_pool` only apply to HTTP.
+    """
+    parts = urlsplit(base_url)
+    if parts.scheme == "tcp":
+        if parts.hostname is None or parts.port is None:
+            raise ValueError(f"framed transport needs tcp://host:port, got {base_url=}")
+        return FramedCommandTransport(host=parts.hostname, port=parts.port, timeout=timeout)
+    if parts.scheme == "unix":
+        if not parts.path:
+            raise ValueError(f"framed transport needs unix:///path/to.sock, got {base_url=}")
+        return FramedCommandTransport(path=parts.path, timeout=timeout)
+    return HTTPCommandTransport(
+        base_url=base_url,
+        get_token=get_token,
+        timeout=timeout,
+        pool=pool,
+        hedge=hedge,
+        circuit_breaker=circuit_breaker,
+        shared_pool=shared_pool,
+    )
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import typing as t
+
+from arcana_go2.logger import make_logger
+
+if t.TYPE_CHECKING:
+    from arcana_go2.arcana_go2 import ArcanaGO2
+
+lg = make_logger(__name__)
+
+SetpointKind = t.Literal["move", "euler"]
+
+
+@dataclass
+class VelocityStreamStats:
+    submitted: int = 0  # setpoints handed to the stream
+    sent: int = 0  # setpoints sent and acknowledged
+    suppressed: int = 0  # setpoints the client's shaping judged unchanged and never sent
+    coalesced: int = 0  # setpoints overwritten by a newer one before being sent
+    dropped: int = 0  # setpoints still pending when the stream closed
+    failed: int = 0  # sends that raised
+
+
+class VelocityStream:
+    """
+    Latest-wins streaming of `move` / `euler` setpoints at a fixed cadence.
+
+    Setpoints may be submitted at any rate. Only the newest setpoint of each kind is kept, and
+    at most one request is in flight at a time; on every tick the oldest pending kind is sent if
+    the previous request has completed. The pending set therefore never holds more than one
+    setpoint per kind, no matter how fast the producer runs.
+    """
+
+    def __init__(
+        self,
+        go2: ArcanaGO2,
+        *,
+        id: int,
+        rate_hz: float = 50.0,
+        priority: t.Literal[0, 1] = 1,
+        deadline: float | None = None,
+    ) -> None:
+        if rate_hz <= 0:
+            raise ValueError(f"rate_hz must be positive, got {rate_hz=}")
+        self._go2 = go2
+        self._id = id
+        self._period = 1.0 / rate_hz
+        self._priority: t.Literal[0, 1] = priority
+        self._deadline = deadline
+        self._pending: dict[SetpointKind, tuple[float, float, float]] = {}
+        self._in_flight: asyncio.Task[None] | None = None
+        self._runner: asyncio.Task[None] | None = None
+        self.stats = VelocityStreamStats()
+
+    async def __aenter__(self) -> VelocityStream:
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None and not self._runner.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        lg.debug("starting velocity stream at %.1f Hz", 1.0 / self._period)
+        self._runner = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        if self._in_flight is not None:
+            await asyncio.gather(self._in_flight, return_exceptions=True)
+            self._in_flight = None
+        self.stats.dropped += len(self._pending)
+        self._pending.clear()
+        lg.debug("closed velocity stream with stats=%r", self.stats)
+
+    def move(self, *, x: float, y: float, z: float) -> None:
+        self._submit("move", (x, y, z))
+
+    def euler(self, *, x: float, y: float, z: float) -> None:
+        self._submit("euler", (x, y, z))
+
+    def _submit(self, kind: SetpointKind, setpoint: tuple[float, float, float]) -> None:
+        self.stats.submitted += 1
+        if self._pending.pop(kind, None) is not None:
+            self.stats.coalesced += 1
+        self._pending[kind] = setpoint
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self._period
+            now = loop.time()
+            if next_tick < now:
+                # we fell behind (e.g. a stalled loop); skip missed ticks rather than bursting
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
+            if not self._pending:
+                continue
+            if self._in_flight is not None and not self._in_flight.done():
+                continue
+            kind = next(iter(self._pending))
+            self._in_flight = loop.create_task(self._send(kind, self._pending.pop(kind)))
+
+    async def _send(self, kind: SetpointKind, setpoint: tuple[float, float, float]) -> None:
+        x, y, z = setpoint
+        command = self._go2.move if kind == "move" else self._go2.euler
+        try:
+            # the ack is all the stream needs, so skip parsing the response
+            ack = await command(
+                id=self._id,
+                x=x,
+                y=y,
+                z=z,
+                priority=self._priority,
+                deadline=self._deadline,
+                response_policy="light",
+            )
+            # with shaping, a setpoint too close to the last one sent comes back as None
+            if ack is None:
+                self.stats.suppressed += 1
+            else:
+                self.stats.sent += 1
+        except Exception as e:
+            self.stats.failed += 1
+            lg.warning("velocity stream failed to send %s setpoint=%r: %s", kind, setpoint, e)
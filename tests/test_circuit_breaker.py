@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_consecutive_failures_and_recovers() -> None:
+    clock = Clock()
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(failure_threshold=3, reset_timeout=1.0), clock=clock
+    )
+    transitions: list[tuple[str, str]] = []
+    breaker.add_listener(lambda old, new: transitions.append((old, new)))
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # resets the count
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_in == pytest.approx(1.0)
+
+    clock.now = 1.0
+    assert breaker.allow()  # the half-open trial
+    assert not breaker.allow()  # only one at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 2.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert transitions == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+    ]
+
+
+def test_a_silent_trial_stops_blocking_after_the_reset_timeout() -> None:
+    clock = Clock()
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(failure_threshold=1, reset_timeout=1.0), clock=clock
+    )
+    breaker.record_failure()
+    clock.now = 1.0
+    assert breaker.allow()  # never reports back, e.g. cancelled
+    clock.now = 1.5
+    assert not breaker.allow()
+    clock.now = 2.0
+    assert breaker.allow()
+
+
+def test_client_fails_fast_while_open() -> None:
+    async def main() -> None:
+        config = CircuitBreakerConfig(failure_threshold=1, reset_timeout=10.0, probe=False)
+        async with ArcanaGO2(
+            base_url="http://127.0.0.1:1", timeout=0.5, circuit_breaker=config
+        ) as go2:
+            with pytest.raises(APIException):
+                await go2.sit(id=1)
+            assert go2.circuit_state == "open"
+            start = time.perf_counter()
+            with pytest.raises(CircuitOpenError):
+                await go2.sit(id=1)
+            assert time.perf_counter() - start < 0.1  # never tried to connect
+
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from arcana_go2 import cli
+from arcana_go2.bench.startup import run_startup
+
+# generous, so a loaded CI machine does not flake; the benchmark enforces the real budget
+BUDGET = 2.0
+
+
+def _cli() -> list[str]:
+    script = shutil.which("arcana-go2")
+    return [script] if script else [sys.executable, "-m", "arcana_go2.cli"]
+
+
+def test_help_imports_only_the_standard_library() -> None:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [*_cli(), "--help"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPROFILEIMPORTTIME": "1"},
+        timeout=30,
+    )
+    elapsed = time.perf_counter() - start
+
+    assert result.returncode == 0, result.stderr
+    assert "arcana-go2" in result.stdout
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+    assert not imported & {"httpx", "pydantic", "numpy"}
+    assert elapsed < BUDGET
+
+
+def test_stop_fast_path_skips_heavy_imports() -> None:
+    fast, _, heavy = asyncio.run(run_startup("damp", runs=1))
+
+    assert heavy == []
+    assert max(fast) < BUDGET
+
+
+def test_stop_fails_cleanly_on_a_peer_that_is_not_http(capsys: pytest.CaptureFixture[str]) -> None:
+    async def garbage(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.read(1024)
+        writer.write(b"SSH-2.0-OpenSSH_9.6\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    async def main() -> list[int]:
+        server = await asyncio.start_server(garbage, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [
+                await asyncio.to_thread(cli.main, ["--url", url, "damp"])
+                for url in (f"http://127.0.0.1:{port}", "http://127.0.0.1:99999")
+            ]
+
+    assert asyncio.run(main()) == [1, 1]
+    errors = capsys.readouterr().err.splitlines()
+    assert len(errors) == 2
+    assert errors[0].startswith("error: damp: bad response from")
+    assert errors[1].startswith("error: damp: bad URL")
@@ -0,0 +1,101 @@
+import asyncio
+import enum
+import inspect
+import math
+import typing as t
+
+import pytest
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.bench.encoding import legacy_encode
+from arcana_go2.command_encoding import CommandEncoder, json_backend, orjson
+
+BACKENDS = ["json"] + (["orjson"] if orjson is not None else [])
+SPORT = "rt/api/sport/request"
+
+
+class Level(enum.IntEnum):
+    FAST = 2
+
+
+def _sent_commands() -> list[dict[str, t.Any]]:
+    """What every ArcanaGO2 command hands to `send_command`, with representative args."""
+    values = {"id": 7, "x": 0.35, "y": -0.1, "z": 0.0, "data": 2, "flag": True, "enable": False}
+    sent: list[dict[str, t.Any]] = []
+
+    async def main() -> None:
+        async with ArcanaGO2(base_url="http://127.0.0.1:1") as go2:
+
+            async def record(**kwargs: t.Any) -> None:
+                sent.append(kwargs)
+
+            go2._base.send_command = record  # type: ignore[method-assign]
+            for name, method in inspect.getmembers(ArcanaGO2, inspect.iscoroutinefunction):
+                if name.startswith("_") or name in ("close", "warmup"):
+                    continue
+                parameters = inspect.signature(method).parameters
+                for priority in (0, 1):
+                    args = {key: values[key] for key in parameters if key in values}
+                    await getattr(go2, name)(**args, priority=priority)
+
+    asyncio.run(main())
+    return sent
+
+
+COMMANDS = _sent_commands()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_every_command_encodes_as_before(backend: str) -> None:
+    encoder = CommandEncoder(dumps=json_backend(backend))  # type: ignore[arg-type]
+    assert len(COMMANDS) == 2 * 22
+    for command in COMMANDS:
+        args = (
+            command["requester_id"],
+            command["topic"],
+            command["api_id"],
+            command["command_args"],
+            int(command["priority"]),
+        )
+        assert encoder.encode(*args) == legacy_encode(*args), command
+        assert encoder.encode(*args) == legacy_encode(*args)  # cached bodies too
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize(
+    "command_args",
+    [
+        None,
+        {"x": 1, "y": -2, "z": 0},
+        {"x": 1e-7, "y": 1e16, "z": -0.0},
+        {"x": math.nan, "y": math.inf, "z": -math.inf},
+        {"x": True, "y": 0.0, "z": 0.0},
+        {"z": 0.1, "y": 0.2, "x": 0.3},
+        {"x": 0.1, "y": 0.2, "w": 0.3},
+        {"x": Level.FAST, "y": 0.5, "z": 0.5},
+        {"data": 1},
+        {"data": Level.FAST},
+        {"data": 2**70},
+        {"data": 0.25},
+        {"flag": True},
+        {"enable": False},
+        {"name": "café ☕ 机器人"},
+        {"name": 'quote " and \\ backslash', "note": None},
+        {"nested": {"list": [1, 2.5, "ü"], "ok": True}},
+    ],
+)
+def test_args_of_any_shape_encode_as_before(
+    backend: str, command_args: dict[str, t.Any] | None
+) -> None:
+    encoder = CommandEncoder(dumps=json_backend(backend))  # type: ignore[arg-type]
+    for topic in (SPORT, "rt/api/ñ/100%"):
+        args = (7, topic, 1008, command_args, 1)
+        assert encoder.encode(*args) == legacy_encode(*args)
+
+
+def test_numpy_scalars_encode_as_floats() -> None:
+    np = pytest.importorskip("numpy")
+    args = (7, SPORT, 1008, {"x": np.float64(0.5), "y": np.float64(-1.0), "z": 0.0}, 1)
+    for backend in BACKENDS:
+        encoder = CommandEncoder(dumps=json_backend(backend))  # type: ignore[arg-type]
+        assert encoder.encode(*args) == legacy_encode(*args)
@@ -0,0 +1,46 @@
+import asyncio
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+from arcana_go2.fire_and_forget import FireAndForget
+
+
+async def send(log: list[str], name: str, fail: bool = False) -> None:
+    await asyncio.sleep(0.01)
+    if fail:
+        raise RuntimeError(name)
+    log.append(name)
+
+
+def test_waiting_sends_coalesce_per_key() -> None:
+    async def main() -> None:
+        log: list[str] = []
+        errors: list[Exception] = []
+        sends = FireAndForget(errors.append, max_in_flight=2)
+        sends.spawn(send(log, "move-1"), key="move")
+        sends.spawn(send(log, "euler-1", fail=True), key="euler")
+        for i in range(2, 10):
+            sends.spawn(send(log, f"move-{i}"), key="move")
+        sends.spawn(send(log, "sit"), key="sit")
+        assert sends.outstanding == 4
+        await sends.drain()
+        assert log == ["move-1", "move-9", "sit"]
+        assert [str(error) for error in errors] == ["euler-1"]
+        stats = sends.stats
+        assert (stats.sent, stats.acked, stats.failed, stats.dropped) == (4, 3, 1, 7)
+
+    asyncio.run(main())
+
+
+def test_fire_and_forget_against_a_slow_robot_stays_bounded() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.05)) as mock:
+            async with ArcanaGO2(base_url=mock.url, max_unacked=2) as go2:
+                for i in range(50):  # 50 Hz for a second's worth of setpoints, at once
+                    await go2.move(id=1, x=i / 100, y=0, z=0, response_policy="fire_and_forget")
+                assert go2._fire_and_forget.outstanding == 3
+            stats = go2.fire_and_forget_stats
+            assert stats.sent == mock.stats.commands == 3
+            assert stats.dropped == 47 and stats.acked == 3
+
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from arcana_go2.bench.mock_server import MockGo2Server
+from arcana_go2.fleet import ArcanaGO2Fleet
+
+
+def test_robots_share_one_connection_pool() -> None:
+    async def main() -> None:
+        async with MockGo2Server() as first, MockGo2Server() as second:
+            robots = {f"go2-{i}": (first if i % 2 else second).url for i in range(20)}
+            async with ArcanaGO2Fleet(robots, max_in_flight=8) as fleet:
+                for _ in range(5):
+                    results = await fleet.broadcast("sit", id=1)
+                    assert all(result.ok for result in results.values())
+            assert first.stats.connections + second.stats.connections <= 8
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("command", ["close", "warmup", "_send", "no_such_command"])
+def test_only_commands_can_be_broadcast(command: str) -> None:
+    async def main() -> None:
+        async with ArcanaGO2Fleet({"go2": "http://127.0.0.1:1"}) as fleet:
+            with pytest.raises(ValueError, match="not an ArcanaGO2 command"):
+                await fleet.broadcast(command)
+
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+import asyncio
+import struct
+
+import pytest
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.arcana_go2_base import CommandResponse
+from arcana_go2.framed_server import FramedCommandServer
+from arcana_go2.framing import encode_frame, read_frame
+from arcana_go2.json_utils import JSONObject, JSONValue
+
+
+def test_pipelined_commands_are_matched_out_of_order() -> None:
+    async def slow_sit(body: JSONObject) -> tuple[int, JSONValue]:
+        await asyncio.sleep(0.05 if body["api_id"] == 1009 else 0.0)
+        return 200, body
+
+    async def main() -> None:
+        async with FramedCommandServer(handler=slow_sit) as server:
+            async with ArcanaGO2(base_url=server.url) as go2:
+                sit = asyncio.ensure_future(go2.sit(id=1))
+                await asyncio.sleep(0.01)
+                move = await go2.move(id=2, x=0.5, y=0, z=0)  # answered while sit waits
+                assert not sit.done()
+                assert isinstance(move, CommandResponse) and (move.id, move.api_id) == (2, 1008)
+                response = await sit
+                assert isinstance(response, CommandResponse) and response.api_id == 1009
+
+    asyncio.run(main())
+
+
+def test_error_statuses_raise() -> None:
+    async def busy(body: JSONObject) -> tuple[int, JSONValue]:
+        if body["api_id"] == 1016:
+            raise RuntimeError("handler broke")
+        return 503, {"detail": "busy"}
+
+    async def main() -> None:
+        async with FramedCommandServer(handler=busy) as server:
+            async with ArcanaGO2(base_url=server.url) as go2:
+                with pytest.raises(APIException) as error:
+                    await go2.sit(id=1)
+                assert error.value.status_code == 503
+                with pytest.raises(APIException) as error:
+                    await go2.hello(id=1)
+                assert error.value.status_code == 500
+
+    asyncio.run(main())
+
+
+async def _serve_raw(answer: object) -> tuple[asyncio.Server, str]:
+    """A peer that answers every request frame with `answer` plus the request's cid."""
+
+    async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while (frame := await read_frame(reader)) is not None:
+            if answer is None:
+                writer.write(struct.pack(">I", 64) + b"{")  # cut off mid-frame
+                writer.close()
+                return
+            writer.write(encode_frame({"cid": frame["cid"], **answer}))  # type: ignore[dict-item]
+
+    server = await asyncio.start_server(on_connect, "127.0.0.1", 0)
+    return server, f"tcp://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+@pytest.mark.parametrize(
+    "answer", [{"body": {"code": 0}}, {"status": "200", "body": {}}, {"status": True}]
+)
+def test_a_frame_without_a_status_is_not_a_success(answer: JSONObject) -> None:
+    async def main() -> None:
+        server, url = await _serve_raw(answer)
+        async with server, ArcanaGO2(base_url=url) as go2:
+            with pytest.raises(APIException, match="Malformed response"):
+                await go2.sit(id=1)
+
+    asyncio.run(main())
+
+
+def test_in_flight_requests_fail_when_the_connection_drops_and_it_reconnects() -> None:
+    async def main() -> None:
+        server, url = await _serve_raw(None)
+        async with server, ArcanaGO2(base_url=url) as go2:
+            for _ in range(2):
+                with pytest.raises(APIException):
+                    await go2.sit(id=1)
+
+    asyncio.run(main())
+
+
+def test_deadline_bounds_a_framed_request() -> None:
+    async def never(body: JSONObject) -> tuple[int, JSONValue]:
+        await asyncio.sleep(0.3)
+        return 200, body
+
+    async def main() -> None:
+        async with FramedCommandServer(handler=never) as server:
+            async with ArcanaGO2(base_url=server.url) as go2:
+                with pytest.raises(APIException, match="Deadline exceeded"):
+                    await go2.sit(id=1, deadline=0.05)
+
+    asyncio.run(main())
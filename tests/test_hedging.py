@@ -0,0 +1,68 @@
+import asyncio
+import time
+import typing as t
+
+import httpx
+
+from arcana_go2.http_client import HedgeConfig, HTTPClient
+
+
+class Robot:
+    """Stands in for the client's transport: every `slow_every`th request takes `slow` s."""
+
+    def __init__(self, slow: float, slow_every: int = 1) -> None:
+        self.slow = slow
+        self.slow_every = slow_every
+        self.requests = 0
+        self.cancelled = 0
+
+    async def request(self, method: str, url: str, **kwargs: t.Any) -> httpx.Response:
+        self.requests += 1
+        try:
+            if self.requests % self.slow_every == 1 or self.slow_every == 1:
+                await asyncio.sleep(self.slow)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return httpx.Response(200, json={"ok": True}, request=httpx.Request(method, url))
+
+
+def test_a_slow_request_is_overtaken_by_its_hedge() -> None:
+    async def main() -> None:
+        robot = Robot(slow=1.0, slow_every=2)  # the first of each pair hangs
+        async with HTTPClient(base_url="http://robot", hedge=HedgeConfig(initial_delay=0.02)) as c:
+            c._client.request = robot.request  # type: ignore[method-assign]
+            start = time.perf_counter()
+            await c.post("/api", model=None, hedge=True)
+            assert time.perf_counter() - start < 0.2
+            await asyncio.sleep(0)
+            assert robot.requests == 2 and robot.cancelled == 1
+            stats = c.hedge_stats
+            assert stats is not None and (stats.hedged, stats.hedge_won) == (1, 1)
+
+            # requests not marked as hedgeable wait for the slow response
+            robot.slow, robot.slow_every = 0.05, 1
+            await c.post("/api", model=None)
+            assert robot.requests == 3 and stats.hedged == 1
+
+    asyncio.run(main())
+
+
+def test_the_token_bucket_limits_extra_requests() -> None:
+    async def main() -> None:
+        robot = Robot(slow=0.03)  # every request is slower than the hedge delay
+        config = HedgeConfig(
+            initial_delay=0.005, min_samples=1000, budget_ratio=0.25, budget_burst=2.0
+        )
+        async with HTTPClient(base_url="http://robot", hedge=config) as c:
+            c._client.request = robot.request  # type: ignore[method-assign]
+            for _ in range(30):
+                await c.post("/api", model=None, hedge=True)
+            stats = c.hedge_stats
+            assert stats is not None
+            # the burst, then one hedge per four requests as the budget refills
+            assert stats.requests == 30 and stats.hedged == 2 + 7
+            assert stats.rate_limited == 30 - stats.hedged
+            assert robot.requests == 30 + stats.hedged
+
+    asyncio.run(main())
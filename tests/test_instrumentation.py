@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+from arcana_go2.instrumentation import (
+    PHASES,
+    CommandSample,
+    Instrumentation,
+    LatencyHistogram,
+)
+
+_SPORT_TOPIC = "rt/api/sport/request"
+
+
+def test_percentiles_are_within_one_bucket_above_the_true_value() -> None:
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    for q, exact in ((0.5, 0.5), (0.9, 0.9), (0.99, 0.99)):
+        assert exact <= histogram.percentile(q) <= exact * LatencyHistogram.GROWTH
+    assert histogram.percentile(1.0) == histogram.max == 1.0
+    assert histogram.count == 1000
+    assert histogram.sum == pytest.approx(500.5)
+
+
+def test_percentiles_never_exceed_the_largest_sample() -> None:
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) == 0.0  # empty
+    histogram.record(0.0)
+    histogram.record(0.0123)
+    assert histogram.percentile(0.5) == LatencyHistogram.MIN_SECONDS
+    assert histogram.percentile(0.99) == 0.0123
+    histogram.record(3600.0)  # past the last bucket, which absorbs it
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(1.0) == 3600.0
+
+
+def test_samples_are_aggregated_per_command_and_handed_to_hooks() -> None:
+    instrumentation = Instrumentation()
+    seen: list[CommandSample] = []
+
+    def broken(sample: CommandSample) -> None:
+        raise RuntimeError("exporter down")
+
+    instrumentation.add_hook(broken)  # must not keep the next hook from running
+    instrumentation.add_hook(seen.append)
+    for i in range(10):
+        sample = CommandSample(_SPORT_TOPIC, 1009, queue_wait=0.001)
+        sample.network = 0.01 * (i + 1)
+        sample.total = sample.network + 0.001
+        sample.retries = i % 2
+        sample.error = "APIException" if i == 9 else None
+        instrumentation.record(sample)
+    instrumentation.record(CommandSample(_SPORT_TOPIC, 1008))
+
+    snapshot = instrumentation.snapshot()
+    assert len(seen) == 11
+    sit = snapshot[(_SPORT_TOPIC, 1009)]
+    assert (sit.count, sit.errors, sit.retries) == (10, 1, 5)
+    assert set(sit.phases) == set(PHASES)
+    network = sit.phases["network"]
+    assert network.mean == pytest.approx(0.055)
+    assert network.max == pytest.approx(0.1)
+    assert 0.05 <= network.p50 <= 0.05 * LatencyHistogram.GROWTH
+    assert snapshot[(_SPORT_TOPIC, 1008)].count == 1
+
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {}
+
+
+def test_client_stats_reflect_what_was_sent() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.02)) as mock:
+            async with ArcanaGO2(base_url=mock.url) as go2:
+                for _ in range(5):
+                    await go2.sit(id=1)
+                await go2.standup(id=1)
+                stats = go2.stats()
+            async with MockGo2Server(MockConfig(error_rate=1.0)) as failing:
+                async with ArcanaGO2(base_url=failing.url) as go2:
+                    with pytest.raises(APIException):
+                        await go2.sit(id=1)
+                    failed = go2.stats()[(_SPORT_TOPIC, 1009)]
+
+        sit = stats[(_SPORT_TOPIC, 1009)]
+        assert sit.count == 5 and sit.errors == 0 and sit.retries == 0
+        assert stats[(_SPORT_TOPIC, 1004)].count == 1
+        network, total = sit.phases["network"], sit.phases["total"]
+        assert network.p50 >= 0.02  # the mock's latency
+        assert total.mean >= network.mean
+        assert total.max >= network.max
+        assert (failed.count, failed.errors, failed.retries) == (1, 1, 2)  # 3 attempts
+
+    asyncio.run(main())
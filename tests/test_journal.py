@@ -0,0 +1,113 @@
+import asyncio
+import math
+from pathlib import Path
+
+import pytest
+
+from arcana_go2.journal import STATUS_OK, CommandJournal, JournalReader, iter_records
+
+SPORT = "rt/api/sport/request"
+
+
+def _record(journal: CommandJournal, **overrides: object) -> None:
+    fields: dict[str, object] = {
+        "sent_at": 1.0,
+        "requester_id": 7,
+        "topic": SPORT,
+        "api_id": 1008,
+        "priority": 1,
+        "command_args": {"x": 0.5, "y": 0.0, "z": -0.25},
+        "status": STATUS_OK,
+        "rtt": 0.01,
+    }
+    fields.update(overrides)
+    journal.record(**fields)  # type: ignore[arg-type]
+
+
+def test_records_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "commands.bin"
+
+    async def main() -> CommandJournal:
+        journal = CommandJournal(path, flush_interval=0.01)
+        _record(journal)
+        _record(journal, api_id=1015, command_args={"data": 2}, status=500, priority=0)
+        _record(journal, api_id=1009, command_args=None)
+        await journal.close()
+        return journal
+
+    journal = asyncio.run(main())
+
+    records = list(iter_records(path))
+    assert journal.written == 3 and journal.dropped == 0
+    assert [r.api_id for r in records] == [1008, 1015, 1009]
+    assert records[0].command_args == {"x": 0.5, "y": 0.0, "z": -0.25}
+    assert records[1].command_args == {"data": 2} and records[1].status == 500
+    assert records[2].command_args is None
+    assert all(r.replayable and r.requester_id == 7 for r in records)
+
+
+def test_unpackable_records_are_dropped_not_raised(tmp_path: Path) -> None:
+    async def main() -> CommandJournal:
+        journal = CommandJournal(tmp_path / "commands.bin")
+        _record(journal, requester_id=2**40)
+        _record(journal, api_id=1015, command_args={"data": "fast"})
+        _record(journal, api_id=1015, command_args={"data": None})
+        _record(journal)
+        await journal.close()
+        return journal
+
+    journal = asyncio.run(main())
+
+    assert journal.dropped == 3
+    assert journal.written == 1
+
+
+def test_records_after_close_are_counted(tmp_path: Path) -> None:
+    async def main() -> CommandJournal:
+        journal = CommandJournal(tmp_path / "commands.bin")
+        await journal.close()
+        _record(journal)
+        return journal
+
+    journal = asyncio.run(main())
+
+    assert journal.dropped == 1
+    assert list(iter_records(tmp_path / "commands.bin")) == []
+
+
+def test_unknown_arg_layouts_are_kept_but_not_replayable(tmp_path: Path) -> None:
+    async def main() -> None:
+        journal = CommandJournal(tmp_path / "commands.bin")
+        _record(journal, command_args={"a": 1, "b": 2})
+        await journal.close()
+
+    asyncio.run(main())
+
+    (record,) = iter_records(tmp_path / "commands.bin")
+    assert record.command_args is None
+    assert not record.replayable
+    assert not math.isnan(record.rtt)
+
+
+def test_reader_filters_and_summarizes(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    path = tmp_path / "commands.bin"
+
+    async def main() -> None:
+        journal = CommandJournal(path, flush_interval=0.01)
+        for i in range(100):
+            _record(journal, sent_at=float(i), rtt=(i + 1) / 1000)
+        _record(journal, api_id=1009, command_args=None, status=503, requester_id=3)
+        await journal.close()
+
+    asyncio.run(main())
+
+    reader = JournalReader(path)
+    assert len(reader) == 101
+    assert len(reader.select(api_id=1008)) == 100
+    assert reader.select(errors_only=True)["requester_id"].tolist() == [3]
+    summary = reader.summary()
+    move = summary[(SPORT, 1008)]
+    assert move["count"] == 100 and move["errors"] == 0
+    assert move["p50"] == pytest.approx(0.0505) and move["max"] == pytest.approx(0.1)
+    assert summary[(SPORT, 1009)]["errors"] == 1
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from pathlib import Path
+import typing as t
+
+import pytest
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+from arcana_go2.motion_script import MotionScript, MotionScriptPlayer, ScriptError, ScriptStep
+
+
+def _write(tmp_path: Path, name: str, content: str) -> MotionScript:
+    path = tmp_path / name
+    path.write_text(content)
+    return MotionScript(path, requester_id=1)
+
+
+def test_valid_scripts_in_every_format(tmp_path: Path) -> None:
+    steps = [
+        {"at": 0.0, "command": "standup"},
+        {"at": 0.5, "command": "move", "args": {"x": 0.2, "y": 0.0, "z": 0.0}},
+        {"at": 1.5, "command": "speedlevel", "args": {"data": 1}},
+    ]
+    scripts = [
+        _write(tmp_path, "a.json", json.dumps(steps)),
+        _write(tmp_path, "a.jsonl", "\n".join(json.dumps(step) for step in steps) + "\n\n"),
+        _write(
+            tmp_path,
+            "a.csv",
+            'at,command,args\n0,standup,\n0.5,move,"{""x"": 0.2, ""y"": 0, ""z"": 0}"\n'
+            '1.5,speedlevel,"{""data"": 1}"\n',
+        ),
+    ]
+    for script in scripts:
+        summary = script.validate()
+        assert (summary.steps, summary.duration) == (3, 1.5)
+        assert [step.args["id"] for step in script] == [1, 1, 1]
+
+
+@pytest.mark.parametrize(
+    "content, problem",
+    [
+        ("[1]", "a step must be an object"),
+        ('[{"at": null, "command": "sit"}]', "at must be a number"),
+        ('[{"at": "0", "command": "sit"}]', "at must be a number"),
+        ('[{"at": 0, "command": 3}]', "command must be a string"),
+        ('[{"at": 0, "command": "sit", "args": [1]}]', "args must be an object"),
+        ('{"at": 0}', "a step must be an object"),
+        ('[{"at": 0, "command": "fly"}]', "is not an ArcanaGO2 command"),
+        ('[{"at": 0, "command": "warmup"}]', "is not an ArcanaGO2 command"),
+        ('[{"at": 0, "command": "sit", "args": {"speed": 1}}]', "unexpected keyword"),
+        ('[{"at": 0, "command": "move", "args": {"x": 0}}]', "missing a required argument"),
+        ('[{"at": 1, "command": "sit"}, {"at": 0.5, "command": "sit"}]', "before the previous"),
+        ('[{"at": -1, "command": "sit"}]', "must be finite and >= 0"),
+        ('[{"at": 0, "command": "move", "args": {"x": [0], "y": 0, "z": 0}}]', "finite scalar"),
+        ('[{"at": 0, "command": "move", "args": {"x": "fast", "y": 0, "z": 0}}]', "must be float"),
+        ('[{"at": 0, "command": "sit", "args": {"priority": 5}}]', "must be 0 or 1"),
+        ('[{"at": 0, "command": "sit", "args": {"priority": true}}]', "must be 0 or 1"),
+        ('[{"at": 0, "command": "pose", "args": {"flag": 1}}]', "must be bool"),
+        ('[{"at": 0, "command": "speedlevel", "args": {"data": 1.5}}]', "must be int"),
+        ('[{"at": 0, "command": "sit", "args": {"deadline": "soon"}}]', "must be float or null"),
+    ],
+)
+def test_invalid_steps_raise_script_error(tmp_path: Path, content: str, problem: str) -> None:
+    script = _write(tmp_path, "bad.json", content)
+
+    with pytest.raises(ScriptError) as error:
+        script.validate()
+    assert any(problem in line for line in error.value.problems), error.value.problems
+
+
+def test_every_problem_is_listed(tmp_path: Path) -> None:
+    lines = [
+        '{"at": 0, "command": "fly"}',
+        '{"at": 0, "command": "sit", "args": {"nope": 1}}',
+        '{"at": 1, "command": "hello"}',
+    ]
+    script = _write(tmp_path, "bad.jsonl", "\n".join(lines))
+
+    with pytest.raises(ScriptError) as error:
+        script.validate()
+    assert [problem.split(":")[0] for problem in error.value.problems] == [
+        "step 1 (line 1)",
+        "step 2 (line 2)",
+    ]
+
+
+def test_hand_built_steps_of_the_wrong_type() -> None:
+    script = MotionScript([ScriptStep(None, "sit", {"id": 1})])  # type: ignore[arg-type]
+
+    with pytest.raises(ScriptError):
+        script.validate()
+
+
+def test_steps_sharing_an_offset_are_sent_in_order() -> None:
+    async def main() -> list[int]:
+        sent: list[int] = []
+        async with MockGo2Server(MockConfig(latency=0.01, jitter=0.03, seed=3)) as mock:
+            async with ArcanaGO2(base_url=mock.url) as go2:
+                send_command = go2._base.send_command
+
+                async def recording(**kwargs: t.Any) -> t.Any:
+                    sent.append(kwargs["api_id"])
+                    return await send_command(**kwargs)
+
+                go2._base.send_command = recording  # type: ignore[method-assign]
+                steps = [
+                    ScriptStep(0.0, "standup", {"id": 1}),
+                    ScriptStep(0.0, "hello", {"id": 1}),
+                    ScriptStep(0.0, "stretch", {"id": 1}),
+                    ScriptStep(0.0, "sit", {"id": 1}),
+                ]
+                report = await MotionScriptPlayer(go2).play(MotionScript(steps))
+                assert report.errors == 0
+        return sent
+
+    assert asyncio.run(main()) == [1004, 1016, 1017, 1009]
+
+
+def test_a_player_is_reusable_after_playback_is_cut_short() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.01)) as mock:
+            async with ArcanaGO2(base_url=mock.url) as go2:
+                player = MotionScriptPlayer(go2, max_in_flight=2)
+                steps = [ScriptStep(0.01 * i, "hello", {"id": 1}) for i in range(10)]
+                for _ in range(3):  # a consumer that stops early, with steps in flight
+                    async for _report in player.play_iter(MotionScript(steps)):
+                        break
+                failing = [ScriptStep(0.0, "sit", {"id": 1}), *steps]
+                go2._base.send_command = None  # type: ignore[assignment]
+                stopping = MotionScriptPlayer(go2, max_in_flight=2, stop_on_error=True)
+                for _ in range(3):
+                    reports = [report async for report in stopping.play_iter(MotionScript(failing))]
+                    assert not reports[-1].ok
+                del go2._base.send_command
+                report = await asyncio.wait_for(player.play(MotionScript(steps)), 2)
+                assert (report.steps, report.errors) == (10, 0)
+                report = await asyncio.wait_for(stopping.play(MotionScript(steps)), 2)
+                assert (report.steps, report.errors) == (10, 0)
+
+    asyncio.run(main())
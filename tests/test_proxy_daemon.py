@@ -0,0 +1,160 @@
+import asyncio
+import os
+from pathlib import Path
+import stat
+
+import pytest
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.arcana_go2_base import ArcanaGO2Base, CommandResponse
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+from arcana_go2.framed_server import FramedCommandServer
+from arcana_go2.json_utils import JSONObject, JSONValue
+from arcana_go2.proxy_daemon import ProxyConfig, ProxyDaemon
+from arcana_go2.scheduler import SchedulerConfig
+
+
+def test_motion_is_leased_to_one_requester(tmp_path: Path) -> None:
+    async def main() -> None:
+        async with MockGo2Server() as mock, ArcanaGO2Base(base_url=mock.url) as base:
+            path = str(tmp_path / "proxy.sock")
+            async with ProxyDaemon(base, path=path, config=ProxyConfig(lease=5.0)) as daemon:
+                async with ArcanaGO2(base_url=daemon.url) as a, ArcanaGO2(base_url=daemon.url) as b:
+                    await a.move(id=1, x=0.2, y=0.0, z=0.0, priority=0)
+                    assert daemon.motion_holder == 1
+
+                    with pytest.raises(APIException) as rejected:
+                        await b.move(id=2, x=0.1, y=0.0, z=0.0, priority=0)
+                    assert rejected.value.status_code == 409
+                    await b.sit(id=2)  # only motion is arbitrated
+
+                    # a higher priority takes motion over, and so does anyone's stop
+                    await b.move(id=2, x=0.1, y=0.0, z=0.0, priority=1)
+                    assert daemon.motion_holder == 2
+                    await a.stopmove(id=1)
+                    assert daemon.motion_holder is None
+                    await a.move(id=1, x=0.3, y=0.0, z=0.0)
+                    assert daemon.stats.rejected == 1
+
+    asyncio.run(main())
+
+
+def test_concurrent_setpoints_are_coalesced(tmp_path: Path) -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.01)) as mock:
+            async with ArcanaGO2Base(base_url=mock.url) as base:
+                path = str(tmp_path / "proxy.sock")
+                async with ProxyDaemon(base, path=path) as daemon:
+                    async with ArcanaGO2(base_url=daemon.url) as go2:
+                        await asyncio.gather(
+                            *(go2.move(id=1, x=i / 100, y=0.0, z=0.0) for i in range(30))
+                        )
+                    assert mock.stats.commands < 30
+                    assert daemon.stats.coalesced == 30 - daemon.stats.forwarded
+                    assert mock._velocity["x"] == pytest.approx(0.29)
+
+    asyncio.run(main())
+
+
+def test_stop_withdraws_queued_motion(tmp_path: Path) -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.1)) as mock:
+            async with ArcanaGO2Base(base_url=mock.url) as base:
+                config = ProxyConfig(scheduler=SchedulerConfig(max_in_flight=1))
+                path = str(tmp_path / "proxy.sock")
+                async with ProxyDaemon(base, path=path, config=config) as daemon:
+                    async with ArcanaGO2(base_url=daemon.url) as go2:
+                        sit = asyncio.ensure_future(go2.sit(id=1))  # holds the only worker
+                        await asyncio.sleep(0.02)
+                        move = asyncio.ensure_future(go2.move(id=1, x=0.5, y=0.0, z=0.0))
+                        await asyncio.sleep(0.02)
+                        await go2.stopmove(id=2)
+                        await sit
+                        with pytest.raises(APIException) as withdrawn:
+                            await move
+                        assert withdrawn.value.status_code == 409
+                        await asyncio.sleep(0.15)
+
+                assert mock.stats.commands == 2  # the sit and the stop, never the move
+                assert mock._velocity == {"x": 0.0, "y": 0.0, "z": 0.0}
+
+    asyncio.run(main())
+
+
+def test_second_daemon_on_a_live_socket_is_refused(tmp_path: Path) -> None:
+    async def main() -> None:
+        async with MockGo2Server() as mock, ArcanaGO2Base(base_url=mock.url) as base:
+            path = str(tmp_path / "proxy.sock")
+            async with ProxyDaemon(base, path=path):
+                with pytest.raises(OSError):
+                    await ProxyDaemon(base, path=path).start()
+            async with ProxyDaemon(base, path=path) as daemon:  # the first one is gone
+                async with ArcanaGO2(base_url=daemon.url) as go2:
+                    await go2.sit(id=1)
+
+    asyncio.run(main())
+
+
+def test_setpoint_overtaken_by_another_requester_is_refused(tmp_path: Path) -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.1)) as mock:
+            async with ArcanaGO2Base(base_url=mock.url) as base:
+                path = str(tmp_path / "proxy.sock")
+                async with ProxyDaemon(base, path=path) as daemon:
+                    async with ArcanaGO2(base_url=daemon.url) as go2:
+                        first = asyncio.ensure_future(
+                            go2.move(id=1, x=0.1, y=0.0, z=0.0, priority=0)
+                        )
+                        await asyncio.sleep(0.02)  # in flight
+                        mine = asyncio.ensure_future(
+                            go2.move(id=1, x=0.2, y=0.0, z=0.0, priority=0)
+                        )
+                        await asyncio.sleep(0.02)  # pending
+                        theirs = go2.move(id=2, x=0.3, y=0.0, z=0.0, priority=1)
+                        await asyncio.gather(first, theirs)
+                        with pytest.raises(APIException) as overtaken:
+                            await mine
+                        assert overtaken.value.status_code == 409
+                    assert daemon.stats.overtaken == 1
+                    assert daemon.stats.failed == 0
+                assert mock.stats.commands == 2  # 0.2 never reached the robot
+                assert mock._velocity["x"] == pytest.approx(0.3)
+
+    asyncio.run(main())
+
+
+def test_replies_forward_the_robot_response(tmp_path: Path) -> None:
+    async def robot(body: JSONObject) -> tuple[int, JSONValue]:
+        return 200, {**body, "parameter": "from the robot"}
+
+    async def main() -> None:
+        async with FramedCommandServer(handler=robot) as upstream:
+            async with ArcanaGO2Base(base_url=upstream.url) as base:
+                path = str(tmp_path / "proxy.sock")
+                async with ProxyDaemon(base, path=path):
+                    async with ArcanaGO2Base(base_url=f"unix://{path}") as client:
+                        for api_id in (1003, 1008, 1009):  # a stop, a setpoint, a sit
+                            response = await client.send_command(
+                                requester_id=1,
+                                topic="rt/api/sport/request",
+                                api_id=api_id,
+                                command_args={"x": 0.1, "y": 0.0, "z": 0.0},
+                            )
+                            assert isinstance(response, CommandResponse)
+                            assert response.parameter == "from the robot"
+
+    asyncio.run(main())
+
+
+def test_socket_is_private_unless_configured(tmp_path: Path) -> None:
+    async def main() -> None:
+        async with MockGo2Server() as mock, ArcanaGO2Base(base_url=mock.url) as base:
+            path = str(tmp_path / "proxy.sock")
+            async with ProxyDaemon(base, path=path):
+                assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+            config = ProxyConfig(socket_mode=0o660)
+            async with ProxyDaemon(base, path=path, config=config):
+                assert stat.S_IMODE(os.stat(path).st_mode) == 0o660
+
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from arcana_go2.bench.mock_server import STATE_PATH, MockConfig, MockGo2Server
+from arcana_go2.http_client import HTTPClient
+from arcana_go2.response_cache import CachePolicy, ResponseCache, ResponseCacheConfig, cache_key
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_concurrent_fetches_share_one_load() -> None:
+    async def main() -> None:
+        cache = ResponseCache()
+        loads = 0
+
+        async def load() -> int:
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        key = cache_key("/state", None, None)
+        results = await asyncio.gather(*(cache.fetch("/state", key, load) for _ in range(10)))
+
+        assert results == [42] * 10
+        assert loads == 1
+        assert cache.stats.misses == 1 and cache.stats.coalesced == 9
+        assert len(cache) == 0  # no ttl: shared while in flight, never stored
+
+    asyncio.run(main())
+
+
+def test_ttl_expiry_and_write_invalidation() -> None:
+    async def main() -> None:
+        clock = Clock()
+        config = ResponseCacheConfig(
+            policies={"/config": CachePolicy(ttl=10.0, invalidated_by=("/config",))}
+        )
+        cache = ResponseCache(config, clock=clock)
+        loads = 0
+
+        async def load() -> int:
+            nonlocal loads
+            loads += 1
+            return loads
+
+        key = cache_key("/config", {"b": 1, "a": [1, 2]}, None)
+        assert key == cache_key("/config", {"a": [1, 2], "b": 1}, None)
+
+        assert await cache.fetch("/config", key, load) == 1
+        assert await cache.fetch("/config", key, load) == 1  # served from memory
+        cache.written("/api/webrtc")  # not a path this policy cares about
+        assert await cache.fetch("/config", key, load) == 1
+        cache.written("/config/speed")
+        assert await cache.fetch("/config", key, load) == 2
+        clock.now = 11.0
+        assert await cache.fetch("/config", key, load) == 3
+        assert cache.stats.hits == 2 and cache.stats.invalidated == 1
+
+    asyncio.run(main())
+
+
+def test_failures_are_not_cached() -> None:
+    async def main() -> None:
+        cache = ResponseCache(ResponseCacheConfig(default=CachePolicy(ttl=10.0)))
+        attempts = 0
+
+        async def load() -> str:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise RuntimeError("down")
+            return "up"
+
+        key = cache_key("/health", None, None)
+        with pytest.raises(RuntimeError):
+            await cache.fetch("/health", key, load)
+        assert await cache.fetch("/health", key, load) == "up"
+
+    asyncio.run(main())
+
+
+def test_lru_eviction() -> None:
+    async def main() -> None:
+        config = ResponseCacheConfig(max_entries=2, default=CachePolicy(ttl=10.0))
+        cache = ResponseCache(config)
+
+        async def load() -> str:
+            return "value"
+
+        for url in ("/a", "/b", "/a", "/c"):  # /a was used last, so /b goes
+            await cache.fetch(url, cache_key(url, None, None), load)
+
+        assert len(cache) == 2 and cache.stats.evicted == 1
+        assert cache.invalidate("/b") == 0
+        assert cache.invalidate("/a") == 1
+
+    asyncio.run(main())
+
+
+def test_http_client_gets_share_requests() -> None:
+    class State(BaseModel):
+        commands: int
+
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.02)) as mock:
+            config = ResponseCacheConfig(default=CachePolicy(ttl=10.0))
+            async with HTTPClient(base_url=mock.url, cache=config) as client:
+                states = await asyncio.gather(
+                    *(client.get(STATE_PATH, model=State) for _ in range(10))
+                )
+                assert mock.stats.requests == 1
+                assert all(state is states[0] for state in states)
+
+                await client.post("/api/webrtc", model=None, content=b"{}")  # writes invalidate
+                await client.get(STATE_PATH, model=State)
+                await client.get(STATE_PATH, model=State, fresh=True)
+                assert mock.stats.requests == 4
+
+    asyncio.run(main())
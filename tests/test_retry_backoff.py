@@ -0,0 +1,98 @@
+import asyncio
+import typing as t
+
+import httpx
+import pytest
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.http_client import FastAPIClientConfig, HTTPClient
+
+# no jitter, so the backoff sleeps are exactly 0.1, 0.2, 0.4, ...
+RETRY = FastAPIClientConfig(attempts=10, backoff_base_seconds=0.1, backoff_jitter=0.0)
+
+
+class Robot:
+    """Stands in for the client's transport, failing every request the same way."""
+
+    def __init__(self, fail: t.Callable[[httpx.Request], httpx.Response]) -> None:
+        self.fail = fail
+        self.sent_at: list[float] = []
+        self.timeouts: list[float] = []
+
+    async def request(self, method: str, url: str, **kwargs: t.Any) -> httpx.Response:
+        self.sent_at.append(asyncio.get_running_loop().time())
+        self.timeouts.append(kwargs["timeout"])
+        return self.fail(httpx.Request(method, url))
+
+
+def busy(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(503, json={"detail": "busy"}, request=request)
+
+
+def unreachable(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("connection refused", request=request)
+
+
+@pytest.mark.parametrize("fail", [busy, unreachable])
+def test_retries_stop_within_the_deadline(
+    fail: t.Callable[[httpx.Request], httpx.Response],
+) -> None:
+    async def main() -> None:
+        robot = Robot(fail)
+        async with HTTPClient(base_url="http://robot", retry=RETRY) as client:
+            client._client.request = robot.request  # type: ignore[method-assign]
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            with pytest.raises(APIException):
+                await client.post("/api", model=None, deadline=0.35)
+            elapsed = loop.time() - start
+
+        # attempts at 0, 0.1 and 0.3; the next backoff (0.4) would end past the deadline,
+        # so the client gives up right away instead of sleeping into it
+        assert len(robot.sent_at) == 3
+        assert all(sent - start < 0.35 for sent in robot.sent_at)
+        assert elapsed < 0.35
+        # and each attempt's timeout is clamped to what was left of the budget
+        assert robot.timeouts[0] == pytest.approx(0.35, abs=0.02)
+        assert robot.timeouts[2] == pytest.approx(0.05, abs=0.02)
+
+    asyncio.run(main())
+
+
+def test_no_attempt_starts_once_the_budget_is_spent() -> None:
+    async def main() -> None:
+        async def slow(method: str, url: str, **kwargs: t.Any) -> httpx.Response:
+            sent.append(method)
+            await asyncio.sleep(0.15)
+            return busy(httpx.Request(method, url))
+
+        sent: list[str] = []
+        retry = FastAPIClientConfig(attempts=10, backoff_base_seconds=0.0, backoff_jitter=0.0)
+        async with HTTPClient(base_url="http://robot", retry=retry) as client:
+            client._client.request = slow  # type: ignore[method-assign]
+            with pytest.raises(APIException) as exceeded:
+                await client.post("/api", model=None, deadline=0.2)
+        assert len(sent) == 2  # the third would start at 0.3, past the deadline
+        assert exceeded.value.status_code == 503  # the last answer, not a bare timeout
+
+    asyncio.run(main())
+
+
+def test_backoff_does_not_block_the_loop() -> None:
+    async def main() -> None:
+        async def tick() -> None:
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.01)
+
+        ticks: list[None] = []
+        robot = Robot(busy)
+        ticker = asyncio.ensure_future(tick())
+        async with HTTPClient(base_url="http://robot", retry=RETRY) as client:
+            client._client.request = robot.request  # type: ignore[method-assign]
+            with pytest.raises(APIException):
+                await client.post("/api", model=None, deadline=0.35)
+        ticker.cancel()
+        assert len(ticks) > 20  # it kept running through 0.3 s of backoff
+
+    asyncio.run(main())
@@ -0,0 +1,46 @@
+import asyncio
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.arcana_go2_base import ArcanaGO2Base
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+from arcana_go2.scheduler import CommandScheduler, SchedulerConfig
+
+
+def test_priority_one_overtakes_queued_commands() -> None:
+    async def main() -> list[str]:
+        order: list[str] = []
+        async with MockGo2Server(MockConfig(latency=0.02)) as mock:
+            config = SchedulerConfig(max_in_flight=1)
+            async with ArcanaGO2(base_url=mock.url, scheduler=config) as go2:
+
+                async def send(name: str, request: asyncio.Future[object]) -> None:
+                    await request
+                    order.append(name)
+
+                tasks = [
+                    asyncio.ensure_future(send(f"dance{i}", go2.dance1(id=1))) for i in range(3)
+                ]
+                await asyncio.sleep(0.005)
+                tasks.append(asyncio.ensure_future(send("move", go2.move(id=1, x=1, y=0, z=0))))
+                await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(main()) == ["dance0", "move", "dance1", "dance2"]
+
+
+def test_cancelled_submissions_are_never_sent() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.05)) as mock:
+            async with ArcanaGO2Base(base_url=mock.url) as base:
+                scheduler = CommandScheduler(base, SchedulerConfig(max_in_flight=1))
+                kwargs = {"requester_id": 1, "topic": "rt/api/sport/request", "command_args": None}
+                first = asyncio.ensure_future(scheduler.submit(api_id=1009, **kwargs))
+                queued = asyncio.ensure_future(scheduler.submit(api_id=1016, **kwargs))
+                await asyncio.sleep(0.01)
+                queued.cancel()
+                await first
+                await asyncio.sleep(0.1)
+                await scheduler.close()
+            assert mock.stats.commands == 1
+
+    asyncio.run(main())
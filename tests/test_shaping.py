@@ -0,0 +1,79 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from arcana_go2.shaping import SetpointShaper, ShapingConfig
+
+
+def test_no_config_leaves_setpoints_unchanged() -> None:
+    shaper = SetpointShaper()
+    setpoints = [(0.3, -0.1, 0.5), (0.0, 0.2, -1.0), (1.5, 1.5, 0.0)]
+    for setpoint in setpoints:
+        assert shaper.shape(setpoint, dt=0.02).tolist() == pytest.approx(setpoint)
+
+
+def test_deadband_and_velocity_limit_per_axis() -> None:
+    config = ShapingConfig(max_velocity=(1.0, 0.5, 2.0), deadband=(0.05, 0.05, 0.05))
+    shaper = SetpointShaper(config)
+    raw = np.array([3.0, -0.04, -2.5])
+    shaped = shaper.shape(raw, dt=0.02)
+    assert shaped.tolist() == [1.0, 0.0, -2.0]
+    assert shaper.target.tolist() == [[1.0, 0.0, -2.0]]
+    assert raw.tolist() == [3.0, -0.04, -2.5]  # the input is not modified
+
+
+def test_smoothing_lags_the_input_and_converges_to_it() -> None:
+    shaper = SetpointShaper(ShapingConfig(smoothing=0.5))
+    outputs = [shaper.shape((1.0, 0.0, -1.0), dt=0.02)[0] for _ in range(30)]
+    assert outputs[:3] == [0.5, 0.75, 0.875]
+    assert all(a < b < 1.0 for a, b in zip(outputs, outputs[1:]))
+    assert outputs[-1] == pytest.approx(1.0, abs=1e-6)
+
+
+def test_acceleration_limit_bounds_each_step() -> None:
+    shaper = SetpointShaper(ShapingConfig(max_acceleration=(2.0, 2.0, 2.0)))
+    previous = np.zeros(3)
+    for _ in range(10):
+        output = shaper.shape((1.0, -1.0, 0.01), dt=0.1)
+        assert np.all(np.abs(output - previous) <= 0.2 + 1e-12)
+        previous = output
+    assert previous.tolist() == pytest.approx([1.0, -1.0, 0.01])
+
+
+def test_lowpass_factor_follows_the_time_step() -> None:
+    config = ShapingConfig(cutoff_hz=1.0)
+    short, long = SetpointShaper(config), SetpointShaper(config)
+    assert short.shape((1.0, 0.0, 0.0), dt=0.01)[0] < long.shape((1.0, 0.0, 0.0), dt=0.1)[0]
+
+
+def test_fleet_rows_are_shaped_independently() -> None:
+    configs = [ShapingConfig(max_velocity=(0.5, 0.5, 0.5)), ShapingConfig()]
+    fleet = SetpointShaper(configs)
+    setpoints = np.array([(1.0, 1.0, 1.0), (1.0, 1.0, 1.0)])
+    assert fleet.shape(setpoints, dt=0.02).tolist() == [[0.5, 0.5, 0.5], [1.0, 1.0, 1.0]]
+    with pytest.raises(ValueError):
+        fleet.shape((1.0, 1.0, 1.0))
+
+
+def test_trajectory_matches_step_by_step_shaping_without_changing_state() -> None:
+    config = ShapingConfig(max_velocity=(1.0, 1.0, 1.0), smoothing=0.3, max_acceleration=(5, 5, 5))
+    points = np.linspace((0.0, 0.0, 0.0), (2.0, -2.0, 0.5), 20)
+    batch = SetpointShaper(config)
+    trajectory = batch.shape_trajectory(points, dt=0.05)
+    assert batch.output.tolist() == [[0.0, 0.0, 0.0]]
+    stepped = SetpointShaper(config)
+    expected = [stepped.shape(point, dt=0.05) for point in points]
+    assert trajectory == pytest.approx(np.array(expected))
+
+
+def test_min_change_suppresses_repeats_until_forgotten() -> None:
+    shaper = SetpointShaper(ShapingConfig(min_change=0.01))
+    shaper.shape((0.5, 0.0, 0.0), dt=0.02)
+    assert shaper.changed().tolist() == [True]
+    shaper.mark_sent()
+    shaper.shape((0.505, 0.0, 0.0), dt=0.02)
+    assert shaper.changed().tolist() == [False]
+    shaper.forget_sent()
+    assert shaper.changed().tolist() == [True]
+    shaper.reset()
+    assert shaper.output.tolist() == [[0.0, 0.0, 0.0]]
@@ -0,0 +1,88 @@
+import asyncio
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+from arcana_go2.state_mirror import StateMirror, StateMirrorConfig
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_values_expire_after_the_ttl() -> None:
+    clock = Clock()
+    mirror = StateMirror(StateMirrorConfig(ttl=5.0), clock=clock)
+    mirror.update("posture", "standing")
+
+    assert mirror.is_current("posture", "standing")
+    assert not mirror.is_current("posture", "sitting")
+    clock.now = 5.1
+    assert mirror.get("posture") is None
+    assert mirror.snapshot() == {}
+
+
+def test_redundant_mode_commands_are_skipped() -> None:
+    async def main() -> None:
+        async with MockGo2Server() as mock:
+            async with ArcanaGO2(base_url=mock.url, state_mirror=StateMirrorConfig()) as go2:
+                for _ in range(3):
+                    await go2.standup(id=1)
+                assert mock.stats.commands == 1
+                assert go2.state == {"posture": "standing"}
+
+                await go2.standup(id=1, force=True)
+                await go2.speedlevel(id=1, data=1)
+                await go2.speedlevel(id=1, data=1)
+                assert mock.stats.commands == 3
+
+                await go2.damp(id=1)  # safety commands always go out
+                await go2.damp(id=1)
+                assert mock.stats.commands == 5
+                assert go2.state["posture"] == "damped"
+
+                stats = go2.state_stats
+                assert stats is not None and stats.suppressed == 3
+
+    asyncio.run(main())
+
+
+def test_identical_commands_in_flight_collapse() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.02)) as mock:
+            async with ArcanaGO2(base_url=mock.url, state_mirror=StateMirrorConfig()) as go2:
+                await asyncio.gather(*(go2.sit(id=1) for _ in range(5)))
+                assert mock.stats.commands == 1
+                stats = go2.state_stats
+                assert stats is not None and stats.collapsed == 4
+
+    asyncio.run(main())
+
+
+def test_tricks_make_the_posture_unknown() -> None:
+    async def main() -> None:
+        async with MockGo2Server() as mock:
+            async with ArcanaGO2(base_url=mock.url, state_mirror=StateMirrorConfig()) as go2:
+                await go2.standup(id=1)
+                await go2.frontjump(id=1)
+                await go2.standup(id=1)
+                assert mock.stats.commands == 3
+
+    asyncio.run(main())
+
+
+def test_concurrent_safety_commands_are_each_sent() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.02)) as mock:
+            async with ArcanaGO2(base_url=mock.url, state_mirror=StateMirrorConfig()) as go2:
+                first, second = await asyncio.gather(go2.damp(id=1), go2.damp(id=2))
+                assert first is not second
+                assert mock.stats.commands == 2
+                stats = go2.state_stats
+                assert stats is not None and stats.collapsed == 0
+                assert go2.state["posture"] == "damped"
+
+    asyncio.run(main())
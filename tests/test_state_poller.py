@@ -0,0 +1,48 @@
+import asyncio
+import typing as t
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.state_poller import PollerConfig, StatePoller
+
+
+class Client:
+    def __init__(self, fail_after: int, error: Exception) -> None:
+        self.polls = 0
+        self.fail_after = fail_after
+        self.error = error
+
+    async def get_json(self, path: str, **kwargs: t.Any) -> dict[str, t.Any]:
+        self.polls += 1
+        if self.polls > self.fail_after:
+            raise self.error
+        return {"imu": {"rpy": [self.polls, 0.0, 0.0]}}
+
+
+def poller(client: Client) -> StatePoller:
+    config = PollerConfig(min_interval=0.001, max_interval=0.01, capacity=8)
+    return StatePoller(client, "/state", ["imu.rpy.0"], config=config)  # type: ignore[arg-type]
+
+
+def test_failed_polls_are_retried() -> None:
+    async def main() -> None:
+        async with poller(Client(fail_after=2, error=APIException("Request failed"))) as state:
+            await asyncio.sleep(0.05)
+            assert state.running and state.stats.errors > 0
+            assert state.ring.column("imu.rpy.0").tolist() == [1.0, 2.0]
+
+    asyncio.run(main())
+
+
+def test_iterators_end_when_the_poller_dies() -> None:
+    async def main() -> None:
+        async with poller(Client(fail_after=3, error=RuntimeError("bad state"))) as state:
+            rows = [view.copy() async for view in state.samples(from_start=True)]
+            assert sum(len(view) for view in rows) == 3
+            assert not state.running
+            assert isinstance(state.stats.failure, RuntimeError)
+
+    asyncio.run(asyncio.wait_for(main(), 5))
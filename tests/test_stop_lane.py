@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+import pytest
+
+from arcana_go2.api_exception import APIException
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.arcana_go2_base import CommandAck, CommandResponse
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+from arcana_go2.stop_lane import StopLane, StopLaneConfig
+
+
+def test_stop_bypasses_a_saturated_pool() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.05)) as mock:
+            async with ArcanaGO2(base_url=mock.url, stop_lane=StopLaneConfig()) as go2:
+                await go2.warmup()
+                busy = [asyncio.ensure_future(go2.sit(id=1)) for _ in range(40)]
+                await asyncio.sleep(0)
+                start = asyncio.get_running_loop().time()
+                response = await go2.damp(id=1)
+                assert asyncio.get_running_loop().time() - start < 0.15
+                assert isinstance(response, CommandResponse) and response.api_id == 1001
+                await asyncio.gather(*busy)
+                assert go2.stop_stats is not None and go2.stop_stats.sent == 1
+
+    asyncio.run(main())
+
+
+def test_deadline_bounds_the_whole_stop() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.3)) as mock:
+            async with ArcanaGO2(base_url=mock.url, stop_lane=StopLaneConfig(timeout=1.0)) as go2:
+                with pytest.raises(APIException, match="Deadline exceeded"):
+                    await go2.stopmove(id=1, deadline=0.05)
+                assert go2.stop_stats is not None and go2.stop_stats.failed == 1
+
+    asyncio.run(main())
+
+
+def test_an_accepted_stop_with_an_unexpected_body_is_acknowledged() -> None:
+    async def main() -> None:
+        async with MockGo2Server() as mock:
+            lane = StopLane(base_url=mock.url)
+
+            async def post(*args: object, **kwargs: object) -> httpx.Response:
+                return httpx.Response(200, content=b"accepted")
+
+            lane._client.post = post  # type: ignore[method-assign]
+            try:
+                response = await lane.send(requester_id=3, api_id=1003)
+            finally:
+                await lane.close()
+        assert isinstance(response, CommandAck)
+        assert (response.id, response.api_id) == (3, 1003)
+        assert lane.stats.sent == 1 and lane.stats.failed == 0
+
+    asyncio.run(main())
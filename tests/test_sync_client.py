@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+
+from arcana_go2.bench.mock_server import MockGo2Server
+from arcana_go2.scripts.gen_sync_client import main as check_generated
+from arcana_go2.sync_client import COMMANDS, ArcanaGO2Sync
+
+
+def test_generated_command_methods_are_up_to_date() -> None:
+    assert check_generated(["--check"]) == 0
+    for name in COMMANDS:
+        assert name in vars(ArcanaGO2Sync) and f"{name}_future" in vars(ArcanaGO2Sync)
+
+
+def test_blocking_and_future_calls() -> None:
+    import asyncio
+
+    async def serve(started: threading.Event, stop: asyncio.Event, urls: list[str]) -> None:
+        async with MockGo2Server() as mock:
+            urls.append(mock.url)
+            started.set()
+            await stop.wait()
+
+    started, urls = threading.Event(), []
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    server = threading.Thread(target=loop.run_until_complete, args=(serve(started, stop, urls),))
+    server.start()
+    try:
+        started.wait(5)
+        with ArcanaGO2Sync(base_url=urls[0]) as go2:
+            assert go2.sit(id=1).api_id == 1009  # type: ignore[union-attr]
+            futures = [go2.hello_future(id=1) for _ in range(5)]
+            assert all(future.result(5) is not None for future in futures)
+    finally:
+        loop.call_soon_threadsafe(stop.set)
+        server.join()
+        loop.close()
+
+
+def test_failed_construction_stops_the_loop_thread() -> None:
+    before = threading.active_count()
+
+    with pytest.raises(TypeError):
+        ArcanaGO2Sync(base_url="http://127.0.0.1:1", no_such_option=True)
+    assert threading.active_count() == before
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+from arcana_go2.token_manager import Token, TokenManager
+
+
+class Source:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.failing = False
+
+    async def __call__(self) -> Token:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.failing:
+            raise RuntimeError("vault unavailable")
+        return Token(f"token-{self.calls}", expires_in=0.2)
+
+
+def test_concurrent_callers_share_one_fetch() -> None:
+    async def main() -> None:
+        source = Source(delay=0.02)
+        tokens = TokenManager(source)
+        assert await asyncio.gather(*(tokens.get() for _ in range(10))) == ["token-1"] * 10
+        assert source.calls == 1 and tokens.version == 1
+
+    asyncio.run(main())
+
+
+def test_refreshes_in_the_background_before_expiry() -> None:
+    async def main() -> None:
+        source = Source(delay=0.05)
+        tokens = TokenManager(source, refresh_margin=0.1)
+        await tokens.get()
+        await asyncio.sleep(0.12)
+        start = time.perf_counter()
+        assert await tokens.get() == "token-1"  # served while the refresh runs
+        assert time.perf_counter() - start < 0.01
+        await asyncio.sleep(0.07)
+        assert await tokens.get() == "token-2"
+
+    asyncio.run(main())
+
+
+def test_failed_refreshes_keep_the_last_token_without_blocking() -> None:
+    async def main() -> None:
+        source = Source(delay=0.05)
+        tokens = TokenManager(source, refresh_margin=0.1, retry_backoff=0.1)
+        await tokens.get()
+        source.failing = True
+        await asyncio.sleep(0.12)
+        await tokens.get()  # starts a refresh that fails
+        await asyncio.sleep(0.3)  # well past the token's expiry
+        for _ in range(20):
+            start = time.perf_counter()
+            assert await tokens.get() == "token-1"
+            assert time.perf_counter() - start < 0.01
+            await asyncio.sleep(0.01)
+        assert 2 <= source.calls <= 4  # retried with backoff, not on every request
+        source.failing = False
+        await asyncio.sleep(0.5)
+        await tokens.get()
+        await asyncio.sleep(0.06)
+        assert tokens.current == f"token-{source.calls}"
+
+    asyncio.run(main())
+
+
+def test_waits_only_when_there_is_no_token() -> None:
+    async def main() -> None:
+        source = Source()
+        source.failing = True
+        tokens = TokenManager(source)
+        assert await tokens.get() is None
+        source.failing = False
+        assert await tokens.get() == "token-2"
+        tokens.invalidate()
+        assert await tokens.get() == "token-3"
+
+    asyncio.run(main())
+
+
+def test_ttl_zero_calls_the_source_for_every_request() -> None:
+    async def main() -> None:
+        calls = 0
+
+        def source() -> str:
+            nonlocal calls
+            calls += 1
+            return f"token-{calls}"
+
+        tokens = TokenManager(source, ttl=0)
+        assert [await tokens.get() for _ in range(3)] == ["token-1", "token-2", "token-3"]
+
+    asyncio.run(main())
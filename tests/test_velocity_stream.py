@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from arcana_go2.arcana_go2 import ArcanaGO2
+from arcana_go2.bench.mock_server import MockConfig, MockGo2Server
+from arcana_go2.shaping import ShapingConfig
+
+
+def test_setpoints_are_coalesced_latest_wins() -> None:
+    async def main() -> None:
+        async with MockGo2Server(MockConfig(latency=0.03)) as mock:
+            async with ArcanaGO2(base_url=mock.url) as go2:
+                async with go2.velocity_stream(id=1, rate_hz=100.0) as stream:
+                    for i in range(50):
+                        stream.move(x=i / 100, y=0.0, z=0.0)
+                        stream.euler(x=0.0, y=i / 100, z=0.0)
+                        await asyncio.sleep(0.002)
+                    await asyncio.sleep(0.2)  # let the newest of each go out
+                stats = stream.stats
+
+        assert stats.submitted == 100
+        # one request at a time, so most setpoints are replaced while one is in flight
+        assert stats.sent == mock.stats.commands < 20
+        assert stats.coalesced == stats.submitted - stats.sent
+        assert stats.dropped == stats.failed == stats.suppressed == 0
+        assert mock._velocity["x"] == pytest.approx(0.49)  # the newest, never an older one
+
+    asyncio.run(main())
+
+
+def test_pending_setpoints_are_dropped_on_close() -> None:
+    async def main() -> None:
+        async with MockGo2Server() as mock, ArcanaGO2(base_url=mock.url) as go2:
+            stream = go2.velocity_stream(id=1, rate_hz=1.0)
+            stream.start()
+            stream.move(x=0.1, y=0.0, z=0.0)
+            stream.move(x=0.2, y=0.0, z=0.0)
+            await stream.close()
+
+        assert stream.stats.coalesced == 1 and stream.stats.dropped == 1
+        assert stream.stats.sent == mock.stats.commands == 0
+
+    asyncio.run(main())
+
+
+def test_setpoints_suppressed_by_shaping_are_not_counted_as_sent() -> None:
+    async def main() -> None:
+        shaping = ShapingConfig(min_change=0.05)
+        async with MockGo2Server() as mock, ArcanaGO2(base_url=mock.url, shaping=shaping) as go2:
+            async with go2.velocity_stream(id=1, rate_hz=200.0) as stream:
+                for x in (0.3, 0.31, 0.32, 0.5):
+                    stream.move(x=x, y=0.0, z=0.0)
+                    await asyncio.sleep(0.03)  # each one is sent before the next arrives
+
+        assert stream.stats.sent == mock.stats.commands == 2  # 0.3 and 0.5
+        assert stream.stats.suppressed == 2
+        assert stream.stats.coalesced == 0
+
+    asyncio.run(main())